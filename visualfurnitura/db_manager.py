@@ -3,19 +3,140 @@ Database manager module for VisualFurnitura
 Handles SQLite database operations for hardware components
 """
 import sqlite3
+import json
 import os
+import threading
+from contextlib import contextmanager
 from typing import List, Dict, Optional
 
 
+# Insert SQL shared by the single and bulk hardware paths. sqlite3
+# keeps a per-connection prepared-statement cache keyed on the SQL text,
+# so reusing one literal means the statement is parsed once and then
+# reused on every call
+_SQL_INSERT_HARDWARE = '''
+    INSERT INTO hardware_components
+    (article_number, name, category, description, image_path,
+     width, height, depth, mounting_points, mounting_schemes,
+     manufacturer, supplier, price)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+_SQL_INSERT_PROFILE = '''
+    INSERT INTO profile_systems
+    (name, description, axis_offset, sash_thickness, frame_width, sash_width)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def _profile_insert_params(data: Dict) -> tuple:
+    """Parameter tuple for _SQL_INSERT_PROFILE from a row dict"""
+    return (
+        data.get('name'),
+        data.get('description'),
+        data.get('axis_offset'),
+        data.get('sash_thickness'),
+        data.get('frame_width'),
+        data.get('sash_width')
+    )
+
+
+def _hardware_insert_params(data: Dict) -> tuple:
+    """Parameter tuple for _SQL_INSERT_HARDWARE from a row dict"""
+    return (
+        data.get('article_number'),
+        data.get('name'),
+        data.get('category'),
+        data.get('description'),
+        data.get('image_path'),
+        data.get('width'),
+        data.get('height'),
+        data.get('depth'),
+        data.get('mounting_points'),
+        data.get('mounting_schemes'),
+        data.get('manufacturer'),
+        data.get('supplier'),
+        data.get('price')
+    )
+
+
 class DBManager:
     def __init__(self, db_path: str = "visualfurnitura.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        # Bumped on every committed write; cheap staleness check for UI
+        # callers that cache query results
+        self.mutation_seq = 0
+        # Cached list-query results; writers drop them so the next list
+        # call re-selects. The hardware cache is keyed by category filter
+        self._profile_cache: Optional[List[Dict]] = None
+        self._component_cache: Dict[int, Dict] = {}
+        self._hardware_cache: Dict[Optional[str], List[Dict]] = {}
         self.init_database()
 
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening and configuring it lazily.
+
+        SQLite connections are thread-affine, so each thread keeps its own
+        instead of paying connect/close per call. WAL with
+        synchronous=NORMAL avoids an fsync per statement, and busy_timeout
+        makes concurrent writers wait instead of failing immediately.
+        temp_store, cache_size and mmap_size are per-connection, so they
+        are (re)issued here rather than in init_database.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+            conn.execute('PRAGMA mmap_size=268435456')  # read via mmap, 256 MB
+            conn.execute('PRAGMA foreign_keys=ON')
+            # Rows come back as sqlite3.Row: name-subscriptable without
+            # building a fresh dict per row in every reader
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            self._local.in_transaction = False
+        return conn
+
+    def _commit(self):
+        """Commit unless an explicit transaction() block is open"""
+        if not getattr(self._local, 'in_transaction', False):
+            self._conn().commit()
+            self.mutation_seq += 1
+
+    @contextmanager
+    def transaction(self):
+        """Group a burst of writes into one BEGIN IMMEDIATE transaction.
+
+        Method calls inside the block skip their per-statement commit, so
+        the whole batch pays a single fsync; rolled back on exception.
+        """
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        self._local.in_transaction = True
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            # Reads inside the failed block may have cached rows that
+            # the rollback just made disappear; drop them wholesale
+            self._profile_cache = None
+            self._component_cache.clear()
+            self._hardware_cache.clear()
+            raise
+        else:
+            conn.commit()
+            self.mutation_seq += 1
+        finally:
+            self._local.in_transaction = False
+
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         # Create table for hardware components
         cursor.execute('''
@@ -85,80 +206,160 @@ class DBManager:
             )
         ''')
 
-        conn.commit()
-        conn.close()
+        # Indexes for the hot lookup paths: category listings, name
+        # ordering and the order join become B-tree seeks instead of full
+        # table scans. article_number is already indexed by its UNIQUE
+        # constraint.
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_hw_category_name
+            ON hardware_components(category, name)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_hw_name
+            ON hardware_components(name)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_oh_order
+            ON order_hardware(order_id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_oh_component
+            ON order_hardware(component_id)
+        ''')
+
+        # Full-text index over the searchable hardware columns; MATCH
+        # probes an inverted index instead of LIKE-scanning the table.
+        # The external-content table stores no copy of the rows, and the
+        # triggers keep it in sync with every write path
+        cursor.execute('''
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'table' AND name = 'hardware_fts'
+        ''')
+        fts_existed = cursor.fetchone() is not None
+
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS hardware_fts USING fts5(
+                name, article_number, description,
+                content='hardware_components', content_rowid='id'
+            )
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS hardware_fts_ai
+            AFTER INSERT ON hardware_components BEGIN
+                INSERT INTO hardware_fts(rowid, name, article_number, description)
+                VALUES (new.id, new.name, new.article_number, new.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS hardware_fts_ad
+            AFTER DELETE ON hardware_components BEGIN
+                INSERT INTO hardware_fts(hardware_fts, rowid, name, article_number, description)
+                VALUES ('delete', old.id, old.name, old.article_number, old.description);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS hardware_fts_au
+            AFTER UPDATE ON hardware_components BEGIN
+                INSERT INTO hardware_fts(hardware_fts, rowid, name, article_number, description)
+                VALUES ('delete', old.id, old.name, old.article_number, old.description);
+                INSERT INTO hardware_fts(rowid, name, article_number, description)
+                VALUES (new.id, new.name, new.article_number, new.description);
+            END
+        ''')
+
+        # A database created before the FTS table existed has unindexed
+        # rows; rebuild once when the index is first added
+        if not fts_existed:
+            cursor.execute("INSERT INTO hardware_fts(hardware_fts) VALUES('rebuild')")
+
+        self._commit()
 
     def add_hardware_component(self, data: Dict) -> int:
         """Add a new hardware component to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
-        cursor.execute('''
-            INSERT INTO hardware_components 
-            (article_number, name, category, description, image_path, 
-             width, height, depth, mounting_points, mounting_schemes, 
-             manufacturer, supplier, price)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            data.get('article_number'),
-            data.get('name'),
-            data.get('category'),
-            data.get('description'),
-            data.get('image_path'),
-            data.get('width'),
-            data.get('height'),
-            data.get('depth'),
-            data.get('mounting_points'),
-            data.get('mounting_schemes'),
-            data.get('manufacturer'),
-            data.get('supplier'),
-            data.get('price')
-        ))
+        # RETURNING hands the id back with the insert itself instead of
+        # reading connection state (lastrowid) after the fact
+        cursor.execute(_SQL_INSERT_HARDWARE + ' RETURNING id',
+                       _hardware_insert_params(data))
 
-        component_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        component_id = cursor.fetchone()[0]
+        self._hardware_cache.clear()
+        self._commit()
         
         return component_id
 
+    def add_hardware_components(self, rows: List[Dict]) -> List[Dict]:
+        """Bulk-insert hardware components and return the stored rows.
+
+        executemany inside one transaction amortizes statement preparation
+        and the commit fsync across the whole batch instead of paying them
+        once per row.
+        """
+        cursor = self._conn().cursor()
+
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM hardware_components')
+        last_id = cursor.fetchone()[0]
+
+        cursor.executemany(_SQL_INSERT_HARDWARE,
+                           [_hardware_insert_params(data) for data in rows])
+
+        self._hardware_cache.clear()
+        self._commit()
+
+        # executemany does not report rowids, so re-select the batch by
+        # the id watermark taken before the insert
+        cursor.execute('SELECT * FROM hardware_components WHERE id > ? ORDER BY id',
+                       (last_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_hardware_component(self, component_id: int) -> Optional[Dict]:
-        """Get a hardware component by ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Get a hardware component by ID.
+
+        The mounting_points/mounting_schemes JSON columns come back
+        already parsed, and the row is memoized per id so repeated
+        lookups (rendering loops re-fetch the same components) skip
+        both the SELECT and the json.loads.
+        """
+        cached = self._component_cache.get(component_id)
+        if cached is not None:
+            # Copy the dict so callers editing their row do not edit
+            # the cache behind its back
+            return dict(cached)
+
+        cursor = self._conn().cursor()
 
         cursor.execute('SELECT * FROM hardware_components WHERE id = ?', (component_id,))
         row = cursor.fetchone()
-        
-        if row:
-            columns = [description[0] for description in cursor.description]
-            result = dict(zip(columns, row))
-            conn.close()
-            return result
-        
-        conn.close()
-        return None
+
+        if row is None:
+            return None
+
+        # Materialize a real dict: callers merge these rows into UI
+        # models that mutate them, which sqlite3.Row does not allow
+        result = dict(row)
+        result['mounting_points'] = (
+            json.loads(result['mounting_points'])
+            if result.get('mounting_points') else None)
+        result['mounting_schemes'] = (
+            json.loads(result['mounting_schemes'])
+            if result.get('mounting_schemes') else None)
+
+        self._component_cache[component_id] = result
+        return dict(result)
 
     def get_hardware_by_article(self, article_number: str) -> Optional[Dict]:
         """Get a hardware component by article number"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         cursor.execute('SELECT * FROM hardware_components WHERE article_number = ?', (article_number,))
         row = cursor.fetchone()
-        
-        if row:
-            columns = [description[0] for description in cursor.description]
-            result = dict(zip(columns, row))
-            conn.close()
-            return result
-        
-        conn.close()
-        return None
 
-    def update_hardware_component(self, component_id: int, data: Dict):
-        """Update a hardware component"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return dict(row) if row else None
+
+    def update_hardware_component(self, component_id: int, data: Dict) -> Optional[Dict]:
+        """Update a hardware component and return the stored row"""
+        cursor = self._conn().cursor()
 
         cursor.execute('''
             UPDATE hardware_components SET
@@ -192,48 +393,123 @@ class DBManager:
             component_id
         ))
 
-        conn.commit()
-        conn.close()
+        self._hardware_cache.clear()
+        self._component_cache.pop(component_id, None)
+        self._commit()
+        # Hand the materialized row back so callers can patch their view
+        # of this one component instead of re-selecting the whole table
+        return self.get_hardware_component(component_id)
 
     def delete_hardware_component(self, component_id: int):
         """Delete a hardware component"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         cursor.execute('DELETE FROM hardware_components WHERE id = ?', (component_id,))
 
-        conn.commit()
-        conn.close()
+        self._hardware_cache.clear()
+        self._component_cache.pop(component_id, None)
+        self._commit()
 
-    def get_all_hardware(self, category: Optional[str] = None) -> List[Dict]:
-        """Get all hardware components, optionally filtered by category"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_all_hardware(self, category: Optional[str] = None,
+                         limit: Optional[int] = None,
+                         after_id: Optional[int] = None) -> List[Dict]:
+        """Get hardware components, optionally filtered by category.
 
-        if category:
-            cursor.execute('SELECT * FROM hardware_components WHERE category = ? ORDER BY name', (category,))
-        else:
-            cursor.execute('SELECT * FROM hardware_components ORDER BY name')
+        Without ``limit``/``after_id`` the full list is returned and
+        cached per category until the next write; repeated table
+        refreshes then cost a list copy instead of a SELECT.
 
-        rows = cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-        
-        conn.close()
-        return results
+        With ``limit`` the result is one page ordered by id, and
+        ``after_id`` continues from the last id of the previous page
+        (keyset pagination: the index seek stays cheap where a growing
+        OFFSET would re-scan all skipped rows).
+        """
+        if limit is None and after_id is None:
+            cached = self._hardware_cache.get(category)
+            if cached is not None:
+                # Copy the list so callers appending/removing rows
+                # (table models) do not edit the cache behind its back
+                return list(cached)
+
+            cursor = self._conn().cursor()
+
+            if category:
+                cursor.execute('SELECT * FROM hardware_components WHERE category = ? ORDER BY name', (category,))
+            else:
+                cursor.execute('SELECT * FROM hardware_components ORDER BY name')
+
+            results = [dict(row) for row in cursor.fetchall()]
+
+            self._hardware_cache[category] = results
+            return list(results)
+
+        cursor = self._conn().cursor()
+        cursor.execute('''
+            SELECT * FROM hardware_components
+            WHERE (? IS NULL OR category = ?)
+              AND (? IS NULL OR id > ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (category, category, after_id, after_id,
+              -1 if limit is None else limit))
+        return [dict(row) for row in cursor.fetchall()]
 
     def add_profile_system(self, data: Dict) -> int:
         """Add a new profile system to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
+
+        cursor.execute(_SQL_INSERT_PROFILE + ' RETURNING id',
+                       _profile_insert_params(data))
+
+        system_id = cursor.fetchone()[0]
+        self._profile_cache = None
+        self._commit()
+        
+        return system_id
+
+    def add_profile_systems(self, rows: List[Dict]) -> List[Dict]:
+        """Bulk-insert profile systems and return the stored rows.
+
+        Like add_hardware_components: one executemany and one commit
+        fsync for the whole batch instead of a transaction per row.
+        """
+        cursor = self._conn().cursor()
+
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM profile_systems')
+        last_id = cursor.fetchone()[0]
+
+        cursor.executemany(_SQL_INSERT_PROFILE,
+                           [_profile_insert_params(data) for data in rows])
+
+        self._profile_cache = None
+        self._commit()
+
+        cursor.execute('SELECT * FROM profile_systems WHERE id > ? ORDER BY id',
+                       (last_id,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def upsert_profile_system(self, data: Dict) -> int:
+        """Insert a profile system or update the row with the same name.
+
+        One INSERT ... ON CONFLICT(name) DO UPDATE replaces the caller's
+        "update vs insert" branch and its extra round-trip, and closes
+        the race where two writers add the same name; RETURNING hands
+        back the affected id either way.
+        """
+        cursor = self._conn().cursor()
 
         cursor.execute('''
-            INSERT INTO profile_systems 
+            INSERT INTO profile_systems
             (name, description, axis_offset, sash_thickness, frame_width, sash_width)
             VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                description = excluded.description,
+                axis_offset = excluded.axis_offset,
+                sash_thickness = excluded.sash_thickness,
+                frame_width = excluded.frame_width,
+                sash_width = excluded.sash_width,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING id
         ''', (
             data.get('name'),
             data.get('description'),
@@ -243,32 +519,53 @@ class DBManager:
             data.get('sash_width')
         ))
 
-        system_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        system_id = cursor.fetchone()[0]
+        self._profile_cache = None
+        self._commit()
+
         return system_id
 
-    def get_all_profile_systems(self) -> List[Dict]:
-        """Get all profile systems"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_profile_system(self, system_id: int) -> Optional[Dict]:
+        """Get a profile system by ID"""
+        cursor = self._conn().cursor()
 
-        cursor.execute('SELECT * FROM profile_systems ORDER BY name')
-        rows = cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-        
-        conn.close()
-        return results
+        cursor.execute('SELECT * FROM profile_systems WHERE id = ?', (system_id,))
+        row = cursor.fetchone()
+
+        return dict(row) if row else None
+
+    def get_all_profile_systems(self, limit: Optional[int] = None,
+                                after_id: Optional[int] = None) -> List[Dict]:
+        """Get profile systems, all of them or one keyset page.
 
-    def update_profile_system(self, system_id: int, data: Dict):
-        """Update a profile system"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Profiles are a small, mostly-static reference table, so the
+        unpaginated full list is cached until the next profile write.
+        ``limit``/``after_id`` page by id like ``get_all_hardware``.
+        """
+        if limit is None and after_id is None:
+            if self._profile_cache is not None:
+                return list(self._profile_cache)
+
+            cursor = self._conn().cursor()
+
+            cursor.execute('SELECT * FROM profile_systems ORDER BY name')
+            results = [dict(row) for row in cursor.fetchall()]
+
+            self._profile_cache = results
+            return list(results)
+
+        cursor = self._conn().cursor()
+        cursor.execute('''
+            SELECT * FROM profile_systems
+            WHERE (? IS NULL OR id > ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, after_id, -1 if limit is None else limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def update_profile_system(self, system_id: int, data: Dict) -> Optional[Dict]:
+        """Update a profile system and return the stored row"""
+        cursor = self._conn().cursor()
 
         cursor.execute('''
             UPDATE profile_systems SET
@@ -290,28 +587,28 @@ class DBManager:
             system_id
         ))
 
-        conn.commit()
-        conn.close()
+        self._profile_cache = None
+        self._commit()
+        return self.get_profile_system(system_id)
 
     def delete_profile_system(self, system_id: int):
         """Delete a profile system"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         cursor.execute('DELETE FROM profile_systems WHERE id = ?', (system_id,))
 
-        conn.commit()
-        conn.close()
+        self._profile_cache = None
+        self._commit()
 
     def add_order(self, data: Dict) -> int:
         """Add a new order to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         cursor.execute('''
             INSERT INTO orders 
             (name, description, window_width, window_height, profile_system_id)
             VALUES (?, ?, ?, ?, ?)
+            RETURNING id
         ''', (
             data.get('name'),
             data.get('description'),
@@ -320,9 +617,8 @@ class DBManager:
             data.get('profile_system_id')
         ))
 
-        order_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        order_id = cursor.fetchone()[0]
+        self._commit()
         
         return order_id
 
@@ -330,59 +626,67 @@ class DBManager:
                           x_position: float = 0, y_position: float = 0, rotation: float = 0, 
                           notes: str = "") -> int:
         """Add hardware to an order"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn().cursor()
 
         cursor.execute('''
             INSERT INTO order_hardware 
             (order_id, component_id, quantity, x_position, y_position, rotation, notes)
             VALUES (?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
         ''', (order_id, component_id, quantity, x_position, y_position, rotation, notes))
 
-        assignment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        assignment_id = cursor.fetchone()[0]
+        self._commit()
         
         return assignment_id
 
-    def get_order_hardware(self, order_id: int) -> List[Dict]:
-        """Get all hardware assigned to an order"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_order_hardware(self, order_id: int,
+                           limit: Optional[int] = None,
+                           after_id: Optional[int] = None) -> List[Dict]:
+        """Get hardware assigned to an order, optionally one page at a
+        time (``after_id`` is the placement id the page continues from)
+        """
+        cursor = self._conn().cursor()
 
         cursor.execute('''
             SELECT oh.*, hc.name as component_name, hc.article_number, hc.image_path
             FROM order_hardware oh
             JOIN hardware_components hc ON oh.component_id = hc.id
             WHERE oh.order_id = ?
-        ''', (order_id,))
+              AND (? IS NULL OR oh.id > ?)
+            ORDER BY oh.id
+            LIMIT ?
+        ''', (order_id, after_id, after_id, -1 if limit is None else limit))
         
-        rows = cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-        
-        conn.close()
-        return results
-
-    def search_hardware(self, query: str) -> List[Dict]:
-        """Search for hardware components by name or article number"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # sqlite3.Row subscripts like a dict; these results are read
+        # straight into views, so no per-row dict is materialized
+        return cursor.fetchall()
+
+    def search_hardware(self, query: str,
+                        limit: Optional[int] = None) -> List[Dict]:
+        """Search for hardware components by name, article number or
+        description via the FTS5 index.
+
+        Each word of the query becomes a quoted prefix token, so the
+        lookup is an inverted-index probe instead of a LIKE table scan.
+        ``limit`` caps the number of hits materialized for the caller.
+        """
+        cursor = self._conn().cursor()
+
+        # Quoting keeps FTS syntax characters in user input from acting
+        # as query operators
+        match = ' '.join(f'"{token}"*'
+                         for token in query.replace('"', ' ').split())
+        if not match:
+            return []
 
         cursor.execute('''
-            SELECT * FROM hardware_components 
-            WHERE name LIKE ? OR article_number LIKE ?
-        ''', (f'%{query}%', f'%{query}%'))
-        
-        rows = cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
-        
-        conn.close()
-        return results
\ No newline at end of file
+            SELECT hc.* FROM hardware_fts f
+            JOIN hardware_components hc ON hc.id = f.rowid
+            WHERE hardware_fts MATCH ?
+            LIMIT ?
+        ''', (match, -1 if limit is None else limit))
+
+        # sqlite3.Row subscripts like a dict; these results are read
+        # straight into views, so no per-row dict is materialized
+        return cursor.fetchall()
\ No newline at end of file
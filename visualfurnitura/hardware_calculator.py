@@ -3,9 +3,35 @@ Hardware calculator module for VisualFurnitura
 Calculates coordinates for hardware placement based on profile system parameters
 """
 import math
+import re
+from collections import namedtuple
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+
+# Placement templates as flat tuples of primitives: the hot loop in
+# calculate_hardware_placement reads fields by attribute offset instead
+# of hashing 'type'/'x_offset'/... keys per item
+_PositionTemplate = namedtuple('_PositionTemplate', 'name x_offset y_offset')
+_DimensionTemplate = namedtuple(
+    '_DimensionTemplate', 'name x_offset y_offset width_ratio height_ratio')
+
+
+# Keyword -> category table for _categorize_hardware_type, folded into a
+# single compiled alternation: one regex scan over the name replaces five
+# sequential any(... in ...) substring sweeps
+_CATEGORY_MAP = {
+    'петля': 'hinge', 'hinge': 'hinge', 'шарнир': 'hinge',
+    'ручка': 'handle', 'handle': 'handle', 'кноб': 'handle',
+    'замок': 'lock', 'lock': 'lock', 'засов': 'lock',
+    'отлив': 'sill', 'sill': 'sill', 'подоконник': 'sill',
+    'угол': 'corner', 'corner': 'corner',
+}
+_CATEGORY_RE = re.compile('|'.join(map(re.escape, _CATEGORY_MAP)),
+                          re.IGNORECASE)
+
 
 @dataclass
 class ProfileSystem:
@@ -18,9 +44,13 @@ class ProfileSystem:
     description: str = ""
 
 
-@dataclass
+@dataclass(frozen=True)
 class HardwarePlacement:
-    """Data class for hardware placement result"""
+    """Data class for hardware placement result.
+
+    Frozen so computed placements can be cached and shared between
+    callers without one of them editing the other's result.
+    """
     article: str
     name: str
     x: float  # mm from left edge
@@ -29,39 +59,76 @@ class HardwarePlacement:
     notes: str = ""
 
 
+@dataclass
+class HardwarePlacementBatch:
+    """Struct-of-arrays placement result for large batches.
+
+    Coordinates and rotations sit in contiguous float64 arrays instead
+    of one Python object per item, so drawing and export code can slice
+    whole columns at once; the string fields stay parallel lists.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    rotation: np.ndarray
+    article: List[str]
+    name: List[str]
+    notes: List[str]
+
+    def __len__(self) -> int:
+        return len(self.article)
+
+    def to_records(self) -> List[HardwarePlacement]:
+        """Materialize per-item HardwarePlacement objects for callers
+        that expect the record-per-placement shape
+        """
+        return [
+            HardwarePlacement(article=a, name=n, x=x, y=y, rotation=r, notes=t)
+            for a, n, x, y, r, t in zip(
+                self.article, self.name,
+                self.x.tolist(), self.y.tolist(), self.rotation.tolist(),
+                self.notes)
+        ]
+
+
 class HardwareCalculator:
     def __init__(self):
         self.profile_systems = {}
         self.hardware_templates = {}
+        # Memo for calculate_hardware_placement: the result depends only
+        # on the arguments and the registered templates/profiles, and
+        # get_mounting_recommendations / calculate_from_pdf_data repeat
+        # the same inputs many times over
+        self._placement_cache = {}
         self._initialize_default_templates()
 
     def _initialize_default_templates(self):
         """Initialize default hardware placement templates"""
         # Template for hinges (assuming 3 hinges for a standard door/window)
         self.hardware_templates['hinge'] = [
-            {'name': 'Петля верхняя', 'x_offset': 0.05, 'y_offset': 0.05, 'type': 'position'},  # 5% from top
-            {'name': 'Петля средняя', 'x_offset': 0.05, 'y_offset': 0.5, 'type': 'position'},   # Middle height
-            {'name': 'Петля нижняя', 'x_offset': 0.05, 'y_offset': 0.95, 'type': 'position'}   # 5% from bottom
+            _PositionTemplate('Петля верхняя', 0.05, 0.05),  # 5% from top
+            _PositionTemplate('Петля средняя', 0.05, 0.5),   # Middle height
+            _PositionTemplate('Петля нижняя', 0.05, 0.95)    # 5% from bottom
         ]
-        
+
         # Template for handle
         self.hardware_templates['handle'] = [
-            {'name': 'Ручка', 'x_offset': 0.5, 'y_offset': 0.75, 'type': 'position'}  # Middle width, 75% height
+            _PositionTemplate('Ручка', 0.5, 0.75)  # Middle width, 75% height
         ]
-        
+
         # Template for lock
         self.hardware_templates['lock'] = [
-            {'name': 'Замок', 'x_offset': 0.95, 'y_offset': 0.5, 'type': 'position'}  # 95% width (right side), middle height
+            _PositionTemplate('Замок', 0.95, 0.5)  # 95% width (right side), middle height
         ]
-        
+
         # Template for sills
         self.hardware_templates['sill'] = [
-            {'name': 'Отлив', 'x_offset': 0, 'y_offset': 0.99, 'width_ratio': 1.0, 'height_ratio': 0.01, 'type': 'dimension'}
+            _DimensionTemplate('Отлив', 0, 0.99, 1.0, 0.01)
         ]
 
     def add_profile_system(self, profile: ProfileSystem):
         """Add a profile system to the calculator"""
         self.profile_systems[profile.name] = profile
+        self._placement_cache.clear()
 
     def calculate_hardware_placement(self, 
                                    window_width: float, 
@@ -73,49 +140,57 @@ class HardwareCalculator:
         """
         if profile_name not in self.profile_systems:
             raise ValueError(f"Profile system '{profile_name}' not found")
-        
+
+        cache_key = (window_width, window_height, profile_name, hardware_type)
+        cached = self._placement_cache.get(cache_key)
+        if cached is not None:
+            # Placements are frozen, so handing out a fresh list of the
+            # same instances is safe
+            return list(cached)
+
         profile = self.profile_systems[profile_name]
         template = self.hardware_templates.get(hardware_type, [])
-        
+
         placements = []
-        
+
         for item in template:
-            if item['type'] == 'position':
-                x = window_width * item['x_offset']
-                y = window_height * item['y_offset']
-                
+            if isinstance(item, _PositionTemplate):
+                x = window_width * item.x_offset
+                y = window_height * item.y_offset
+
                 placement = HardwarePlacement(
                     article=f"{hardware_type}-{len(placements)+1}",
-                    name=item['name'],
+                    name=item.name,
                     x=x,
                     y=y,
                     rotation=0  # Default rotation
                 )
                 placements.append(placement)
-            
-            elif item['type'] == 'dimension':
+
+            elif isinstance(item, _DimensionTemplate):
                 # For items with dimensions (like sills)
-                x = window_width * item.get('x_offset', 0)
-                y = window_height * item.get('y_offset', 0)
-                width = window_width * item.get('width_ratio', 0.1)
-                height = window_height * item.get('height_ratio', 0.05)
-                
+                x = window_width * item.x_offset
+                y = window_height * item.y_offset
+                width = window_width * item.width_ratio
+                height = window_height * item.height_ratio
+
                 # Calculate center position for the dimensional item
                 center_x = x + width / 2
                 center_y = y + height / 2
-                
+
                 placement = HardwarePlacement(
                     article=f"{hardware_type}-{len(placements)+1}",
-                    name=item['name'],
+                    name=item.name,
                     x=center_x,
                     y=center_y,
                     rotation=0
                 )
                 placements.append(placement)
-        
-        return placements
 
-    def calculate_custom_placement(self, 
+        self._placement_cache[cache_key] = placements
+        return list(placements)
+
+    def calculate_custom_placement(self,
                                  window_width: float, 
                                  window_height: float,
                                  profile_name: str,
@@ -123,29 +198,57 @@ class HardwareCalculator:
         """
         Calculate custom hardware placement based on specific specifications
         """
+        return self.calculate_custom_placement_batch(
+            window_width, window_height, profile_name, hardware_specs
+        ).to_records()
+
+    def calculate_custom_placement_batch(self,
+                                         window_width: float,
+                                         window_height: float,
+                                         profile_name: str,
+                                         hardware_specs: List[Dict]) -> HardwarePlacementBatch:
+        """
+        Calculate custom hardware placement as a struct-of-arrays batch.
+
+        The absolute/relative position resolution runs as two vectorized
+        np.where passes over the whole batch (NaN marks a missing spec
+        value) instead of two Python calls per item.
+        """
         if profile_name not in self.profile_systems:
             raise ValueError(f"Profile system '{profile_name}' not found")
-        
+
         profile = self.profile_systems[profile_name]
-        placements = []
-        
-        for spec in hardware_specs:
-            # Calculate position based on various possible specifications
-            x = self._calculate_position(spec.get('x'), spec.get('x_offset'), window_width)
-            y = self._calculate_position(spec.get('y'), spec.get('y_offset'), window_height)
-            
-            placement = HardwarePlacement(
-                article=spec.get('article', f"HW-{len(placements)+1}"),
-                name=spec.get('name', f"Компонент-{len(placements)+1}"),
-                x=x,
-                y=y,
-                rotation=spec.get('rotation', 0),
-                notes=spec.get('notes', '')
-            )
-            
-            placements.append(placement)
-        
-        return placements
+
+        nan = math.nan
+        abs_x = np.array([nan if s.get('x') is None else s['x']
+                          for s in hardware_specs], dtype=np.float64)
+        rel_x = np.array([nan if s.get('x_offset') is None else s['x_offset']
+                          for s in hardware_specs], dtype=np.float64)
+        abs_y = np.array([nan if s.get('y') is None else s['y']
+                          for s in hardware_specs], dtype=np.float64)
+        rel_y = np.array([nan if s.get('y_offset') is None else s['y_offset']
+                          for s in hardware_specs], dtype=np.float64)
+
+        # Same precedence as _calculate_position: absolute value wins,
+        # then relative offset scaled by the dimension, then 0
+        x = np.where(np.isnan(abs_x),
+                     np.where(np.isnan(rel_x), 0.0, rel_x * window_width),
+                     abs_x)
+        y = np.where(np.isnan(abs_y),
+                     np.where(np.isnan(rel_y), 0.0, rel_y * window_height),
+                     abs_y)
+
+        return HardwarePlacementBatch(
+            x=x,
+            y=y,
+            rotation=np.array([s.get('rotation', 0) for s in hardware_specs],
+                              dtype=np.float64),
+            article=[s.get('article', f"HW-{i+1}")
+                     for i, s in enumerate(hardware_specs)],
+            name=[s.get('name', f"Компонент-{i+1}")
+                  for i, s in enumerate(hardware_specs)],
+            notes=[s.get('notes', '') for s in hardware_specs],
+        )
 
     def _calculate_position(self, absolute_pos: Optional[float], 
                           relative_offset: Optional[float], 
@@ -171,54 +274,66 @@ class HardwareCalculator:
         """
         Calculate symmetric placement for multiple identical components
         """
+        return list(self.iter_symmetric_placement(
+            window_width, window_height, profile_name,
+            hardware_article, hardware_name, count, alignment))
+
+    def iter_symmetric_placement(self,
+                                 window_width: float,
+                                 window_height: float,
+                                 profile_name: str,
+                                 hardware_article: str,
+                                 hardware_name: str,
+                                 count: int,
+                                 alignment: str = 'horizontal'):
+        """
+        Yield symmetric placements one at a time.
+
+        Consumers that draw or export each placement once can iterate
+        this directly and skip materializing the intermediate list.
+        """
         if profile_name not in self.profile_systems:
             raise ValueError(f"Profile system '{profile_name}' not found")
-        
-        placements = []
-        
+
         if alignment == 'horizontal':
             # Distribute horizontally along the width
             if count == 1:
-                x_positions = [window_width / 2]
+                x_positions = np.full(1, window_width / 2)
             else:
-                # Add margin to prevent placing items at the very edge
-                margin = 0.05 * window_width  # 5% margin
-                step = (window_width - 2 * margin) / (count - 1) if count > 1 else 0
-                x_positions = [margin + i * step for i in range(count)]
-            
-            for i, x in enumerate(x_positions):
-                placement = HardwarePlacement(
+                # linspace computes the evenly spaced grid in one C call;
+                # the 5% margin keeps items off the very edge
+                margin = 0.05 * window_width
+                x_positions = np.linspace(margin, window_width - margin, count)
+
+            for i, x in enumerate(x_positions.tolist()):
+                yield HardwarePlacement(
                     article=f"{hardware_article}-{i+1}",
                     name=f"{hardware_name} {i+1}",
                     x=x,
                     y=window_height / 2,  # Center vertically
                     rotation=0
                 )
-                placements.append(placement)
-        
+
         elif alignment == 'vertical':
             # Distribute vertically along the height
             if count == 1:
-                y_positions = [window_height / 2]
+                y_positions = np.full(1, window_height / 2)
             else:
-                # Add margin to prevent placing items at the very edge
-                margin = 0.05 * window_height  # 5% margin
-                step = (window_height - 2 * margin) / (count - 1) if count > 1 else 0
-                y_positions = [margin + i * step for i in range(count)]
-            
-            for i, y in enumerate(y_positions):
-                placement = HardwarePlacement(
+                # linspace computes the evenly spaced grid in one C call;
+                # the 5% margin keeps items off the very edge
+                margin = 0.05 * window_height
+                y_positions = np.linspace(margin, window_height - margin, count)
+
+            for i, y in enumerate(y_positions.tolist()):
+                yield HardwarePlacement(
                     article=f"{hardware_article}-{i+1}",
                     name=f"{hardware_name} {i+1}",
                     x=window_width / 2,  # Center horizontally
                     y=y,
                     rotation=0
                 )
-                placements.append(placement)
-        
-        return placements
 
-    def calculate_from_pdf_data(self, 
+    def calculate_from_pdf_data(self,
                               window_width: float, 
                               window_height: float,
                               profile_name: str,
@@ -231,13 +346,30 @@ class HardwareCalculator:
         
         profile = self.profile_systems[profile_name]
         placements = []
-        
+
+        # Hoist the fallback computation out of the row loop: every row
+        # of the same hardware type shares one default placement, so the
+        # template evaluation runs once per distinct type instead of
+        # once per row
+        fallback_types = {
+            self._categorize_hardware_type(hw_item.get('name', ''))
+            for hw_item in pdf_hardware_list
+            if hw_item.get('x_position') is None
+            or hw_item.get('y_position') is None
+        }
+        defaults = {
+            hw_type: (self.calculate_hardware_placement(
+                window_width, window_height, profile_name, hw_type
+            ) or [None])[0]
+            for hw_type in fallback_types
+        }
+
         for hw_item in pdf_hardware_list:
             # For now, if coordinates are provided in the PDF data, use them directly
             # Otherwise, calculate default positions based on component type
             x = hw_item.get('x_position')
             y = hw_item.get('y_position')
-            
+
             if x is not None and y is not None:
                 # Use coordinates from PDF if available
                 placement = HardwarePlacement(
@@ -249,15 +381,11 @@ class HardwareCalculator:
                     notes=hw_item.get('notes', '')
                 )
             else:
-                # Calculate default position based on hardware type
+                # Default position based on hardware type
                 hw_type = self._categorize_hardware_type(hw_item.get('name', ''))
-                default_placements = self.calculate_hardware_placement(
-                    window_width, window_height, profile_name, hw_type
-                )
-                
-                # If we have default placements, use the first one
-                if default_placements:
-                    default_placement = default_placements[0]
+                default_placement = defaults[hw_type]
+
+                if default_placement is not None:
                     placement = HardwarePlacement(
                         article=hw_item.get('article', 'N/A'),
                         name=hw_item.get('name', 'Unknown'),
@@ -276,29 +404,19 @@ class HardwareCalculator:
                         rotation=0,
                         notes=hw_item.get('notes', '')
                     )
-            
+
             placements.append(placement)
-        
+
         return placements
 
     def _categorize_hardware_type(self, hardware_name: str) -> str:
         """
         Categorize hardware type based on name
         """
-        name_lower = hardware_name.lower()
-        
-        if any(word in name_lower for word in ['петля', 'hinge', 'шарнир']):
-            return 'hinge'
-        elif any(word in name_lower for word in ['ручка', 'handle', 'кноб']):
-            return 'handle'
-        elif any(word in name_lower for word in ['замок', 'lock', 'засов']):
-            return 'lock'
-        elif any(word in name_lower for word in ['отлив', 'sill', 'подоконник']):
-            return 'sill'
-        elif any(word in name_lower for word in ['угол', 'corner']):
-            return 'corner'
-        else:
-            return 'other'  # Default category
+        match = _CATEGORY_RE.search(hardware_name)
+        if match:
+            return _CATEGORY_MAP[match.group(0).lower()]
+        return 'other'  # Default category
 
     def get_mounting_recommendations(self, 
                                    window_width: float, 
@@ -2,21 +2,24 @@
 Main application entry point for VisualFurnitura
 """
 import sys
-from PyQt6.QtWidgets import QApplication
-from visualization.window import MainWindow
 
 
 def main():
     """Main entry point of the application"""
+    # Imported here so that importing this module (helpers, test
+    # collection) does not pay the Qt startup cost
+    from PyQt6.QtWidgets import QApplication
+    from visualization.window import MainWindow
+
     app = QApplication(sys.argv)
-    
+
     # Create and show the main window
     window = MainWindow()
     window.show()
-    
+
     # Run the application
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -3,50 +3,165 @@ PDF exporter module for VisualFurnitura
 Generates PDF reports with hardware layout and specifications
 """
 from reportlab.lib.pagesizes import A4, letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFError
 from typing import Dict, List
+from io import BytesIO
+import functools
+import operator
 import os
 from datetime import datetime
 
+import numpy as np
+
+
+# Shared per-row field extractors for the report tables: prebound
+# methodcaller objects replace the attribute lookup plus argument setup
+# that a literal hw.get('name', 'N/A') pays on every row
+_GET_NAME = operator.methodcaller('get', 'name', 'N/A')
+_GET_PART = operator.methodcaller('get', 'part', 'N/A')
+_GET_CATEGORY = operator.methodcaller('get', 'category', 'N/A')
+_GET_NOTES = operator.methodcaller('get', 'notes', '')
+
+
+def _get_article(hw: Dict) -> str:
+    """Article with the article_number -> article -> N/A fallback chain"""
+    return hw.get('article_number', hw.get('article', 'N/A'))
+
+
+# Visualization image size, precomputed once instead of multiplying
+# inches out on every report
+_VIS_IMAGE_WIDTH = 6 * inch
+_VIS_IMAGE_HEIGHT = 4 * inch
+
+# Fixed column widths for the row-heavy tables (sized to the usable A4
+# frame width of ~6.2in). With explicit widths reportlab skips its
+# autofit pass, which measures every cell string against the font —
+# an O(rows x cols) glyph-metric loop on big reports
+_HW_COL_WIDTHS = [0.9 * inch, 1.6 * inch, 0.7 * inch,
+                  1.0 * inch, 1.1 * inch, 0.9 * inch]
+_SIMPLE_COL_WIDTHS = [0.4 * inch, 0.9 * inch, 1.7 * inch, 1.0 * inch,
+                      0.8 * inch, 0.5 * inch, 0.9 * inch]
+_MEASUREMENT_COL_WIDTHS = [0.9 * inch, 1.7 * inch, 0.7 * inch,
+                           0.7 * inch, 1.0 * inch, 1.2 * inch]
+
+
+# Candidate Cyrillic-capable TTF locations, most common first
+_FONT_CANDIDATES = (
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/System/Library/Fonts/Supplemental/Arial Unicode.ttf',
+    'C:\\Windows\\Fonts\\arial.ttf',
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _register_default_font() -> str:
+    """Register a Cyrillic-capable font once per process and return its
+    name; falls back to a built-in font when no TTF is available
+    """
+    # Probe for an existing file first: TTFont parses the whole TTF
+    # before failing, so the missing-font case should not pay for a
+    # parse attempt (and a bare except here used to swallow everything)
+    font_path = next(filter(os.path.exists, _FONT_CANDIDATES), None)
+    if font_path is not None:
+        try:
+            pdfmetrics.registerFont(TTFont('DejaVu', font_path))
+            return 'DejaVu'
+        except (TTFError, OSError):
+            pass
+    # Fallback to built-in fonts that support Cyrillic
+    return 'Helvetica'
+
+
+@functools.lru_cache(maxsize=1)
+def _build_styles():
+    """Build the shared stylesheet once: every exporter reuses the same
+    ParagraphStyle objects instead of re-registering the font and
+    reconstructing the sheet per instantiation
+    """
+    font = _register_default_font()
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        fontSize=18,
+        spaceAfter=30,
+        alignment=1,  # Center alignment
+        fontName=font
+    ))
+
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        fontSize=14,
+        spaceAfter=12,
+        fontName=font
+    ))
+
+    styles.add(ParagraphStyle(
+        name='CustomNormal',
+        fontSize=10,
+        spaceAfter=6,
+        fontName=font
+    ))
+    return styles
+
+
+@functools.lru_cache(maxsize=1)
+def _build_table_styles():
+    """Construct the table styles once: TableStyle validates its command
+    list on construction, so rebuilding identical styles per export is
+    pure waste. The styles are never mutated, making sharing safe
+    """
+    font = _register_default_font()
+    # Commands every table starts from: grey header row, beige body,
+    # full grid
+    common = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), font),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]
+    return {
+        'order': TableStyle(common + [
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ]),
+        'hardware': TableStyle(common + [
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 5),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+        ]),
+        'profile': TableStyle(common + [
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ]),
+        'simple_list': TableStyle(common + [
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ]),
+        'measurement': TableStyle(common + [
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ]),
+    }
+
 
 class PDFExporter:
     def __init__(self):
-        # Register a Cyrillic font if available, otherwise use built-in
-        try:
-            # Try to register a Cyrillic font (like DejaVu or Arial Unicode)
-            pdfmetrics.registerFont(TTFont('DejaVu', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'))
-            self.default_font = 'DejaVu'
-        except:
-            # Fallback to built-in fonts that support Cyrillic
-            self.default_font = 'Helvetica'
-
-        self.styles = getSampleStyleSheet()
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            fontSize=18,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            fontName=self.default_font
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading',
-            fontSize=14,
-            spaceAfter=12,
-            fontName=self.default_font
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='CustomNormal',
-            fontSize=10,
-            spaceAfter=6,
-            fontName=self.default_font
-        ))
+        self.default_font = _register_default_font()
+        self.styles = _build_styles()
+        self.table_styles = _build_table_styles()
 
     def export_visualization_report(self, output_path: str, order_data: Dict, hardware_list: List[Dict], 
                                    window_image_path: str = None):
@@ -70,23 +185,14 @@ class PDFExporter:
         ]
 
         order_table = Table(order_info, colWidths=[400])
-        order_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), self.default_font),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        order_table.setStyle(self.table_styles['order'])
         story.append(order_table)
         story.append(Spacer(1, 12))
 
         # Add window visualization image if available
         if window_image_path and os.path.exists(window_image_path):
             story.append(Paragraph("Схема расположения фурнитуры", self.styles['CustomHeading']))
-            img = Image(window_image_path, width=6*inch, height=4*inch)
+            img = Image(window_image_path, width=_VIS_IMAGE_WIDTH, height=_VIS_IMAGE_HEIGHT)
             story.append(img)
             story.append(Spacer(1, 12))
 
@@ -95,35 +201,22 @@ class PDFExporter:
         
         # Prepare table data
         hardware_headers = ["Артикул", "Название", "Количество", "Часть изделия", "Координаты", "Примечания"]
-        hardware_data = [hardware_headers]
-
-        for hw in hardware_list:
-            row = [
-                hw.get('article_number', hw.get('article', 'N/A')),
-                hw.get('name', 'N/A'),
-                str(hw.get('quantity', 1)),
-                hw.get('part', 'N/A'),
-                f"X:{hw.get('x_position', 0)}, Y:{hw.get('y_position', 0)}",
-                hw.get('notes', '')
-            ]
-            hardware_data.append(row)
+        hardware_data = [hardware_headers] + [
+            [_get_article(hw),
+             _GET_NAME(hw),
+             str(hw.get('quantity', 1)),
+             _GET_PART(hw),
+             f"X:{hw.get('x_position', 0)}, Y:{hw.get('y_position', 0)}",
+             _GET_NOTES(hw)]
+            for hw in hardware_list
+        ]
 
         # Create table
-        hardware_table = Table(hardware_data)
-        hardware_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), self.default_font),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 5),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-        ]))
+        # LongTable paginates row by row instead of sizing the whole
+        # grid up front, and repeatRows re-prints the header per page
+        hardware_table = LongTable(hardware_data, colWidths=_HW_COL_WIDTHS,
+                                   repeatRows=1)
+        hardware_table.setStyle(self.table_styles['hardware'])
         story.append(hardware_table)
         story.append(Spacer(1, 12))
 
@@ -142,17 +235,7 @@ class PDFExporter:
             ]
             
             profile_table = Table(profile_info)
-            profile_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), self.default_font),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ]))
+            profile_table.setStyle(self.table_styles['profile'])
             story.append(profile_table)
 
         # Build PDF
@@ -172,39 +255,51 @@ class PDFExporter:
 
         # Hardware list table
         hardware_headers = ["#", "Артикул", "Название", "Категория", "Количество", "Ед.изм.", "Примечания"]
-        hardware_data = [hardware_headers]
-
-        for idx, hw in enumerate(hardware_list, 1):
-            row = [
-                str(idx),
-                hw.get('article_number', hw.get('article', 'N/A')),
-                hw.get('name', 'N/A'),
-                hw.get('category', 'N/A'),
-                str(hw.get('quantity', 1)),
-                "шт",  # Units
-                hw.get('notes', '')
-            ]
-            hardware_data.append(row)
+
+        # Row numbers rendered in one vectorized pass instead of a
+        # str(idx) call per row
+        idx_col = np.arange(1, len(hardware_list) + 1).astype('U7').tolist()
+
+        hardware_data = [hardware_headers] + [
+            [idx,
+             _get_article(hw),
+             _GET_NAME(hw),
+             _GET_CATEGORY(hw),
+             str(hw.get('quantity', 1)),
+             "шт",  # Units
+             _GET_NOTES(hw)]
+            for idx, hw in zip(idx_col, hardware_list)
+        ]
 
         # Create table
-        hardware_table = Table(hardware_data)
-        hardware_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), self.default_font),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ]))
+        hardware_table = LongTable(hardware_data, colWidths=_SIMPLE_COL_WIDTHS,
+                                   repeatRows=1)
+        hardware_table.setStyle(self.table_styles['simple_list'])
         story.append(hardware_table)
 
         # Build PDF
         doc.build(story)
 
+    def export_many(self, jobs: List[tuple]):
+        """Export a batch of visualization reports through one buffer.
+
+        ``jobs`` holds (output_path, order_data, hardware_list) tuples.
+        Every PDF is built into the same reused BytesIO (fonts, styles
+        and page geometry are already shared at module level) and then
+        moved into place with os.replace, so a failure mid-build never
+        leaves a truncated file at the destination.
+        """
+        buf = BytesIO()
+        for output_path, order_data, hardware_list in jobs:
+            buf.seek(0)
+            buf.truncate()
+            self.export_visualization_report(buf, order_data, hardware_list)
+
+            tmp_path = f"{output_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(buf.getbuffer())
+            os.replace(tmp_path, output_path)
+
     def export_measurement_report(self, output_path: str, order_data: Dict, measurements: List[Dict]):
         """
         Export a measurement report with precise coordinates
@@ -226,31 +321,30 @@ class PDFExporter:
         story.append(Paragraph("Координаты установки компонентов", self.styles['CustomHeading']))
 
         measurement_headers = ["Артикул", "Название", "X (мм)", "Y (мм)", "Поворот (град)", "Примечания"]
-        measurement_data = [measurement_headers]
-
-        for meas in measurements:
-            row = [
-                meas.get('article_number', meas.get('article', 'N/A')),
-                meas.get('name', 'N/A'),
-                f"{meas.get('x_position', 0):.1f}",
-                f"{meas.get('y_position', 0):.1f}",
-                f"{meas.get('rotation', 0):.1f}",
-                meas.get('notes', '')
-            ]
-            measurement_data.append(row)
 
-        measurement_table = Table(measurement_data)
-        measurement_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), self.default_font),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
+        # Format the numeric columns in bulk: one np.char.mod call per
+        # column renders every float in C instead of compiling an
+        # f-string format three times per row
+        n = len(measurements)
+        x_col = np.char.mod('%.1f', np.fromiter(
+            (m.get('x_position', 0) for m in measurements),
+            dtype=np.float64, count=n))
+        y_col = np.char.mod('%.1f', np.fromiter(
+            (m.get('y_position', 0) for m in measurements),
+            dtype=np.float64, count=n))
+        rot_col = np.char.mod('%.1f', np.fromiter(
+            (m.get('rotation', 0) for m in measurements),
+            dtype=np.float64, count=n))
+
+        measurement_data = [measurement_headers] + [
+            [_get_article(meas), _GET_NAME(meas), x, y, rot, _GET_NOTES(meas)]
+            for meas, x, y, rot in zip(measurements, x_col, y_col, rot_col)
+        ]
+
+        measurement_table = LongTable(measurement_data,
+                                      colWidths=_MEASUREMENT_COL_WIDTHS,
+                                      repeatRows=1)
+        measurement_table.setStyle(self.table_styles['measurement'])
         story.append(measurement_table)
 
         # Build PDF
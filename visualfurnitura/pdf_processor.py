@@ -3,12 +3,161 @@ PDF processor module for VisualFurnitura
 Handles parsing of PDF files to extract hardware information
 """
 import fitz  # PyMuPDF
+import functools
+import hashlib
+import numpy as np
+import os
+import pickle
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+# Bump when the parsing logic changes so stale cached results from an
+# older parser are never served
+_PARSER_CACHE_VERSION = 2
+
+
+def _parse_cache_dir() -> str:
+    path = os.path.join(os.path.expanduser('~'), '.cache',
+                        'visualfurnitura', 'pdf_parses')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# Below this page count the fork/pickle overhead of a worker pool costs
+# more than the extraction itself, so small documents stay serial
+_PARALLEL_PAGE_THRESHOLD = 8
+
+# Plain-text extraction mode: skip the ligature/whitespace synthesis and
+# generated-space insertion that the default flags pay for. The parsers
+# only run regexes over the text, so the cosmetic spacing is dead weight
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_INHIBIT_SPACES
+
+
+def _extract_page_text(args):
+    """Pool worker: extract the text of a chunk of pages.
+
+    Takes (pdf_path, page_indices) as one argument so it fits Pool.map.
+    The worker reopens the document itself - fitz handles cannot be
+    pickled across process boundaries.
+    """
+    pdf_path, page_indices = args
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc.load_page(i).get_text('text', flags=_TEXT_FLAGS, sort=False)
+                for i in page_indices]
+    finally:
+        doc.close()
+
+
+# All scanning patterns compiled once at import: the parsers run them
+# against every PDF, and per-call re.findall(literal) pays the pattern
+# cache lookup (or a recompile after eviction) each time
+
+# Window dimensions (patterns like 1540x1790)
+_DIMENSION_RE = re.compile(r'(\d{3,4})[x\u00D7](\d{3,4})')
+
+# Article, quantity and part patterns fused into one alternation: a
+# single pass over the document text replaces nine sequential findall
+# sweeps. Each alternative keeps its original pattern wrapped in a
+# named group; the payload is the first capture inside that wrapper
+_FUSED_SPECS = (
+    # Common patterns for articles: alphanumeric codes like A1234, 123456, etc.
+    ('article', r'(?:арт\.?|article|артикул)[\s:]*([A-Za-z0-9\-]+)'),  # artpatterns
+    ('article', r'([A-Z]{1,2}\d{3,6}(?:-\d+)?)'),  # Standard article format like A1234
+    ('article', r'(\d{5,8})'),  # Numeric articles
+    # Quantity patterns (numbers followed by pieces, шт, etc.)
+    ('quantity', r'(\d+)\s*(?:шт\.?|pcs?\.?|pieces?|qty)'),
+    ('quantity', r'qty[.:]?\s*(\d+)'),
+    ('quantity', r'(\d+)\s+(?:шт|pcs|pieces)'),
+    # Part identifiers (C-1, C-2, etc.)
+    ('part', r'[Cc]-(\d+)'),
+    ('part', r'(?:часть|part)\s*[Cc]-(\d+)'),
+    ('part', r'([Cc]-\d+)'),
+)
+_FUSED_RE = re.compile(
+    '|'.join(f'(?P<g{i}>{pattern})'
+             for i, (_, pattern) in enumerate(_FUSED_SPECS)),
+    re.IGNORECASE)
+_FUSED_KIND = {f'g{i}': kind for i, (kind, _) in enumerate(_FUSED_SPECS)}
+# Payload capture = first group inside each named wrapper
+_FUSED_PAYLOAD = {name: _FUSED_RE.groupindex[name] + 1 for name in _FUSED_KIND}
+
+# Technical-spec keyword families, fused the same way as _FUSED_SPECS:
+# one alternation walks the text once for every keyword instead of one
+# scan per keyword per family (a single-pass multi-keyword scan in the
+# spirit of Aho-Corasick, without pulling in an automaton dependency)
+
+# Dimension specification keywords (width, height, thickness, etc.).
+# The numeric neighborhood is checked by _DIM_NUM_RE anchored right
+# after each keyword hit
+_DIM_KEYWORDS = ('ширина', 'высота', 'толщина', 'размер',
+                 'width', 'height', 'thickness', 'size')
+# \d+(?:\.\d+)? rejects trailing-dot artifacts like "12." and commits
+# after the digits without trying the optional fraction on its own
+_DIM_NUM_RE = re.compile(r'[:\s]+(\d+(?:\.\d+)?)\s*(?:мм|mm|cm)?')
+
+# Mounting schemes (common terms in Russian and English)
+_MOUNTING_TERMS = ('монтаж', 'крепление', 'установка',
+                   'mounting', 'installation', 'fixing')
+
+# Other technical specs: per type, the first pattern rank with any hit
+# wins, like the old first-matching-pattern break
+_SPEC_PATTERNS = {
+    'material': (r'материал|material',
+                 r'сталь|steel|алюминий|aluminum|пластик|plastic'),
+    'color': (r'цвет|color',
+              r'белый|white|коричневый|brown|черный|black'),
+    'weight': (r'вес|weight',
+               r'(\d+\.?\d*)\s*(?:кг|kg|g)'),
+    'load_capacity': (r'грузоподъемность|load\s+capacity',
+                      r'(\d+\.?\d*)\s*(?:кг|kg)'),
+}
+
+_TECH_ALTS = (
+    [('dim', keyword, 0, keyword) for keyword in _DIM_KEYWORDS]
+    + [('mounting', term, 0, term) for term in _MOUNTING_TERMS]
+    + [('spec', spec_type, rank, pattern)
+       for spec_type, patterns in _SPEC_PATTERNS.items()
+       for rank, pattern in enumerate(patterns)]
+)
+_TECH_RE = re.compile(
+    '|'.join(f'(?P<t{i}>{pattern})'
+             for i, (_, _, _, pattern) in enumerate(_TECH_ALTS)),
+    re.IGNORECASE)
+_TECH_BY_GROUP = {f't{i}': alt[:3] for i, alt in enumerate(_TECH_ALTS)}
+# Alternatives with their own capture keep findall's group-1 payload;
+# bare literals fall back to the whole match
+_TECH_PAYLOAD = {
+    f't{i}': _TECH_RE.groupindex[f't{i}'] + 1
+             if re.compile(pattern, re.IGNORECASE).groups else None
+    for i, (_, _, _, pattern) in enumerate(_TECH_ALTS)
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _name_res(article: str):
+    """Name-candidate patterns near an article, compiled per article"""
+    escaped = re.escape(article)
+    return (
+        re.compile(r'([а-яёa-z]+\s*[а-яёa-z]*)\s+' + escaped, re.IGNORECASE),
+        re.compile(escaped + r'\s+([а-яёa-z]+(?:\s+[а-яёa-z]+)*)', re.IGNORECASE),
+        re.compile(r'(' + escaped + r'\s+[а-яёa-z]+)', re.IGNORECASE),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _article_strip_re(article: str):
+    return re.compile(re.escape(article), re.IGNORECASE)
+
+
+# slots drops the per-instance __dict__ (a parser can emit thousands of
+# items); frozen makes the records hashable for dedup and set membership
+@dataclass(slots=True, frozen=True)
 class HardwareItem:
     """Data class for hardware items extracted from PDF"""
     article: str
@@ -18,7 +167,7 @@ class HardwareItem:
     position: Optional[str] = None  # Position information if available
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WindowDimensions:
     """Data class for window dimensions"""
     width: int
@@ -27,228 +176,400 @@ class WindowDimensions:
 
 class PDFProcessor:
     def __init__(self):
-        pass
+        # MuPDF writes every warning to stderr - a syscall per message.
+        # The parsers work on whatever text comes out either way
+        fitz.TOOLS.mupdf_display_errors(False)
+        # Parse results memoized by content hash; admin flows re-open
+        # the same document repeatedly
+        self._parse_cache: Dict[str, Dict] = {}
+        # Open document handles reused across parse/extract calls on
+        # the same file; keyed by path, invalidated by mtime
+        self._doc_cache: Dict[str, tuple] = {}
 
-    def parse_hardware_pdf(self, pdf_path: str) -> Dict:
+    def _get_doc(self, pdf_path: str) -> fitz.Document:
+        """Return a cached open document for the path, reopening only
+        when the file changed on disk
+        """
+        mtime = os.path.getmtime(pdf_path)
+        entry = self._doc_cache.get(pdf_path)
+        if entry is not None:
+            cached_mtime, doc = entry
+            if cached_mtime == mtime and not doc.is_closed:
+                return doc
+            doc.close()
+        doc = fitz.open(pdf_path)
+        self._doc_cache[pdf_path] = (mtime, doc)
+        return doc
+
+    def close_all(self):
+        """Close every cached document handle"""
+        for _, doc in self._doc_cache.values():
+            doc.close()
+        self._doc_cache.clear()
+
+    def parse_hardware_pdf(self, pdf_path: str,
+                           include_raw_text: bool = False) -> Dict:
         """
         Parse PDF file to extract hardware information
         Returns a dictionary with parsed data
+
+        Results are memoized by a hash of the file bytes, in memory and
+        under ~/.cache/visualfurnitura/pdf_parses, so re-parsing an
+        unchanged document is a lookup instead of a full extraction.
+
+        result['raw_text'] is empty unless include_raw_text is set: the
+        parser streams page-by-page and holding the whole document text
+        is pure overhead for callers that only want the parsed fields.
+        """
+        with open(pdf_path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        cache_key = f'v{_PARSER_CACHE_VERSION}-{digest}'
+        if include_raw_text:
+            cache_key += '-raw'
+
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        cache_file = os.path.join(_parse_cache_dir(), f'{cache_key}.pkl')
+        try:
+            with open(cache_file, 'rb') as f:
+                result = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            pass
+        else:
+            self._parse_cache[cache_key] = result
+            return dict(result)
+
+        result = self._parse_hardware_text(pdf_path, include_raw_text)
+
+        self._parse_cache[cache_key] = result
+        try:
+            # Write-then-rename so a concurrent reader never sees a
+            # half-written pickle
+            with open(f'{cache_file}.tmp', 'wb') as f:
+                pickle.dump(result, f)
+            os.replace(f'{cache_file}.tmp', cache_file)
+        except OSError:
+            pass  # Cache is best-effort; the result is still good
+
+        return dict(result)
+
+    def _parse_hardware_text(self, pdf_path: str,
+                             include_raw_text: bool = False) -> Dict:
+        """Cold parse behind parse_hardware_pdf's cache.
+
+        Runs the scans page-by-page and discards each page string as
+        soon as it is processed, so peak memory is one page rather than
+        the whole document. Matches spanning a page break are lost,
+        which for numeric articles is vanishingly rare.
         """
-        doc = fitz.open(pdf_path)
-        text = ""
-        
-        # Extract text from all pages
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-        
-        doc.close()
-        
-        # Parse the extracted text
         result = {
             'hardware_items': [],
+            'hardware_columns': None,
             'window_dimensions': None,
             'parts': [],
-            'raw_text': text
+            'raw_text': '',
+            'name_contexts': {},
         }
         
-        # Find window dimensions (look for patterns like 1540x1790)
-        dimension_pattern = r'(\d{3,4})[x\u00D7](\d{3,4})'
-        dimension_matches = re.findall(dimension_pattern, text)
-        
-        if dimension_matches:
-            # Take the first match as the window size (or the largest if multiple found)
-            dims = [(int(w), int(h)) for w, h in dimension_matches]
-            # Sort by area to find the most likely window size
-            dims.sort(key=lambda x: x[0] * x[1], reverse=True)
-            width, height = dims[0]
-            result['window_dimensions'] = WindowDimensions(width, height)
-        
-        # Find hardware items by looking for article numbers and quantities
-        # Common patterns for articles: alphanumeric codes like A1234, 123456, etc.
-        article_patterns = [
-            r'(?:арт\.?|article|артикул)[\s:]*([A-Za-z0-9\-]+)',  # artpatterns
-            r'([A-Z]{1,2}\d{3,6}(?:-\d+)?)',  # Standard article format like A1234
-            r'(\d{5,8})'  # Numeric articles
-        ]
-        
-        # Look for quantity patterns (numbers followed by pieces, шт, etc.)
-        quantity_patterns = [
-            r'(\d+)\s*(?:шт\.?|pcs?\.?|pieces?|qty)',
-            r'qty[.:]?\s*(\d+)',
-            r'(\d+)\s+(?:шт|pcs|pieces)'
-        ]
-        
-        # Look for part identifiers (C-1, C-2, etc.)
-        part_patterns = [
-            r'[Cc]-(\d+)',
-            r'(?:часть|part)\s*[Cc]-(\d+)',
-            r'([Cc]-\d+)'
-        ]
-        
-        # Extract all potential articles
+        dimension_matches = []
         all_articles = []
-        for pattern in article_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            all_articles.extend(matches)
-        
-        # Extract quantities
         all_quantities = []
-        for pattern in quantity_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            all_quantities.extend([int(q) for q in matches])
-        
-        # Extract parts
         all_parts = []
-        for pattern in part_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            all_parts.extend([f"C-{part}" if not part.startswith('C-') else part for part in matches])
+        name_contexts = result['name_contexts']
+        raw_pages = [] if include_raw_text else None
+        for page_text in self._iter_page_text(pdf_path):
+            if raw_pages is not None:
+                raw_pages.append(page_text)
+            
+            # Window dimensions
+            dimension_matches.extend(_DIMENSION_RE.findall(page_text))
+            
+            # Articles, quantities and parts in one fused scan
+            for match in _FUSED_RE.finditer(page_text):
+                wrapper = match.lastgroup
+                payload = match.group(_FUSED_PAYLOAD[wrapper])
+                kind = _FUSED_KIND[wrapper]
+                if kind == 'article':
+                    article = payload.strip()
+                    all_articles.append(article)
+                    # Keep a small window around the first occurrence
+                    # for the later name guess, so it needs no document
+                    # text at all
+                    if article not in name_contexts:
+                        name_contexts[article] = page_text[
+                            max(0, match.start() - 50):match.end() + 50]
+                elif kind == 'quantity':
+                    all_quantities.append(int(payload))
+                else:
+                    all_parts.append(payload if payload.startswith('C-')
+                                     else f"C-{payload}")
         
-        # Combine the information (this is a simplified approach)
-        # In a real implementation, we would need more sophisticated matching
-        for i, article in enumerate(all_articles[:min(len(all_articles), len(all_quantities), len(all_parts))]):
-            if i < len(all_quantities) and i < len(all_parts):
-                hardware_item = HardwareItem(
-                    article=article.strip(),
-                    name=self._guess_name_from_context(article, text),
-                    quantity=all_quantities[i],
-                    part=all_parts[i]
-                )
-                result['hardware_items'].append(hardware_item)
+        if raw_pages is not None:
+            result['raw_text'] = ''.join(raw_pages)
         
-        # If we couldn't match by index, try to create items based on available info
-        if not result['hardware_items']:
-            # Just create basic items with articles found
-            for article in all_articles[:10]:  # Limit to first 10 to avoid noise
-                hardware_item = HardwareItem(
-                    article=article.strip(),
-                    name=self._guess_name_from_context(article, text),
-                    quantity=1,  # Default quantity
-                    part="C-1"   # Default part
-                )
-                result['hardware_items'].append(hardware_item)
+        if dimension_matches:
+            # The largest area is the most likely window size. argmax
+            # over a fused product finds it in one O(n) numpy pass -
+            # the int parse, the key lambda and the sort all go away
+            arr = np.asarray(dimension_matches, dtype=np.int32)
+            i = int((arr[:, 0] * arr[:, 1]).argmax())
+            result['window_dimensions'] = WindowDimensions(int(arr[i, 0]),
+                                                           int(arr[i, 1]))
+        
+        # Combine the information into parallel columns (this is a
+        # simplified approach - in a real implementation, we would need
+        # more sophisticated matching). One object array per field keeps
+        # aggregation vectorizable (qty sums, part masks) instead of
+        # walking per-item objects
+        n = min(len(all_articles), len(all_quantities), len(all_parts))
+        if n:
+            articles = np.array(all_articles[:n], dtype=object)
+            quantities = np.fromiter(all_quantities, dtype=np.int32, count=n)
+            parts = np.array(all_parts[:n], dtype=object)
+        else:
+            # Couldn't match by index: basic items from the articles
+            # found, limited to the first 10 to avoid noise
+            articles = np.array(all_articles[:10], dtype=object)
+            quantities = np.ones(len(articles), dtype=np.int32)
+            parts = np.array(['C-1'] * len(articles), dtype=object)
+        result['hardware_columns'] = {
+            'article': articles,
+            'qty': quantities,
+            'part': parts,
+        }
+        
+        # Materialized item view, kept so callers written against the
+        # dataclass API need not know about the columns
+        result['hardware_items'] = list(self.iter_hardware_items(result))
         
         return result
 
-    def _guess_name_from_context(self, article: str, text: str) -> str:
+    def iter_hardware_items(self, result: Dict):
+        """Yield HardwareItem objects lazily from the parsed columns.
+
+        Name guessing - the expensive per-item step - runs only for the
+        items actually consumed.
+        """
+        columns = result['hardware_columns']
+        contexts = result.get('name_contexts') or {}
+        text = result.get('raw_text') or ''
+        # Folded once per document; the per-article lookup only folds
+        # the (short) article
+        text_folded = text.casefold()
+        # Resolve each distinct article once - the extraction pass
+        # over-collects, so the same article often repeats - and let
+        # duplicate rows share the resolved name. The window captured
+        # during parsing is preferred; raw_text is the fallback for
+        # callers that assembled the result themselves
+        name_map = {
+            article: (self._guess_name_from_window(article, contexts[article])
+                      if article in contexts
+                      else self._guess_name_from_context(article, text,
+                                                         text_folded))
+            for article in dict.fromkeys(columns['article'])
+        }
+        for article, quantity, part in zip(columns['article'],
+                                           columns['qty'],
+                                           columns['part']):
+            yield HardwareItem(
+                article=article,
+                name=name_map[article],
+                quantity=int(quantity),
+                part=part
+            )
+
+    def _iter_page_text(self, pdf_path: str):
+        """Yield the text of each page, in page order.
+
+        Large documents are split into contiguous page-index chunks and
+        extracted by a process pool; text extraction is CPU-bound in the
+        fitz layout code, so threads would serialize on the GIL. Pages
+        stream out as their chunk completes, so the consumer never holds
+        more than one chunk of text.
+        """
+        doc = self._get_doc(pdf_path)
+        page_count = len(doc)
+
+        if page_count < _PARALLEL_PAGE_THRESHOLD:
+            for i in range(page_count):
+                yield doc.load_page(i).get_text('text', flags=_TEXT_FLAGS,
+                                                sort=False)
+            return
+
+        num_workers = min(os.cpu_count() or 1, 4, page_count)
+        bounds = [i * page_count // num_workers
+                  for i in range(num_workers + 1)]
+        chunks = [(pdf_path, range(bounds[i], bounds[i + 1]))
+                  for i in range(num_workers)]
+        with Pool(num_workers) as pool:
+            for chunk in pool.imap(_extract_page_text, chunks):
+                yield from chunk
+
+    def _guess_name_from_context(self, article: str, text: str,
+                                 text_folded: Optional[str] = None) -> str:
         """
         Try to guess the name of the hardware item based on context around the article number
+
+        Callers looking up many articles in one document should pass
+        text.casefold() as text_folded so the full text is folded once,
+        not once per article; the substring probe itself is the C
+        two-way matcher and rejects absent articles in O(n).
         """
-        # Find the article in the text and look for descriptive words nearby
-        pattern = rf'.{{0,50}}{re.escape(article)}.*?.{{0,50}}'
-        matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-        
-        if matches:
-            # Extract likely name candidates (words that appear near the article)
-            # This is a simplified approach - in reality, this would need more sophisticated NLP
-            context = matches[0]
-            
-            # Look for words that might describe the hardware type
-            name_patterns = [
-                r'([а-яёa-z]+\s*[а-яёa-z]*)\s+' + re.escape(article),
-                re.escape(article) + r'\s+([а-яёa-z]+(?:\s+[а-яёa-z]+)*)',
-                r'(' + re.escape(article) + r'\s+[а-яёa-z]+)'
-            ]
-            
-            for pattern in name_patterns:
-                found = re.search(pattern, context, re.IGNORECASE)
-                if found:
-                    name = found.group(1).strip()
-                    # Remove the article from the name if it was included
-                    name = re.sub(re.escape(article), '', name, flags=re.IGNORECASE).strip()
-                    if len(name) > 1:  # Make sure we have a meaningful name
-                        return name.title()
+        if text_folded is None:
+            text_folded = text.casefold()
+
+        # Find the article in the text and look for descriptive words
+        # nearby. A plain find + slice bounds the context to 50 chars on
+        # each side; the old unanchored `.{0,50}article.*?.{0,50}` scan
+        # could backtrack over the whole document on a miss
+        pos = text_folded.find(article.casefold())
+
+        if pos != -1:
+            context = text[max(0, pos - 50):pos + len(article) + 50]
+            return self._guess_name_from_window(article, context)
         
         # If we can't find a specific name, return the article itself
         return article
 
-    def parse_technical_pdf(self, pdf_path: str) -> Dict:
+    def _guess_name_from_window(self, article: str, context: str) -> str:
+        """Guess a hardware name from a small context window.
+
+        Extracts likely name candidates - words that appear near the
+        article. This is a simplified approach; in reality, this would
+        need more sophisticated NLP.
+        """
+        # Look for words that might describe the hardware type
+        for pattern in _name_res(article):
+            found = pattern.search(context)
+            if found:
+                name = found.group(1).strip()
+                # Remove the article from the name if it was included
+                name = _article_strip_re(article).sub('', name).strip()
+                if len(name) > 1:  # Make sure we have a meaningful name
+                    return name.title()
+        
+        return article
+
+    def parse_technical_pdf(self, pdf_path: str,
+                            include_raw_text: bool = False) -> Dict:
         """
         Parse technical PDF files to extract component specifications
+
+        Streams page-by-page like parse_hardware_pdf; result['raw_text']
+        is filled only when include_raw_text is set.
         """
-        doc = fitz.open(pdf_path)
-        text = ""
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-        
-        doc.close()
-        
-        # Extract technical specifications
         result = {
             'specifications': {},
             'mounting_schemes': [],
             'dimensions': {},
-            'raw_text': text
+            'raw_text': ''
         }
         
-        # Look for dimension specifications (width, height, thickness, etc.)
-        dimension_keywords = ['ширина', 'высота', 'толщина', 'размер', 'width', 'height', 'thickness', 'size']
-        for keyword in dimension_keywords:
-            pattern = rf'{keyword}[:\s]+(\d+\.?\d*)\s*мм?|mm?|cm?'
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                result['dimensions'][keyword] = [float(m) for m in matches]
+        # One pass per page collects hits for every keyword family
+        mounting_contexts = {}           # term -> context of first hit
+        spec_hits = {}                   # (spec_type, rank) -> payloads
+        raw_pages = [] if include_raw_text else None
+        for page_text in self._iter_page_text(pdf_path):
+            if raw_pages is not None:
+                raw_pages.append(page_text)
+            for match in _TECH_RE.finditer(page_text):
+                kind, key, rank = _TECH_BY_GROUP[match.lastgroup]
+                if kind == 'dim':
+                    # Dimension keyword: the value must follow immediately
+                    number = _DIM_NUM_RE.match(page_text, match.end())
+                    if number:
+                        result['dimensions'].setdefault(key, []).append(
+                            float(number.group(1)))
+                elif kind == 'mounting':
+                    if key not in mounting_contexts:
+                        mounting_contexts[key] = page_text[
+                            max(0, match.start() - 100):match.end() + 100]
+                else:
+                    payload_group = _TECH_PAYLOAD[match.lastgroup]
+                    spec_hits.setdefault((key, rank), []).append(
+                        match.group(payload_group) if payload_group
+                        else match.group(0))
         
-        # Look for mounting schemes (common terms in Russian and English)
-        mounting_terms = ['монтаж', 'крепление', 'установка', 'mounting', 'installation', 'fixing']
-        for term in mounting_terms:
-            if re.search(term, text, re.IGNORECASE):
+        if raw_pages is not None:
+            result['raw_text'] = ''.join(raw_pages)
+
+        # Mounting schemes keep the term-list order; the context is a
+        # plain slice around the first hit
+        for term in _MOUNTING_TERMS:
+            if term in mounting_contexts:
                 result['mounting_schemes'].append({
                     'term_found': term,
-                    'context': self._extract_context(text, term, 100)
+                    'context': mounting_contexts[term]
                 })
-        
-        # Extract other technical specs
-        spec_patterns = {
-            'material': [r'материал|material', r'сталь|steel|алюминий|aluminum|пластик|plastic'],
-            'color': [r'цвет|color', r'белый|white|коричневый|brown|черный|black'],
-            'weight': [r'вес|weight', r'(\d+\.?\d*)\s*(?:кг|kg|g)'],
-            'load_capacity': [r'грузоподъемность|load\s+capacity', r'(\d+\.?\d*)\s*(?:кг|kg)']
-        }
-        
-        for spec_type, patterns in spec_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    result['specifications'][spec_type] = matches
+
+        # Other technical specs: first pattern rank with hits wins
+        for spec_type, patterns in _SPEC_PATTERNS.items():
+            for rank in range(len(patterns)):
+                hits = spec_hits.get((spec_type, rank))
+                if hits:
+                    result['specifications'][spec_type] = hits
                     break
         
         return result
 
     def _extract_context(self, text: str, target: str, char_count: int = 100) -> str:
-        """Extract context around a target word"""
-        pattern = rf'.{{0,{char_count}}}{target}.{{0,{char_count}}}'
-        match = re.search(pattern, text, re.IGNORECASE)
-        return match.group(0) if match else ""
+        """Extract context around a target word.
+
+        A case-insensitive find plus a slice: no regex engine, no
+        re.escape, and the bounded .{0,N} wildcards that used to retry
+        up to N positions per failure are gone.
+        """
+        idx = text.casefold().find(target.casefold())
+        if idx == -1:
+            return ""
+        return text[max(0, idx - char_count):idx + len(target) + char_count]
 
     def extract_images_from_pdf(self, pdf_path: str, output_dir: str) -> List[str]:
         """
         Extract images from PDF file
         """
-        doc = fitz.open(pdf_path)
-        image_paths = []
-        
-        for page_index in range(len(doc)):
-            page = doc.load_page(page_index)
-            image_list = page.get_images()
-            
-            for img_index, img in enumerate(image_list):
-                xref = img[0]
+        doc = self._get_doc(pdf_path)
+        doc_lock = threading.Lock()
+
+        def save_image(task):
+            page_index, img_index, xref = task
+            # fitz documents are not thread-safe; only the calls that
+            # touch the shared handle run under the lock. The file
+            # writes run outside it, in parallel.
+            # extract_image hands back the already-compressed stream
+            # (JPEG/FLATE) as stored in the PDF - no decode, no pixmap
+            # allocation, no re-encode
+            with doc_lock:
+                img_info = doc.extract_image(xref)
+            if img_info:
+                ext = img_info['ext']
+                img_path = f"{output_dir}/page_{page_index}_img_{img_index}.{ext}"
+                with open(img_path, 'wb') as f:
+                    f.write(img_info['image'])
+                return img_path
+
+            # No embedded stream (e.g. inline or synthetic image):
+            # fall back to rendering a pixmap
+            with doc_lock:
                 pix = fitz.Pixmap(doc, xref)
-                
-                if pix.n < 5:  # Check if not CMYK
-                    img_path = f"{output_dir}/page_{page_index}_img_{img_index}.png"
-                    pix.save(img_path)
-                    image_paths.append(img_path)
-                else:  # CMYK: convert via the original base image
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
-                    img_path = f"{output_dir}/page_{page_index}_img_{img_index}.png"
-                    pix.save(img_path)
-                    image_paths.append(img_path)
-                
-                pix = None  # Free memory
-        
-        doc.close()
-        return image_paths
\ No newline at end of file
+            if pix.n >= 5:  # CMYK: convert via the original base image
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            img_path = f"{output_dir}/page_{page_index}_img_{img_index}.png"
+            pix.save(img_path)
+            return img_path
+
+        tasks = [(page_index, img_index, img[0])
+                 for page_index in range(len(doc))
+                 for img_index, img in enumerate(
+                     doc.load_page(page_index).get_images())]
+        if not tasks:
+            return []
+        if len(tasks) == 1:
+            return [save_image(tasks[0])]
+        workers = min(len(tasks), os.cpu_count() or 1, 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map keeps submission order, so the returned paths stay
+            # sorted by (page, image) like the serial loop produced
+            return list(pool.map(save_image, tasks))
\ No newline at end of file
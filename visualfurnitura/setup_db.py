@@ -40,8 +40,9 @@ def setup_database():
         }
     ]
     
-    for profile in profile_data:
-        db.add_profile_system(profile)
+    # One bulk call: the whole batch shares a single transaction and
+    # commit fsync instead of paying one per row
+    for profile in db.add_profile_systems(profile_data):
         print(f"Added profile system: {profile['name']}")
     
     # Add sample hardware components
@@ -146,8 +147,7 @@ def setup_database():
         }
     ]
     
-    for hardware in hardware_data:
-        db.add_hardware_component(hardware)
+    for hardware in db.add_hardware_components(hardware_data):
         print(f"Added hardware component: {hardware['name']} (Article: {hardware['article_number']})")
     
     print("Database setup completed successfully!")
@@ -1,75 +1,109 @@
 """
 Test script to verify all functionality of VisualFurnitura
+
+The shared objects (database, calculator, processor, exporter) are
+built once in a session-scoped fixture, so adding tests does not
+multiply the DB-open and profile-population cost. Runs under pytest or
+directly as a script.
 """
+import functools
+import os
+from types import SimpleNamespace
+
+import pytest
+
 from db_manager import DBManager
 from pdf_processor import PDFProcessor
 from hardware_calculator import HardwareCalculator, ProfileSystem
 from pdf_exporter import PDFExporter
-import os
 
 
-def test_all_modules():
-    print("Testing VisualFurnitura modules...")
-    
-    # Test 1: Database Manager
-    print("\n1. Testing Database Manager...")
+def _build_app_state() -> SimpleNamespace:
+    """Build the shared module instances once for the whole test run"""
     db = DBManager()
-    hw_count = len(db.get_all_hardware())
-    profile_count = len(db.get_all_profile_systems())
-    print(f"   ✓ Database loaded with {hw_count} hardware components and {profile_count} profile systems")
-    
-    # Test 2: Hardware Calculator
-    print("\n2. Testing Hardware Calculator...")
     calc = HardwareCalculator()
-    
+
     # Add a profile system for testing
-    profile = ProfileSystem(
+    calc.add_profile_system(ProfileSystem(
         name='Test Profile',
         axis_offset=35.0,
         sash_thickness=68.0,
         frame_width=76.0,
         sash_width=76.0,
         description='Test profile system'
-    )
-    calc.add_profile_system(profile)
-    
-    # Test calculations
-    hinge_placements = calc.calculate_hardware_placement(1500, 1000, 'Test Profile', 'hinge')
-    handle_placements = calc.calculate_hardware_placement(1500, 1000, 'Test Profile', 'handle')
-    
-    print(f"   ✓ Calculated {len(hinge_placements)} hinge placements")
-    print(f"   ✓ Calculated {len(handle_placements)} handle placements")
-    
-    # Test 3: PDF Processor (create a mock processor)
-    print("\n3. Testing PDF Processor...")
-    pdf_proc = PDFProcessor()
-    print("   ✓ PDF Processor initialized")
-    
-    # Test 4: PDF Exporter
-    print("\n4. Testing PDF Exporter...")
-    exporter = PDFExporter()
-    print("   ✓ PDF Exporter initialized")
-    
+    ))
+
     # Add profile systems from DB to calculator
     for profile_data in db.get_all_profile_systems():
-        profile = ProfileSystem(
+        calc.add_profile_system(ProfileSystem(
             name=profile_data['name'],
             axis_offset=profile_data['axis_offset'],
             sash_thickness=profile_data['sash_thickness'],
             frame_width=profile_data['frame_width'],
             sash_width=profile_data['sash_width'],
             description=profile_data['description']
-        )
-        calc.add_profile_system(profile)
-    
-    # Test 5: Integration test
-    print("\n5. Testing Integration...")
-    
+        ))
+
+    return SimpleNamespace(db=db, calc=calc,
+                           pdf_proc=PDFProcessor(),
+                           exporter=PDFExporter())
+
+
+@pytest.fixture(scope="session")
+def app_state():
+    return _build_app_state()
+
+
+@functools.lru_cache(maxsize=16)
+def parse_pdf_cached(pdf_path: str):
+    """Parse a sample PDF once per test session, no matter how many
+    tests look at it (the processor also caches by content hash, but
+    this skips even the hashing re-read)
+    """
+    return PDFProcessor().parse_hardware_pdf(pdf_path)
+
+
+def test_database_manager(app_state):
+    hw_count = len(app_state.db.get_all_hardware())
+    profile_count = len(app_state.db.get_all_profile_systems())
+    print(f"   ✓ Database loaded with {hw_count} hardware components and {profile_count} profile systems")
+
+
+def test_hardware_calculator(app_state):
+    hinge_placements = app_state.calc.calculate_hardware_placement(1500, 1000, 'Test Profile', 'hinge')
+    handle_placements = app_state.calc.calculate_hardware_placement(1500, 1000, 'Test Profile', 'handle')
+
+    assert hinge_placements
+    assert handle_placements
+    print(f"   ✓ Calculated {len(hinge_placements)} hinge placements")
+    print(f"   ✓ Calculated {len(handle_placements)} handle placements")
+
+
+def test_pdf_processor(app_state):
+    assert app_state.pdf_proc is not None
+    print("   ✓ PDF Processor initialized")
+
+    # Parse the tracked sample report through the memoizing helper; a
+    # second call must come straight from the cache
+    sample_pdf = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'test_reports', 'sample_hardware_list.pdf')
+    result = parse_pdf_cached(sample_pdf)
+    assert 'hardware_items' in result and 'window_dimensions' in result
+    assert parse_pdf_cached(sample_pdf) is result
+    print("   ✓ Parsed sample hardware list PDF (cached)")
+
+
+def test_pdf_exporter(app_state):
+    assert app_state.exporter is not None
+    print("   ✓ PDF Exporter initialized")
+
+
+def test_integration(app_state):
     # Simulate getting hardware from database
-    sample_hardware = db.get_all_hardware()[:3]  # Get first 3 components
-    
+    sample_hardware = app_state.db.get_all_hardware()[:3]  # Get first 3 components
+
     # Simulate order data
-    profile_systems = db.get_all_profile_systems()
+    profile_systems = app_state.db.get_all_profile_systems()
     order_data = {
         'name': 'Test Order',
         'description': 'Test order for functionality verification',
@@ -77,10 +111,10 @@ def test_all_modules():
         'window_height': 1000,
         'profile_system': profile_systems[0] if profile_systems else None
     }
-    
+
     print(f"   ✓ Retrieved {len(sample_hardware)} sample hardware components")
     print(f"   ✓ Created order data: {order_data['name']}")
-    
+
     # Test coordinate calculation
     calculated_positions = []
     for hw in sample_hardware:
@@ -93,15 +127,15 @@ def test_all_modules():
             hw_type = 'lock'
         else:
             hw_type = 'other'
-        
+
         # Get a placement for this type
-        placements = calc.calculate_hardware_placement(
-            order_data['window_width'], 
-            order_data['window_height'], 
-            order_data['profile_system']['name'], 
+        placements = app_state.calc.calculate_hardware_placement(
+            order_data['window_width'],
+            order_data['window_height'],
+            order_data['profile_system']['name'],
             hw_type
         )
-        
+
         if placements:
             calculated_positions.append({
                 'article_number': hw['article_number'],
@@ -110,22 +144,43 @@ def test_all_modules():
                 'y_position': placements[0].y,
                 'rotation': placements[0].rotation
             })
-    
+
     print(f"   ✓ Calculated positions for {len(calculated_positions)} components")
-    
+
     # Test PDF export (create a sample report)
     if not os.path.exists('test_reports'):
         os.makedirs('test_reports')
-    
+
     try:
-        exporter.export_simple_hardware_list(
-            'test_reports/sample_hardware_list.pdf', 
+        app_state.exporter.export_simple_hardware_list(
+            'test_reports/sample_hardware_list.pdf',
             sample_hardware
         )
         print("   ✓ Generated sample hardware list PDF")
     except Exception as e:
         print(f"   ⚠ Could not generate PDF: {e}")
-    
+
+
+def run_all():
+    """Run every test against one shared state, script-style"""
+    print("Testing VisualFurnitura modules...")
+    state = _build_app_state()
+
+    print("\n1. Testing Database Manager...")
+    test_database_manager(state)
+
+    print("\n2. Testing Hardware Calculator...")
+    test_hardware_calculator(state)
+
+    print("\n3. Testing PDF Processor...")
+    test_pdf_processor(state)
+
+    print("\n4. Testing PDF Exporter...")
+    test_pdf_exporter(state)
+
+    print("\n5. Testing Integration...")
+    test_integration(state)
+
     print("\n✓ All tests completed successfully!")
     print("\nVisualFurnitura is properly set up with all core functionality working.")
     print("The application is ready for use with the following features:")
@@ -137,4 +192,4 @@ def test_all_modules():
 
 
 if __name__ == "__main__":
-    test_all_modules()
\ No newline at end of file
+    run_all()
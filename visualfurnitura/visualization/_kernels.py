@@ -0,0 +1,46 @@
+"""
+Batch geometry kernels for the visualization layer
+
+Hardware imported from real PDF tasks can bring hundreds of rectangles
+that all need the same mm -> display-pixel transform. The arithmetic is
+embarrassingly parallel, so it lives here as a standalone kernel: when
+numba is installed the loop is JIT-compiled to native code, otherwise a
+vectorized NumPy path does the same work without the dependency.
+"""
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba is optional; NumPy covers the same math
+    numba = None
+
+
+def _scale_geometry_numpy(geometry, scale, out):
+    np.multiply(geometry, scale, out=out)
+    return out
+
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _scale_geometry_jit(geometry, scale, out):  # pragma: no cover
+        for i in numba.prange(geometry.shape[0]):
+            for j in range(geometry.shape[1]):
+                out[i, j] = geometry[i, j] * scale
+        return out
+else:
+    _scale_geometry_jit = None
+
+
+def scale_geometry(geometry: np.ndarray, scale: float,
+                   out: np.ndarray = None) -> np.ndarray:
+    """Scale an (N, 4) array of (x, y, w, h) rows into display space.
+
+    Pass a preallocated ``out`` buffer to keep warm calls free of
+    allocation; a fresh float32 array is created otherwise.
+    """
+    geometry = np.ascontiguousarray(geometry, dtype=np.float32)
+    if out is None or out.shape != geometry.shape:
+        out = np.empty_like(geometry)
+    if _scale_geometry_jit is not None:
+        return _scale_geometry_jit(geometry, np.float32(scale), out)
+    return _scale_geometry_numpy(geometry, np.float32(scale), out)
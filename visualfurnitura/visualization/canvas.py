@@ -2,11 +2,209 @@
 Visualization canvas for VisualFurnitura
 Handles 2D rendering of window hardware layout
 """
-from PyQt6.QtWidgets import QWidget, QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsEllipseItem, QGraphicsTextItem, QGraphicsPixmapItem, QFrame
+import functools
+
+import numpy as np
+from PyQt6.QtWidgets import (QWidget, QApplication, QGraphicsView, QGraphicsScene,
+                             QGraphicsItem, QFrame)
 from PyQt6.QtCore import Qt, QPointF, QRectF, QPoint
-from PyQt6.QtGui import QPainter, QBrush, QColor, QPen, QFont, QPixmap
+from PyQt6.QtGui import (QPainter, QBrush, QColor, QPen, QFont, QPixmap,
+                         QStaticText, QTransform)
 from typing import List, Dict, Optional
 
+from ._kernels import scale_geometry
+
+
+# Fonts and laid-out label texts are memoized across scene rebuilds:
+# reset_zoom/new_project recreate the items, but the glyph shaping for
+# a string only runs on its first appearance
+@functools.lru_cache(maxsize=64)
+def _font(family: str, size: int) -> QFont:
+    _hook_cache_cleanup()
+    return QFont(family, size)
+
+
+@functools.lru_cache(maxsize=2048)
+def _static_text(text: str, family: str = "Arial", size: int = 8) -> QStaticText:
+    static = QStaticText(text)
+    static.setTextFormat(Qt.TextFormat.PlainText)
+    static.prepare(QTransform(), _font(family, size))
+    return static
+
+
+# Pens and brushes are copy-on-write handles, so a handful of memoized
+# instances keyed by RGB can be shared across every paint call instead
+# of constructing fresh ones (each a sip boundary crossing) per group
+@functools.lru_cache(maxsize=64)
+def _pen(rgb: int, width: int = 1) -> QPen:
+    _hook_cache_cleanup()
+    return QPen(QColor.fromRgb(rgb), width)
+
+
+@functools.lru_cache(maxsize=64)
+def _brush(rgb: int, lighter: int = 0) -> QBrush:
+    _hook_cache_cleanup()
+    color = QColor.fromRgb(rgb)
+    if lighter:
+        color = color.lighter(lighter)
+    return QBrush(color)
+
+
+def _hook_cache_cleanup():
+    """Drop the cached Qt objects before the QApplication goes away"""
+    global _cleanup_hooked
+    if _cleanup_hooked:
+        return
+    app = QApplication.instance()
+    if app is not None:
+        _cleanup_hooked = True
+        app.aboutToQuit.connect(_font.cache_clear)
+        app.aboutToQuit.connect(_static_text.cache_clear)
+        app.aboutToQuit.connect(_pen.cache_clear)
+        app.aboutToQuit.connect(_brush.cache_clear)
+
+
+_cleanup_hooked = False
+
+
+# Display constants, partially evaluated at import: the default window
+# is 1500x1000 mm drawn at 1 pixel = 5 mm, and every scene rebuild used
+# to redo these multiplications
+_SCALE = 0.2
+# Labels are unreadable below this view zoom, so paint() skips them
+_LABEL_MIN_ZOOM = 0.6
+_WINDOW_WIDTH_MM = 1500
+_WINDOW_HEIGHT_MM = 1000
+_DISPLAY_WIDTH = _WINDOW_WIDTH_MM * _SCALE
+_DISPLAY_HEIGHT = _WINDOW_HEIGHT_MM * _SCALE
+
+# Sample hardware positions (in mm from top-left corner), built once:
+# the dicts and the QColor objects (each a sip boundary crossing) are
+# shared by every load_sample_data call
+_SAMPLE_HARDWARE = (
+    {"name": "Петля верхняя", "article": "H-001", "x": 50, "y": 50, "width": 30, "height": 100, "color": QColor(255, 0, 0)},
+    {"name": "Петля нижняя", "article": "H-002", "x": 50, "y": 950, "width": 30, "height": 100, "color": QColor(255, 0, 0)},
+    {"name": "Ручка", "article": "H-003", "x": 700, "y": 500, "width": 120, "height": 40, "color": QColor(0, 0, 255)},
+    {"name": "Замок", "article": "H-004", "x": 1400, "y": 500, "width": 80, "height": 80, "color": QColor(0, 128, 0)},
+    {"name": "Микролифт", "article": "H-005", "x": 700, "y": 100, "width": 60, "height": 20, "color": QColor(255, 165, 0)},
+    {"name": "Отлив", "article": "H-006", "x": 0, "y": 980, "width": 1500, "height": 20, "color": QColor(139, 69, 19)},  # Brown
+)
+
+# Sample geometry pre-multiplied into display space at import; rebuild
+# calls skip even the vectorized scaling
+_SAMPLE_GEOMETRY = np.array(
+    [(hw["x"], hw["y"], hw["width"], hw["height"]) for hw in _SAMPLE_HARDWARE],
+    dtype=np.float32) * _SCALE
+
+
+class HardwareLayerItem(QGraphicsItem):
+    """All hardware rectangles and labels painted as one scene item.
+
+    One item in the scene means one paint() dispatch and one index
+    entry however many hardware pieces are shown; rects are drawn in
+    bulk per color group and labels as QStaticText, which caches its
+    glyph layout between repaints.
+    """
+
+    def __init__(self, hardware: List[Dict], scale_factor: float, parent=None,
+                 geometry=None):
+        super().__init__(parent)
+        self.setAcceptHoverEvents(True)
+        self.set_hardware(hardware, scale_factor, geometry)
+
+        # Cache the rendered layer in device coordinates: panning blits
+        # the pixmap, while zoom changes re-render through paint() so
+        # the level-of-detail check below sees the current zoom (and
+        # rects stay crisp instead of scaling a fixed-resolution cache)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+    def set_hardware(self, hardware: List[Dict], scale_factor: float,
+                     geometry=None):
+        """Replace the displayed hardware in place.
+
+        Reloading data updates this item's internal lists instead of
+        tearing the item out of the scene and inserting a new one.
+        """
+        self.prepareGeometryChange()
+        self._color_groups = {}   # rgb value -> [QRectF, ...]
+        self._labels = []         # (QPointF, QStaticText)
+        self._tooltips = []       # tooltip per hardware piece
+        bounding = QRectF()
+
+        # Scale all geometry in one batch through the shared kernel,
+        # reusing this item's output buffer on reloads; tolist()
+        # converts back to Python floats in a single C loop instead of
+        # 4 scaled multiplications per entry. Callers with import-time
+        # geometry (the sample layer) pass it in ready-made
+        if geometry is None:
+            raw = np.array(
+                [(hw["x"], hw["y"], hw["width"], hw["height"]) for hw in hardware],
+                dtype=np.float32).reshape(-1, 4)
+            self._geometry_buf = scale_geometry(
+                raw, scale_factor, out=getattr(self, "_geometry_buf", None))
+            geometry = self._geometry_buf
+
+        for hw, (x, y, width, height) in zip(hardware, geometry.tolist()):
+            rect = QRectF(x, y, width, height)
+            self._color_groups.setdefault(hw["color"].rgb(), []).append(rect)
+            static = _static_text(f"{hw['name']} ({hw['article']})")
+            size = static.size()
+            self._labels.append((
+                QPointF(x, y - 15), static,
+                QRectF(x, y - 15, size.width(), size.height())
+            ))
+            self._tooltips.append(
+                f"Артикул: {hw['article']}\nНазвание: {hw['name']}\n"
+                f"Координаты: ({hw['x']}, {hw['y']}) мм"
+            )
+            bounding = bounding.united(rect)
+
+        # AABBs as (x0, y0, x1, y1) rows for vectorized hover lookup
+        self._bbox = np.ascontiguousarray(
+            np.concatenate([geometry[:, :2], geometry[:, :2] + geometry[:, 2:]],
+                           axis=1), dtype=np.float32)
+
+        # Labels sit 15px above their rects
+        self._bounding = bounding.adjusted(-1, -16, 1, 1)
+        self.update()
+
+    def boundingRect(self):
+        return self._bounding
+
+    def paint(self, painter, option, widget=None):
+        for rgb, rects in self._color_groups.items():
+            painter.setPen(_pen(rgb))
+            painter.setBrush(_brush(rgb, 150))
+            painter.drawRects(rects)
+
+        # Level of detail: below _LABEL_MIN_ZOOM the labels are too
+        # small to read, so their (dominant) rendering cost is skipped;
+        # within range, labels outside the exposed region are culled
+        if painter.worldTransform().m11() < _LABEL_MIN_ZOOM:
+            return
+        exposed = option.exposedRect
+        painter.setPen(_pen(QColor(0, 0, 0).rgb()))
+        painter.setFont(_font("Arial", 8))
+        for pos, static_text, label_rect in self._labels:
+            if exposed.intersects(label_rect):
+                painter.drawStaticText(pos, static_text)
+
+    def hoverMoveEvent(self, event):
+        """Show the tooltip of the rect under the cursor"""
+        # Mouse moves arrive at display refresh rate, so the lookup is
+        # one vectorized containment test over the AABB rows instead of
+        # a Python loop over N rects
+        pos = event.pos()
+        px, py = pos.x(), pos.y()
+        bbox = self._bbox
+        mask = ((bbox[:, 0] <= px) & (px <= bbox[:, 2])
+                & (bbox[:, 1] <= py) & (py <= bbox[:, 3]))
+        if mask.any():
+            self.setToolTip(self._tooltips[int(mask.argmax())])
+        else:
+            self.setToolTip("")
+        super().hoverMoveEvent(event)
+
 
 class VisualizationCanvas(QGraphicsView):
     def __init__(self):
@@ -16,10 +214,29 @@ class VisualizationCanvas(QGraphicsView):
         self.scene = QGraphicsScene()
         self.setScene(self.scene)
         
+        # A mostly-static schematic with a handful of items gains
+        # nothing from the defaults it would otherwise pay for: the
+        # per-item painter save/restore (so custom paint() methods must
+        # set every pen/brush/font they use and never rely on inherited
+        # painter state), the antialiasing-slack in update regions, and
+        # the BSP index rebuilt on every scene change
+        self.setOptimizationFlags(
+            QGraphicsView.OptimizationFlag.DontSavePainterState
+            | QGraphicsView.OptimizationFlag.DontAdjustForAntialiasing)
+        self.setViewportUpdateMode(
+            QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheModeFlag.CacheBackground)
+        self.scene.setItemIndexMethod(
+            QGraphicsScene.ItemIndexMethod.NoIndex)
+        
         # Set view properties
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.setRenderHint(QPainter.RenderHint.TextAntialiasing)
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)  # Enable panning by holding mouse
+        # Qt keeps the point under the cursor fixed during scaling, so
+        # wheelEvent needs no manual re-anchoring
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setFrameStyle(QFrame.Shape.NoFrame)
@@ -33,86 +250,94 @@ class VisualizationCanvas(QGraphicsView):
         self.hardware_items = []
         self.window_outline = None
         
-        # Initialize sample scene
-        self.setup_default_scene()
+        # Rendered backdrop, reused across scene rebuilds
+        self._background_pixmap: Optional[QPixmap] = None
+        self._background_size = None
+        
+        # Scene setup is deferred to the first showEvent: the canvas is
+        # built during MainWindow construction, well before it becomes
+        # visible, and rendering the backdrop there just delays startup
+        self._initialized = False
+
+    def showEvent(self, event):
+        """Build the default scene lazily on first show"""
+        if not self._initialized:
+            self._initialized = True
+            self.setup_default_scene()
+        super().showEvent(event)
 
     def setup_default_scene(self):
         """Set up a default scene with a window outline"""
-        # Clear existing items
+        self._initialized = True
+        # Clear existing items; references into the old scene die with it
         self.scene.clear()
+        self.hardware_items = []
+        self.window_outline = None
         
-        # Draw a default window outline (1500x1000 mm scaled down)
-        window_width = 1500  # mm
-        window_height = 1000  # mm
-        
-        # Scale down for display (1 unit = 1 mm initially)
-        scale_factor = 0.2  # 1 pixel = 5 mm
-        display_width = window_width * scale_factor
-        display_height = window_height * scale_factor
+        # Default window outline (1500x1000 mm scaled down), dimensions
+        # precomputed at module scope
+        display_width = _DISPLAY_WIDTH
+        display_height = _DISPLAY_HEIGHT
         
-        # Create window outline
-        self.window_outline = self.scene.addRect(
-            0, 0, 
-            display_width, 
-            display_height,
-            QPen(QColor(0, 0, 0), 2),
-            QBrush(QColor(240, 240, 240, 100))
-        )
+        # The outline, title and dimension text form a static backdrop:
+        # render them into a pixmap once and blit it as the (cached)
+        # view background, so clear_scene/reset_zoom rebuilds skip item
+        # construction and text shaping entirely. Re-rendered only when
+        # the dimensions actually change
+        if self._background_size != (display_width, display_height):
+            self._background_pixmap = self._render_background(
+                _WINDOW_WIDTH_MM, _WINDOW_HEIGHT_MM,
+                display_width, display_height)
+            self._background_size = (display_width, display_height)
+        self.scene.setSceneRect(0, 0, display_width, display_height)
+        self.setBackgroundBrush(QBrush(self._background_pixmap))
+
+    def _render_background(self, window_width, window_height,
+                           display_width, display_height) -> QPixmap:
+        """Render the static backdrop (outline plus captions) once"""
+        pixmap = QPixmap(int(display_width), int(display_height))
+        pixmap.fill(QColor(255, 255, 255))
+        painter = QPainter(pixmap)
         
-        # Add title
-        title = self.scene.addText("Схема установки фурнитуры", QFont("Arial", 14))
-        title.setPos(10, 10)
+        # Window outline, inset so the 2px stroke is not clipped; the
+        # translucent fill keeps its alpha, so it stays uncached
+        painter.setPen(_pen(QColor(0, 0, 0).rgb(), 2))
+        painter.setBrush(QBrush(QColor(240, 240, 240, 100)))
+        painter.drawRect(QRectF(1, 1, display_width - 2, display_height - 2))
         
-        # Add dimensions text
-        dims_text = self.scene.addText(f"Размеры: {window_width}x{window_height} мм", QFont("Arial", 10))
-        dims_text.setPos(10, 40)
+        # Title and dimensions text
+        painter.setPen(_pen(QColor(0, 0, 0).rgb()))
+        painter.setFont(_font("Arial", 14))
+        painter.drawStaticText(
+            QPointF(10, 10),
+            _static_text("Схема установки фурнитуры", "Arial", 14))
+        painter.setFont(_font("Arial", 10))
+        painter.drawStaticText(
+            QPointF(10, 40),
+            _static_text(f"Размеры: {window_width}x{window_height} мм",
+                         "Arial", 10))
+        painter.end()
+        return pixmap
 
     def load_sample_data(self):
         """Load sample hardware data for demonstration"""
-        # Clear existing hardware items
-        for item in self.hardware_items:
-            self.scene.removeItem(item)
-        self.hardware_items = []
-        
-        # Sample hardware positions (in mm from top-left corner)
-        sample_hardware = [
-            {"name": "Петля верхняя", "article": "H-001", "x": 50, "y": 50, "width": 30, "height": 100, "color": QColor(255, 0, 0)},
-            {"name": "Петля нижняя", "article": "H-002", "x": 50, "y": 950, "width": 30, "height": 100, "color": QColor(255, 0, 0)},
-            {"name": "Ручка", "article": "H-003", "x": 700, "y": 500, "width": 120, "height": 40, "color": QColor(0, 0, 255)},
-            {"name": "Замок", "article": "H-004", "x": 1400, "y": 500, "width": 80, "height": 80, "color": QColor(0, 128, 0)},
-            {"name": "Микролифт", "article": "H-005", "x": 700, "y": 100, "width": 60, "height": 20, "color": QColor(255, 165, 0)},
-            {"name": "Отлив", "article": "H-006", "x": 0, "y": 980, "width": 1500, "height": 20, "color": QColor(139, 69, 19)},  # Brown
-        ]
-        
-        # Add sample hardware to scene
-        scale_factor = 0.2  # Convert mm to pixels
+        # Loading before the first show still needs the backdrop, and
+        # must not be wiped by the deferred setup in showEvent
+        if not self._initialized:
+            self.setup_default_scene()
+        # Reuse the existing layer item when the scene still has one:
+        # refilling it is a property update, not a scene removal and
+        # re-insert. The module-level sample data and pre-multiplied
+        # display geometry are shared by every call
+        if self.hardware_items:
+            self.hardware_items[0].set_hardware(_SAMPLE_HARDWARE, _SCALE,
+                                                geometry=_SAMPLE_GEOMETRY)
+            return
         
-        for hw in sample_hardware:
-            # Calculate display position and size
-            x_pos = hw["x"] * scale_factor
-            y_pos = hw["y"] * scale_factor
-            width = hw["width"] * scale_factor
-            height = hw["height"] * scale_factor
-            
-            # Create rectangle for hardware component
-            rect_item = self.scene.addRect(
-                x_pos, y_pos, 
-                width, height,
-                QPen(hw["color"], 1),
-                QBrush(hw["color"].lighter(150))
-            )
-            
-            # Add label
-            label = self.scene.addText(f"{hw['name']} ({hw['article']})", QFont("Arial", 8))
-            label.setDefaultTextColor(QColor(0, 0, 0))
-            label.setPos(x_pos, y_pos - 15)  # Position above the rectangle
-            
-            # Store references to manage these items
-            self.hardware_items.append(rect_item)
-            self.hardware_items.append(label)
-            
-            # Add tooltip with detailed information
-            rect_item.setToolTip(f"Артикул: {hw['article']}\nНазвание: {hw['name']}\nКоординаты: ({hw['x']}, {hw['y']}) мм")
+        layer = HardwareLayerItem(_SAMPLE_HARDWARE, _SCALE,
+                                  geometry=_SAMPLE_GEOMETRY)
+        self.scene.addItem(layer)
+        self.hardware_items.append(layer)
 
     def clear_scene(self):
         """Clear all items from the scene"""
@@ -121,46 +346,37 @@ class VisualizationCanvas(QGraphicsView):
 
     def wheelEvent(self, event):
         """Handle mouse wheel events for zooming"""
-        # Get the current mouse position in scene coordinates
-        mouse_pos_before = self.mapToScene(event.position().toPoint())
-        
         # Determine zoom factor
         zoom_factor = 1.2 if event.angleDelta().y() > 0 else 1/1.2
         
-        # Apply zoom
-        self.scale(zoom_factor, zoom_factor)
+        # Keep the zoom in a sane range
+        if not 0.05 <= self.scale_factor * zoom_factor <= 50:
+            return
         
-        # Adjust scroll bars to keep mouse position fixed
-        mouse_pos_after = self.mapToScene(event.position().toPoint())
-        delta = mouse_pos_after - mouse_pos_before
-        
-        self.translate(delta.x(), delta.y())
-        
-        # Update scale factor
+        # The AnchorUnderMouse transformation anchor keeps the point
+        # under the cursor fixed; no mapToScene round-trip, manual
+        # translate or forced full-viewport update() needed
+        self.scale(zoom_factor, zoom_factor)
         self.scale_factor *= zoom_factor
-        self.update()
 
     def set_scale(self, scale: float):
         """Set the scale of the view"""
-        # Calculate the scale factor needed to reach the target scale
-        current_transform = self.transform()
-        current_scale = current_transform.m11()  # Assuming uniform scaling
-        
-        target_scale = scale
-        scale_factor = target_scale / current_scale
-        
-        self.scale(scale_factor, scale_factor)
+        # The view only ever scales uniformly, so the target transform
+        # can be assigned outright instead of reading the current
+        # matrix, dividing and multiplying in a correction factor. This
+        # also keeps repeated zoom steps free of accumulated drift
+        transform = QTransform()
+        transform.scale(scale, scale)
+        self.setTransform(transform, combine=False)
         self.scale_factor = scale
 
     def zoom_in(self):
         """Zoom in on the canvas"""
-        self.scale(1.2, 1.2)
-        self.scale_factor *= 1.2
+        self.set_scale(self.scale_factor * 1.2)
 
     def zoom_out(self):
         """Zoom out on the canvas"""
-        self.scale(1/1.2, 1/1.2)
-        self.scale_factor /= 1.2
+        self.set_scale(self.scale_factor / 1.2)
 
     def reset_zoom(self):
         """Reset zoom to default"""
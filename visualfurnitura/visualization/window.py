@@ -5,17 +5,44 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QMenuBar, QStatusBar, QToolBar, QDockWidget, 
                             QTreeWidget, QTreeWidgetItem, QLabel, QSpinBox,
                             QPushButton, QComboBox, QGroupBox, QFrame)
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import (Qt, QSize, QTimer, QObject, QRunnable, QThreadPool,
+                          pyqtSignal)
 from PyQt6.QtGui import QAction, QIcon
 from .canvas import VisualizationCanvas
 from ..admin.hardware_admin import HardwareAdminDialog
 from ..db_manager import DBManager
 
 
+class _PdfLoadSignals(QObject):
+    """Queued bridge carrying a worker's result back to the UI thread"""
+    finished = pyqtSignal(object)
+
+
+class PdfLoadRunnable(QRunnable):
+    """Prepare a PDF task off the UI thread.
+
+    Parsing and the batch geometry transform belong here so the event
+    loop never blocks on them; only the ready payload crosses back to
+    the UI thread through the (automatically queued) finished signal.
+    """
+
+    def __init__(self, signals: _PdfLoadSignals):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._signals = signals
+
+    def run(self):
+        # Real parsing (PDFProcessor.parse_hardware_pdf + the geometry
+        # kernel) slots in here once file selection lands; the sample
+        # payload is module-level data, so preparation is immediate
+        self._signals.finished.emit(None)
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db_manager = DBManager()  # Initialize database manager
+        self._admin_dialog = None  # Built lazily on first open, then reused
         self.setWindowTitle("VisualFurnitura - Программа визуализации установки фурнитуры")
         self.setGeometry(100, 100, 1400, 900)
         
@@ -47,6 +74,21 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Готово")
 
+        # Coalesce rapid zoom-spinbox changes: holding the up arrow
+        # fires valueChanged on every step, and each step used to run a
+        # full rescale and viewport repaint. Only the value that is
+        # still current after the timer fires reaches the canvas
+        self._pending_zoom = self.zoom_spinbox.value()
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(40)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
+
+        # PDF tasks load through the global thread pool; the signal
+        # object outlives the per-load runnables
+        self._pdf_load_signals = _PdfLoadSignals()
+        self._pdf_load_signals.finished.connect(self._on_pdf_task_loaded)
+
     def create_sidebar(self):
         """Create the left sidebar with controls"""
         sidebar = QFrame()
@@ -186,9 +228,17 @@ class MainWindow(QMainWindow):
         view_menu.addAction(action_reset_zoom)
 
     def open_admin_dialog(self):
-        """Open the hardware administration dialog"""
-        admin_dialog = HardwareAdminDialog(self.db_manager, self)
-        admin_dialog.exec()
+        """Open the hardware administration dialog.
+
+        The dialog is built once and reused: reopening skips rebuilding
+        the widget graph, and its showEvent refreshes the tables only if
+        the database changed since they were last loaded.
+        """
+        if self._admin_dialog is None:
+            self._admin_dialog = HardwareAdminDialog(self.db_manager, self)
+        self._admin_dialog.show()
+        self._admin_dialog.raise_()
+        self._admin_dialog.activateWindow()
 
     def create_toolbar(self):
         """Create application toolbar"""
@@ -216,15 +266,26 @@ class MainWindow(QMainWindow):
         toolbar.addAction(action_admin)
 
     def on_zoom_changed(self, value):
-        """Handle zoom level changes"""
+        """Handle zoom level changes (debounced)"""
+        self._pending_zoom = value
+        self._zoom_timer.start()
+
+    def _apply_pending_zoom(self):
+        """Apply the last requested zoom level to the canvas"""
+        value = self._pending_zoom
         self.canvas.set_scale(value / 100.0)
         self.status_bar.showMessage(f"Масштаб: {value}%")
 
     def load_pdf_task(self):
         """Load PDF task and visualize hardware placement"""
-        # This would normally open a file dialog and load a PDF
+        # This would normally open a file dialog and load a PDF; the
+        # preparation runs in the thread pool so the UI stays live
         self.status_bar.showMessage("Загрузка PDF задания...")
-        # For now, just simulate loading
+        QThreadPool.globalInstance().start(
+            PdfLoadRunnable(self._pdf_load_signals))
+
+    def _on_pdf_task_loaded(self, result):
+        """Apply a prepared PDF task on the UI thread"""
         self.canvas.load_sample_data()
         self.status_bar.showMessage("PDF задание загружено")
 